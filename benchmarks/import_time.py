@@ -0,0 +1,101 @@
+"""
+Director Start-up Import Benchmark
+
+Runs `python -X importtime` on the director start-up path and reports what
+the imports cost, so heavy libraries never creep back into start-up.
+
+Scenarios:
+    director      import main (what every run pays before reading a manifest)
+    tts:piper     ...plus resolving the Piper engine (a Piper-only manifest)
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --scenario tts:piper --top 15
+
+Exits non-zero if a scenario imports a heavy module it doesn't need.
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries that must only be imported when an engine that uses them is selected
+HEAVY_MODULES = ["torch", "torchaudio", "diffusers", "transformers", "audiocraft",
+                 "onnxruntime", "piper", "numpy", "requests", "flask"]
+
+SCENARIOS = {
+    "director": {
+        "code": "import main",
+        "allowed": []
+    },
+    "tts:piper": {
+        "code": "import main; from engines import registry; registry.resolve('tts', 'piper')",
+        "allowed": ["onnxruntime", "piper", "numpy"]
+    },
+}
+
+
+def measure(code: str):
+    """
+    Run code under -X importtime
+
+    Returns:
+        (total seconds, {module: cumulative microseconds} for top-level entries)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Scenario failed:\n{result.stderr[-2000:]}")
+
+    cumulative = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        # "import time:  self_us |  cumulative_us |   [indent]module"
+        _, cum_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum_us)
+        if len(name) - len(name.lstrip()) == 1:  # Top-level import
+            total_us += int(cum_us)
+
+    return total_us / 1e6, cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure director start-up import time")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="Scenario to run (default: all)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.scenario or list(SCENARIOS):
+        scenario = SCENARIOS[name]
+        total, cumulative = measure(scenario["code"])
+
+        print(f"\n{'='*60}")
+        print(f"SCENARIO: {name}  ({scenario['code']})")
+        print(f"{'='*60}")
+        print(f"Total import time: {total * 1000:.1f} ms ({len(cumulative)} modules)")
+
+        print(f"\nSlowest imports (cumulative):")
+        for module, us in sorted(cumulative.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {us / 1000:8.1f} ms  {module}")
+
+        unexpected = [m for m in HEAVY_MODULES if m in cumulative and m not in scenario["allowed"]]
+        if unexpected:
+            failed = True
+            print(f"\n[FAIL] Heavy modules imported: {', '.join(unexpected)}")
+        else:
+            print(f"\n[OK] No unneeded heavy imports")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Manifest cache pre-flight.
+
+Before a node commits to a manifest, work out how much of it is already
+in the asset store: every provider request the render would make is
+built, its cache key computed, and the keys are checked against the store
+in one batch per engine. Nothing is generated and no hits or misses are
+counted.
+
+A plan reports, per engine (per tier for a tiered TTS engine):
+- requests: distinct assets the manifest needs (repeated scripts count once)
+- hits / misses: how many of them are already stored
+- estimated seconds to generate the misses, from the engine's learned
+  real-time factor, or the asset index's average cost of a miss
+
+Large projects can then be routed to the node whose cache already holds
+most of their assets:
+
+    python main.py --plan
+    python main.py --plan --json
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from manifest_types import EngineConfiguration, RenderManifest
+from engines.tts.providers.base import AudioGenerationRequest
+
+
+@dataclass
+class EnginePlan:
+    """Cache state of one engine's (or tier's) share of a manifest"""
+    kind: str                              # tts, image, music, sfx
+    engine_id: str                         # Engine (or "engine/tier") the requests go to
+    namespace: Optional[str]               # Asset store namespace (None: no provider yet)
+    requests: int                          # Distinct assets needed
+    hits: int = 0
+    estimated_seconds: float = 0.0         # To generate the misses (known estimates only)
+    unestimated: int = 0                   # Misses with no estimate available
+    counted: bool = True                   # Included in the plan totals (False for per-tier detail rows)
+
+    @property
+    def misses(self) -> int:
+        return self.requests - self.hits
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 1.0
+
+
+@dataclass
+class CachePlan:
+    """Pre-flight cache report for a manifest"""
+    project_id: str
+    project_title: str
+    engines: List[EnginePlan] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return sum(e.requests for e in self.engines if e.counted)
+
+    @property
+    def hits(self) -> int:
+        return sum(e.hits for e in self.engines if e.counted)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 1.0
+
+    @property
+    def estimated_seconds(self) -> float:
+        return sum(e.estimated_seconds for e in self.engines if e.counted)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "projectId": self.project_id,
+            "projectTitle": self.project_title,
+            "requests": self.requests,
+            "hits": self.hits,
+            "hitRate": self.hit_rate,
+            "estimatedSeconds": self.estimated_seconds,
+            "engines": [
+                {**asdict(e), "misses": e.misses, "hit_rate": e.hit_rate}
+                for e in self.engines
+            ]
+        }
+
+    def format(self) -> str:
+        """Human-readable report"""
+        lines = [
+            f"Cache plan: {self.project_title} ({self.project_id})",
+            f"{'Engine':<24} {'Namespace':<20} {'Assets':>7} {'Hits':>6} {'Misses':>7} {'Hit %':>6} {'Est. s':>9}",
+        ]
+        for e in self.engines:
+            if e.namespace is None:
+                lines.append(f"{e.kind + ': ' + e.engine_id:<24} {'-':<20} {e.requests:>7}   (no provider, not planned)")
+                continue
+            estimate = f"{e.estimated_seconds:.1f}" + ("+" if e.unestimated else "")
+            lines.append(
+                f"{e.kind + ': ' + e.engine_id:<24} {e.namespace:<20} {e.requests:>7} {e.hits:>6} {e.misses:>7} "
+                f"{e.hit_rate * 100:>5.1f}% {estimate:>9}"
+            )
+        lines.append(
+            f"Total: {self.hits}/{self.requests} assets cached ({self.hit_rate * 100:.1f}%), "
+            f"~{self.estimated_seconds:.0f}s of generation"
+        )
+        if any(e.unestimated for e in self.engines if e.counted):
+            lines.append("  (+: some misses have no estimate yet - no generation history for that engine)")
+        return "\n".join(lines)
+
+
+def plan_tts(engine, engine_id: str, requests: List[AudioGenerationRequest]) -> List[EnginePlan]:
+    """
+    Plan narration requests against a TTS engine.
+
+    A tiered engine (HybridProvider) gets a row for the engine and one per
+    tier. Only the engine row counts towards the totals: a request cached
+    on any tier is a hit (routing serves it from there), and a miss is
+    estimated on the fastest tier meeting the engine's quality floor, as
+    routing would pick it (queue depth and tier availability aside).
+    """
+    unique = list({request.to_cache_key(): request for request in requests}.values())
+
+    if not hasattr(engine, "tiers"):
+        return [_plan_provider("tts", engine_id, engine, unique, engine.cached_batch(unique))]
+
+    tier_plans = []
+    tier_cached = {}
+    for name, tier in engine.tiers.items():
+        tier_cached[name] = tier.provider.cached_batch(unique)
+        plan = _plan_provider("tts", f"{engine_id}/{name}", tier.provider, unique, tier_cached[name])
+        plan.counted = False
+        tier_plans.append(plan)
+
+    qualified = [t for t in engine.tiers.values() if t.expected_quality >= engine.quality_floor]
+    candidates = qualified or list(engine.tiers.values())
+    per_miss = {t.name: _index_seconds_per_miss(t.provider) for t in candidates}
+
+    plan = EnginePlan(kind="tts", engine_id=engine_id,
+                      namespace="+".join(t.provider.assets.namespace for t in engine.tiers.values()),
+                      requests=len(unique))
+    for idx, request in enumerate(unique):
+        if any(cached[idx] for cached in tier_cached.values()):
+            plan.hits += 1
+            continue
+        estimates = [t.provider.estimate_generation_time(len(request.text)) or per_miss[t.name] for t in candidates]
+        known = [seconds for seconds in estimates if seconds]
+        if known:
+            plan.estimated_seconds += min(known)
+        else:
+            plan.unestimated += 1
+    return [plan] + tier_plans
+
+
+def untracked(manifest: RenderManifest, config: EngineConfiguration) -> List[EnginePlan]:
+    """Assets the manifest needs from engines that have no provider yet (visuals, music, SFX)"""
+    wants_music = bool(manifest.audioMood) and not manifest.globalSettings.backgroundAudioUrl
+    needed = [
+        ("image", config.activeImageEngineId, sum(len(s.visualBeats) for s in manifest.scenes)),
+        ("music", config.activeAudioEngineId, 1 if wants_music else 0),
+        ("sfx", "-", sum(1 for s in manifest.scenes if s.soundEffectDescription)),
+    ]
+    return [
+        EnginePlan(kind=kind, engine_id=engine_id, namespace=None, requests=count, counted=False)
+        for kind, engine_id, count in needed if count
+    ]
+
+
+def _plan_provider(kind: str, engine_id: str, provider, requests: List[AudioGenerationRequest],
+                   cached: List[bool]) -> EnginePlan:
+    """Hits and generation estimate for one provider's share of the requests"""
+    plan = EnginePlan(kind=kind, engine_id=engine_id, namespace=provider.assets.namespace,
+                      requests=len(requests), hits=sum(cached))
+
+    per_miss = _index_seconds_per_miss(provider)
+    for request, hit in zip(requests, cached):
+        if hit:
+            continue
+        seconds = provider.estimate_generation_time(len(request.text)) or per_miss
+        if seconds:
+            plan.estimated_seconds += seconds
+        else:
+            plan.unestimated += 1
+    return plan
+
+
+def _index_seconds_per_miss(provider) -> float:
+    """Average recorded cost of a miss in the provider's namespace, over all projects (0 if unknown)"""
+    index = provider.assets.index
+    if index is None:
+        return 0.0
+    rows = [row for row in index.stats(provider.assets.namespace) if row["namespace"] == provider.assets.namespace]
+    misses = sum(row["misses"] for row in rows)
+    return sum(row["generation_seconds"] for row in rows) / misses if misses else 0.0
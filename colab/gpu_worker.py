@@ -0,0 +1,447 @@
+"""
+GPU Worker - Multi-Engine Generation Service
+
+Purpose: One rented GPU serves every generation phase of a manifest
+Engines: Higgs Audio V2, Chatterbox (TTS), SDXL (image), MusicGen (music), AudioGen (SFX)
+Memory: Models stay resident under a VRAM budget; least recently used is evicted
+Scheduling: Queued requests are grouped by engine to minimise model swaps
+
+Protocol (compatible with higgs_audio_worker.ipynb / tts_worker.ipynb):
+    GET  /health    -> {"status": "healthy", "engines": [...], "resident": [...], ...}
+    POST /generate  -> JSON {"engine": "higgs", "text": "..."} returns the file
+                       ("engine" defaults to higgs; image/music/sfx take "prompt")
+
+Usage (Colab, after installing the engines you need):
+    !python gpu_worker.py --vram-gb 14 --ngrok
+
+Only the engines whose packages are installed are offered; the rest are
+reported as unavailable in /health.
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Scene description used by the Higgs notebook (documentary narration)
+DEFAULT_SYSTEM_PROMPT = """
+Generate audio following instruction.
+
+<|scene_desc_start|>
+Audio is recorded from a quiet room. The voice should be deep and authoritative, suitable for documentary narration. Use warm timbre with crystal clarity. Pacing should be deliberate (135-155 WPM) with natural dramatic pauses. Emotional tone: authoritative wonder, trustworthy storytelling.
+<|scene_desc_end|>
+""".strip()
+
+
+@dataclass
+class EngineSpec:
+    """A model the worker can host"""
+    name: str
+    kind: str                                # tts, image, music, sfx
+    vram_gb: float                           # Estimate, replaced by measurement after first load
+    requires: List[str]                      # Importable packages needed
+    load: Callable[[], Any]
+    generate: Callable[[Any, dict, str], None]  # (model, params, output_path)
+    extension: str = "wav"
+    mimetype: str = "audio/wav"
+
+    def installed(self) -> bool:
+        return all(importlib.util.find_spec(module) is not None for module in self.requires)
+
+
+# Engine implementations (heavy imports stay inside so missing engines cost nothing)
+
+def _save_audio(path: str, audio, sample_rate: int):
+    import torch
+    import torchaudio
+
+    if not isinstance(audio, torch.Tensor):
+        audio = torch.as_tensor(audio)
+    audio = audio.detach().float().cpu()
+    while audio.dim() > 2:
+        audio = audio[0]
+    if audio.dim() == 1:
+        audio = audio[None, :]
+    torchaudio.save(path, audio, sample_rate)
+
+
+def _load_higgs():
+    from boson_multimodal.serve.serve_engine import HiggsAudioServeEngine
+
+    return HiggsAudioServeEngine(
+        "bosonai/higgs-audio-v2-generation-3B-base",
+        "bosonai/higgs-audio-v2-tokenizer",
+        device="cuda"
+    )
+
+
+def _generate_higgs(model, params: dict, output_path: str):
+    from boson_multimodal.data_types import ChatMLSample, Message
+
+    messages = [
+        Message(role="system", content=params.get("system_prompt", DEFAULT_SYSTEM_PROMPT)),
+        Message(role="user", content=params["text"]),
+    ]
+    output = model.generate(
+        chat_ml_sample=ChatMLSample(messages=messages),
+        max_new_tokens=params.get("max_new_tokens", 2048),
+        temperature=params.get("temperature", 0.3),
+        top_p=params.get("top_p", 0.95),
+        stop_strings=["<|end_of_text|>", "<|eot_id|>"],
+    )
+    _save_audio(output_path, output.audio, output.sampling_rate)
+
+
+def _load_chatterbox():
+    from chatterbox.tts import ChatterboxTTS
+
+    return ChatterboxTTS.from_pretrained(device="cuda")
+
+
+def _generate_chatterbox(model, params: dict, output_path: str):
+    wav = model.generate(
+        params["text"],
+        exaggeration=params.get("exaggeration", 0.5),
+        cfg_weight=params.get("cfg_weight", 0.5)
+    )
+    _save_audio(output_path, wav, model.sr)
+
+
+def _load_sdxl():
+    import torch
+    from diffusers import StableDiffusionXLPipeline
+
+    pipe = StableDiffusionXLPipeline.from_pretrained(
+        "stabilityai/stable-diffusion-xl-base-1.0",
+        torch_dtype=torch.float16,
+        variant="fp16",
+        use_safetensors=True
+    )
+    return pipe.to("cuda")
+
+
+def _generate_sdxl(model, params: dict, output_path: str):
+    import torch
+
+    generator = None
+    if params.get("seed") is not None:
+        generator = torch.Generator(device="cuda").manual_seed(params["seed"])
+
+    image = model(
+        prompt=params["prompt"],
+        negative_prompt=params.get("negative_prompt"),
+        width=params.get("width", 1024),
+        height=params.get("height", 1024),
+        guidance_scale=params.get("guidance_scale", 7.5),
+        num_inference_steps=params.get("num_inference_steps", 50),
+        generator=generator
+    ).images[0]
+    image.save(output_path)
+
+
+def _load_musicgen():
+    from audiocraft.models import MusicGen
+
+    return MusicGen.get_pretrained("facebook/musicgen-medium")
+
+
+def _load_audiogen():
+    from audiocraft.models import AudioGen
+
+    return AudioGen.get_pretrained("facebook/audiogen-medium")
+
+
+def _generate_audiocraft(model, params: dict, output_path: str):
+    import torch
+
+    if params.get("seed") is not None:
+        torch.manual_seed(params["seed"])
+    model.set_generation_params(duration=params.get("duration", 10.0))
+    wav = model.generate([params["prompt"]])
+    _save_audio(output_path, wav[0], model.sample_rate)
+
+
+ENGINES: Dict[str, EngineSpec] = {}
+
+
+def register_engine(spec: EngineSpec):
+    """Make an engine available to the worker"""
+    ENGINES[spec.name] = spec
+
+
+register_engine(EngineSpec("higgs", "tts", 11.0, ["boson_multimodal"], _load_higgs, _generate_higgs))
+register_engine(EngineSpec("chatterbox", "tts", 4.0, ["chatterbox"], _load_chatterbox, _generate_chatterbox))
+register_engine(EngineSpec("sdxl", "image", 8.0, ["diffusers"], _load_sdxl, _generate_sdxl,
+                           extension="png", mimetype="image/png"))
+register_engine(EngineSpec("musicgen", "music", 6.0, ["audiocraft"], _load_musicgen, _generate_audiocraft))
+register_engine(EngineSpec("audiogen", "sfx", 6.0, ["audiocraft"], _load_audiogen, _generate_audiocraft))
+
+
+class ModelCache:
+    """
+    Keeps models resident on the GPU under a VRAM budget
+
+    Loading an engine evicts least recently used models until it fits.
+    The footprint of each engine is measured on first load, so later
+    eviction decisions use real numbers instead of the estimates.
+
+    Models are loaded by the scheduler thread while the HTTP threads
+    report what is resident, so the bookkeeping is guarded by a lock
+    (held only briefly: never while a model loads).
+    """
+
+    def __init__(self, vram_budget_gb: float):
+        self.vram_budget_gb = vram_budget_gb
+        self._resident = OrderedDict()   # name -> model, least recently used first
+        self._footprint = {}             # name -> measured GB
+        self._lock = threading.Lock()
+
+    def get(self, spec: EngineSpec):
+        """Return the loaded model for an engine, loading (and evicting) if needed"""
+        with self._lock:
+            if spec.name in self._resident:
+                self._resident.move_to_end(spec.name)
+                return self._resident[spec.name]
+
+        needed = self.footprint(spec.name)
+        while True:
+            resident = self.resident()
+            if not resident or self.used_gb() + needed <= self.vram_budget_gb:
+                break
+            self.evict(resident[0])
+
+        if needed > self.vram_budget_gb:
+            print(f"  [Worker] {spec.name} (~{needed:.1f}GB) exceeds VRAM budget {self.vram_budget_gb:.1f}GB, loading anyway")
+
+        print(f"  [Worker] Loading {spec.name}...")
+        before = _gpu_allocated_gb()
+        start = time.time()
+        model = spec.load()
+        measured = _gpu_allocated_gb() - before
+        with self._lock:
+            if measured > 0:
+                self._footprint[spec.name] = measured
+            self._resident[spec.name] = model
+        print(f"  [Worker] Loaded {spec.name} in {time.time() - start:.1f}s ({self.footprint(spec.name):.1f}GB)")
+        return model
+
+    def evict(self, name: str):
+        with self._lock:
+            model = self._resident.pop(name, None)
+        if model is None:
+            return
+        print(f"  [Worker] Evicting {name} to free ~{self.footprint(name):.1f}GB")
+        del model
+        _free_gpu_memory()
+
+    def footprint(self, name: str) -> float:
+        with self._lock:
+            return self._footprint.get(name, ENGINES[name].vram_gb)
+
+    def used_gb(self) -> float:
+        return sum(self.footprint(name) for name in self.resident())
+
+    def resident(self) -> List[str]:
+        """Resident engines, most recently used last"""
+        with self._lock:
+            return list(self._resident)
+
+
+@dataclass
+class Job:
+    engine: str
+    params: dict
+    output_path: str
+    future: Future = field(default_factory=Future)
+    submitted: float = field(default_factory=time.time)
+
+
+class EngineScheduler:
+    """
+    Runs generation jobs one at a time on the GPU, grouped by engine
+
+    The next job is taken from the most recently used resident engine,
+    then any other resident engine, and only then from an engine that
+    needs loading. Jobs older than max_wait seconds are served first
+    so a rarely used engine is never starved.
+    """
+
+    def __init__(self, cache: ModelCache, max_wait: float = 120.0):
+        self.cache = cache
+        self.max_wait = max_wait
+
+        self._jobs: List[Job] = []
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, engine: str, params: dict, output_path: str) -> Future:
+        job = Job(engine=engine, params=params, output_path=output_path)
+        with self._condition:
+            self._jobs.append(job)
+            self._condition.notify()
+        return job.future
+
+    def queue_depth(self) -> Dict[str, int]:
+        with self._condition:
+            depth = {}
+            for job in self._jobs:
+                depth[job.engine] = depth.get(job.engine, 0) + 1
+            return depth
+
+    def _next_job(self) -> Job:
+        # Caller holds the condition
+        oldest = self._jobs[0]
+        if time.time() - oldest.submitted > self.max_wait:
+            return oldest
+
+        for name in reversed(self.cache.resident()):
+            for job in self._jobs:
+                if job.engine == name:
+                    return job
+        return oldest
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                job = self._next_job()
+                self._jobs.remove(job)
+
+            if not job.future.set_running_or_notify_cancel():
+                continue
+
+            spec = ENGINES[job.engine]
+            try:
+                model = self.cache.get(spec)
+                tmp_path = f"{job.output_path}.tmp.{spec.extension}"
+                spec.generate(model, job.params, tmp_path)
+                os.replace(tmp_path, job.output_path)
+                job.future.set_result(job.output_path)
+            except Exception as e:
+                job.future.set_exception(e)
+
+
+def _gpu_allocated_gb() -> float:
+    try:
+        import torch
+        if torch.cuda.is_available():
+            return torch.cuda.memory_allocated() / 1024 ** 3
+    except ImportError:
+        pass
+    return 0.0
+
+
+def _free_gpu_memory():
+    import gc
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+def create_app(scheduler: EngineScheduler, cache_dir: str = "/tmp/gpu_worker_cache",
+               default_engine: str = "higgs"):
+    """Build the Flask app serving /health and /generate"""
+    from flask import Flask, request, jsonify, send_file
+
+    os.makedirs(cache_dir, exist_ok=True)
+    app = Flask(__name__)
+
+    @app.route('/health', methods=['GET'])
+    def health():
+        available = [name for name, spec in ENGINES.items() if spec.installed()]
+        return jsonify({
+            "status": "healthy",
+            "engine": "gpu-worker",
+            "engines": available,
+            "unavailable": [name for name in ENGINES if name not in available],
+            "resident": scheduler.cache.resident(),
+            "vram_budget_gb": scheduler.cache.vram_budget_gb,
+            "vram_used_gb": round(scheduler.cache.used_gb(), 2),
+            "queue": scheduler.queue_depth()
+        })
+
+    @app.route('/generate', methods=['POST'])
+    def generate():
+        params = dict(request.json or {})
+        engine = params.pop("engine", default_engine)
+
+        spec = ENGINES.get(engine)
+        if spec is None or not spec.installed():
+            return jsonify({"error": f"engine '{engine}' not available on this worker"}), 400
+
+        field_name = "text" if spec.kind == "tts" else "prompt"
+        if not params.get(field_name):
+            # Accept either field so clients can send one shape for every engine
+            params[field_name] = params.get("prompt") or params.get("text")
+        if not params.get(field_name):
+            return jsonify({"error": f"{field_name} parameter required"}), 400
+
+        cache_key = hashlib.sha256(
+            json.dumps({"engine": engine, **params}, sort_keys=True).encode()
+        ).hexdigest()[:16]
+        output_path = os.path.join(cache_dir, f"{engine}_{cache_key}.{spec.extension}")
+
+        if os.path.exists(output_path):
+            print(f"[Cache hit] {engine} {cache_key}")
+            return send_file(output_path, mimetype=spec.mimetype)
+
+        print(f"[{engine}] {str(params[field_name])[:50]}...")
+        try:
+            scheduler.submit(engine, params, output_path).result()
+        except Exception as e:
+            print(f"  [Worker] {engine} failed: {e}")
+            return jsonify({"error": str(e)}), 500
+
+        return send_file(output_path, mimetype=spec.mimetype)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-engine GPU worker")
+    parser.add_argument("--vram-gb", type=float, default=14.0, help="VRAM budget for resident models")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--cache-dir", default="/tmp/gpu_worker_cache")
+    parser.add_argument("--max-wait", type=float, default=120.0,
+                        help="Seconds before a queued job jumps ahead of engine grouping")
+    parser.add_argument("--preload", nargs="*", default=[], help="Engines to load at startup")
+    parser.add_argument("--ngrok", action="store_true", help="Expose the worker through an ngrok tunnel")
+    args = parser.parse_args()
+
+    cache = ModelCache(args.vram_gb)
+    for name in args.preload:
+        cache.get(ENGINES[name])
+
+    scheduler = EngineScheduler(cache, max_wait=args.max_wait)
+    app = create_app(scheduler, cache_dir=args.cache_dir)
+
+    if args.ngrok:
+        from pyngrok import ngrok
+        public_url = ngrok.connect(args.port)
+        print("\n" + "=" * 60)
+        print("GPU WORKER READY")
+        print("=" * 60)
+        print(f"Public URL: {public_url.public_url}")
+        print(f"Engines: {', '.join(n for n, s in ENGINES.items() if s.installed()) or 'none installed'}")
+        print(f"VRAM budget: {args.vram_gb:.1f}GB")
+        print("=" * 60 + "\n")
+
+    app.run(host="0.0.0.0", port=args.port, threaded=True, use_reloader=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Prometheus metrics for a long-lived director.
+
+RunMetrics (engines/run_metrics.py) reports one render in its status file;
+this keeps running totals across every manifest a watcher executes, in the
+Prometheus text exposition format, so render nodes can be scraped, graphed
+and alerted on:
+
+- director_manifests_total{status}: manifests executed, by outcome
+- director_phase_duration_seconds{phase}: pipeline phase durations
+- director_generation_seconds{namespace}: per-provider generation latency
+- director_generation_failures_total{namespace}: per-provider failed generations
+- director_cache_hits_total / director_cache_misses_total{namespace}
+- director_cache_hit_ratio{namespace}: hits / lookups since start
+- director_bytes_written_total{namespace}: bytes of generated assets stored
+- director_generations_in_flight, director_tts_queue_depth{tier}: narration
+  requests queued or running (in total, per TTS tier)
+
+Exposed over HTTP (stdlib only) and/or written to a file for the
+node_exporter textfile collector:
+
+    python main.py --metrics-port 9464
+    python main.py --metrics-textfile /var/lib/node_exporter/textfile/director.prom
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Phases take seconds to an hour; generations tens of milliseconds to minutes
+PHASE_BUCKETS = (0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+GENERATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+Labels = Tuple[str, ...]
+
+
+class Counter:
+    """Monotonic total per label set"""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def values(self) -> Dict[Labels, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [(self.name, dict(zip(self.labels, key)), value) for key, value in sorted(self.values().items())]
+
+
+class Gauge:
+    """Current value per label set, read from live state when rendered"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str], collect: Callable[[], Dict[Labels, float]]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.collect = collect
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [(self.name, dict(zip(self.labels, key)), value) for key, value in sorted(self.collect().items())]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str], buckets: Iterable[float]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Labels, List[float]] = {}  # per-bucket counts..., +Inf count, sum
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.setdefault(label_values, [0.0] * (len(self.buckets) + 2))
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[idx] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        samples = []
+        for key, values in sorted(series.items()):
+            labels = dict(zip(self.labels, key))
+            for bound, count in zip(self.buckets, values):
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, count))
+            samples.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, values[-2]))
+            samples.append((f"{self.name}_sum", labels, values[-1]))
+            samples.append((f"{self.name}_count", labels, values[-2]))
+        return samples
+
+
+class DirectorMetrics:
+    """
+    Director-wide counters and histograms, rendered for Prometheus
+
+    Registered as an asset store observer (see asset_store.add_observer)
+    for the life of the process; the director reports manifests and
+    phases, and registers gauges that read its queues when scraped.
+    """
+
+    def __init__(self):
+        self.manifests = Counter("director_manifests_total", "Manifests executed, by outcome", ("status",))
+        self.phase_seconds = Histogram("director_phase_duration_seconds", "Duration of pipeline phases",
+                                       ("phase",), PHASE_BUCKETS)
+        self.generation_seconds = Histogram("director_generation_seconds", "Generation latency per provider namespace",
+                                            ("namespace",), GENERATION_BUCKETS)
+        self.failures = Counter("director_generation_failures_total", "Failed generations per provider namespace",
+                                ("namespace",))
+        self.hits = Counter("director_cache_hits_total", "Asset store lookups served from cache", ("namespace",))
+        self.misses = Counter("director_cache_misses_total", "Asset store lookups that missed", ("namespace",))
+        self.bytes_written = Counter("director_bytes_written_total", "Bytes of generated assets stored",
+                                     ("namespace",))
+        self._metrics = [
+            self.manifests, self.phase_seconds, self.generation_seconds, self.failures,
+            self.hits, self.misses,
+            Gauge("director_cache_hit_ratio", "Cache hits / lookups since start", ("namespace",), self._hit_ratios),
+            self.bytes_written,
+        ]
+        self._server = None
+
+    # Asset store observer interface
+
+    def record_hit(self, namespace: str, size: int, saved_seconds: Optional[float]) -> None:
+        self.hits.inc(namespace)
+
+    def record_miss(self, namespace: str) -> None:
+        self.misses.inc(namespace)
+
+    def record_write(self, namespace: str, size: int) -> None:
+        self.bytes_written.inc(namespace, amount=size)
+
+    def record_generation(self, namespace: str, seconds: float) -> None:
+        self.generation_seconds.observe(seconds, namespace)
+
+    def record_failure(self, namespace: str) -> None:
+        self.failures.inc(namespace)
+
+    # Director events
+
+    def record_manifest(self, status: str) -> None:
+        self.manifests.inc(status)
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        self.phase_seconds.observe(seconds, phase)
+
+    def add_gauge(self, name: str, help_text: str, labels: Iterable[str],
+                  collect: Callable[[], Dict[Labels, float]]) -> None:
+        """Gauge read from live state on every scrape (collect: label values -> value)"""
+        self._metrics.append(Gauge(name, help_text, labels, collect))
+
+    # Exposition
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                    lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path) -> None:
+        """Write the metrics for node_exporter's textfile collector (atomic: .prom files are read at any time)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(self.render(), encoding="utf-8")
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def serve(self, port: int, host: str = "0.0.0.0"):
+        """Serve /metrics from a background thread (stdlib only); returns the server"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scraped every few seconds; keep the director log readable
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True).start()
+        return self._server
+
+    def _hit_ratios(self) -> Dict[Labels, float]:
+        hits = self.hits.values()
+        misses = self.misses.values()
+        return {
+            key: hits.get(key, 0.0) / (hits.get(key, 0.0) + misses.get(key, 0.0))
+            for key in set(hits) | set(misses)
+        }
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,477 @@
+"""
+Asset Index - SQLite Metadata and Hit-Rate Statistics for the Asset Store
+
+Purpose: Answer "what is this asset and what did it cost?" without opening
+         files, and "how well is the cache working?" per engine and project
+Storage: <asset root>/index.sqlite3 (WAL mode, shared by every engine and
+         every process using the root)
+
+Per asset (namespace, key, ext):
+- size, creation time, last access, hit count
+- media metadata (duration, sample rate, dimensions, ...) as JSON
+- generation cost: seconds it took to generate
+
+Per (namespace, project):
+- hits and misses
+- seconds spent generating misses, seconds saved by hits
+
+References: which project revision (manifest), scene and beat uses each
+asset, and whether that scene is part of a live (posted) export. A new
+revision of a project supersedes its previous ones. From the references
+every asset gets a retention state, which eviction collects in order:
+
+- superseded: used only by replaced revisions (abandoned drafts)
+- archived: used only by projects marked archived
+- unreferenced: used by no recorded project
+- draft: used by a project's current revision
+- live: in a posted export (never collected by default)
+
+The index backs metadata lookups (providers skip re-reading WAV headers on
+a hit), eviction (seeds the evictor instead of crawling the tree) and
+capacity planning:
+
+    python -m engines.asset_index cache
+    python -m engines.asset_index cache --set-state proj_123 archived
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+INDEX_NAME = "index.sqlite3"
+
+# Project that stats are recorded under when none is set
+NO_PROJECT = ""
+
+# Retention states, in the order eviction collects them
+SUPERSEDED = "superseded"
+ARCHIVED = "archived"
+UNREFERENCED = "unreferenced"
+DRAFT = "draft"
+LIVE = "live"
+RETENTION_STATES = (SUPERSEDED, ARCHIVED, UNREFERENCED, DRAFT, LIVE)
+
+# Project states that can be set explicitly (the default is draft)
+PROJECT_STATES = (DRAFT, ARCHIVED, LIVE)
+
+# Beat recorded for scene-level assets (narration, SFX)
+SCENE_ASSET = -1
+
+
+class AssetIndex:
+    """
+    Persistent index of the assets under one AssetStore root
+
+    Thread-safe; several processes may share the file.
+
+    Example:
+        index = AssetIndex("cache/index.sqlite3")
+        index.set_project("proj_123")
+
+        index.record_miss("tts/higgs")
+        index.record_write("tts/higgs", key, ".wav", size=path.stat().st_size)
+        index.describe("tts/higgs", key, ".wav", {"duration_seconds": 4.2}, generation_seconds=9.8)
+
+        print(index.stats())
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS assets ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " ext TEXT NOT NULL,"
+            " size INTEGER NOT NULL DEFAULT 0,"
+            " metadata TEXT,"
+            " generation_seconds REAL,"
+            " created REAL NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (namespace, key, ext));"
+            "CREATE INDEX IF NOT EXISTS assets_last_access ON assets (last_access);"
+            "CREATE TABLE IF NOT EXISTS stats ("
+            " namespace TEXT NOT NULL,"
+            " project TEXT NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 0,"
+            " misses INTEGER NOT NULL DEFAULT 0,"
+            " generation_seconds REAL NOT NULL DEFAULT 0,"
+            " saved_seconds REAL NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (namespace, project));"
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS refs ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " project TEXT NOT NULL,"
+            " revision TEXT NOT NULL,"
+            " scene INTEGER NOT NULL,"
+            " beat INTEGER NOT NULL,"
+            " live INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (namespace, key, project, revision, scene, beat));"
+            "CREATE INDEX IF NOT EXISTS refs_project ON refs (project, revision);"
+            "CREATE TABLE IF NOT EXISTS revisions ("
+            " project TEXT NOT NULL,"
+            " revision TEXT NOT NULL,"
+            " superseded INTEGER NOT NULL DEFAULT 0,"
+            " updated REAL NOT NULL,"
+            " PRIMARY KEY (project, revision));"
+            "CREATE TABLE IF NOT EXISTS projects (project TEXT PRIMARY KEY, state TEXT NOT NULL, updated REAL NOT NULL);"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+        self.project = NO_PROJECT
+
+    def set_project(self, project_id: Optional[str]):
+        """Attribute hits and misses from now on to a project"""
+        self.project = project_id or NO_PROJECT
+
+    # --- Asset events ---
+
+    def record_hit(self, namespace: str, key: str, ext: str) -> bool:
+        """
+        A lookup found the asset (credits its generation cost as saved)
+
+        Returns:
+            False if the asset has no index row yet (record_write it)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generation_seconds FROM assets WHERE namespace = ? AND key = ? AND ext = ?",
+                (namespace, key, ext)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE assets SET hits = hits + 1, last_access = ?"
+                    " WHERE namespace = ? AND key = ? AND ext = ?",
+                    (now, namespace, key, ext)
+                )
+            self._bump(namespace, hits=1, saved_seconds=(row[0] or 0.0) if row else 0.0)
+            self._conn.commit()
+        return row is not None
+
+    def record_miss(self, namespace: str):
+        with self._lock:
+            self._bump(namespace, misses=1)
+            self._conn.commit()
+
+    def record_write(self, namespace: str, key: str, ext: str, size: int, mtime: Optional[float] = None):
+        """An asset was published (or found on disk without an index row)"""
+        now = mtime or time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO assets (namespace, key, ext, size, created, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (namespace, key, ext) DO UPDATE SET size = excluded.size,"
+                " last_access = MAX(last_access, excluded.last_access)",
+                (namespace, key, ext, size, now, now)
+            )
+            self._conn.commit()
+
+    def describe(
+        self,
+        namespace: str,
+        key: str,
+        ext: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        generation_seconds: Optional[float] = None
+    ):
+        """
+        Attach media metadata and/or generation cost to an asset
+
+        Metadata is merged into what is already stored. A generation cost
+        is also added to the namespace's spend for the current project.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metadata FROM assets WHERE namespace = ? AND key = ? AND ext = ?",
+                (namespace, key, ext)
+            ).fetchone()
+            if row is None:
+                now = time.time()
+                self._conn.execute(
+                    "INSERT INTO assets (namespace, key, ext, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (namespace, key, ext, now, now)
+                )
+                stored = {}
+            else:
+                stored = json.loads(row[0]) if row[0] else {}
+
+            stored.update(metadata or {})
+            self._conn.execute(
+                "UPDATE assets SET metadata = ?, generation_seconds = COALESCE(?, generation_seconds)"
+                " WHERE namespace = ? AND key = ? AND ext = ?",
+                (json.dumps(stored), generation_seconds, namespace, key, ext)
+            )
+            if generation_seconds:
+                self._bump(namespace, generation_seconds=generation_seconds)
+            self._conn.commit()
+
+    def remove(self, namespace: str, key: str):
+        """Forget an asset (every extension, and its references), e.g. after eviction"""
+        with self._lock:
+            self._conn.execute("DELETE FROM assets WHERE namespace = ? AND key = ?", (namespace, key))
+            self._conn.execute("DELETE FROM refs WHERE namespace = ? AND key = ?", (namespace, key))
+            self._conn.commit()
+
+    # --- References ---
+
+    def set_references(self, project: str, revision: str, refs: Iterable[Tuple[str, str, int, int, bool]]):
+        """
+        Record every asset one revision of a project uses
+
+        Replaces what was recorded for the same revision before; every
+        other revision of the project becomes superseded.
+
+        Args:
+            project: Project ID
+            revision: Manifest revision (e.g. its generatedAt)
+            refs: (namespace, key, scene, beat, live) per use; beat is
+                SCENE_ASSET for scene-level assets, live marks scenes in a
+                posted export
+        """
+        now = time.time()
+        rows = [(ns, key, project, revision, scene, beat, int(live)) for ns, key, scene, beat, live in refs]
+        with self._lock:
+            self._conn.execute("DELETE FROM refs WHERE project = ? AND revision = ?", (project, revision))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO refs (namespace, key, project, revision, scene, beat, live)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO revisions (project, revision, superseded, updated) VALUES (?, ?, 0, ?)",
+                (project, revision, now)
+            )
+            self._conn.execute(
+                "UPDATE revisions SET superseded = 1, updated = ? WHERE project = ? AND revision != ? AND superseded = 0",
+                (now, project, revision)
+            )
+            self._conn.commit()
+
+    def set_project_state(self, project: str, state: str):
+        """Mark a project draft (default), archived (collect before drafts) or live (never collect)"""
+        if state not in PROJECT_STATES:
+            raise ValueError(f"Unknown project state '{state}' (expected one of {', '.join(PROJECT_STATES)})")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO projects (project, state, updated) VALUES (?, ?, ?)",
+                (project, state, time.time())
+            )
+            self._conn.commit()
+
+    def references(self, namespace: str, key: str) -> List[Dict[str, Any]]:
+        """Who uses an asset: project, revision, scene, beat, live, superseded"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.project, r.revision, r.scene, r.beat, r.live, COALESCE(v.superseded, 0)"
+                " FROM refs r LEFT JOIN revisions v ON v.project = r.project AND v.revision = r.revision"
+                " WHERE r.namespace = ? AND r.key = ? ORDER BY r.project, r.scene, r.beat",
+                (namespace, key)
+            ).fetchall()
+        return [
+            {"project": project, "revision": revision, "scene": scene, "beat": beat,
+             "live": bool(live), "superseded": bool(superseded)}
+            for project, revision, scene, beat, live, superseded in rows
+        ]
+
+    def retention_states(self) -> Dict[Tuple[str, str], str]:
+        """
+        Retention state of every referenced asset ({(namespace, key): state})
+
+        An asset takes the most protective state among its references;
+        assets missing from the result are unreferenced.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.namespace, r.key, r.live, COALESCE(v.superseded, 0), COALESCE(p.state, ?)"
+                " FROM refs r"
+                " LEFT JOIN revisions v ON v.project = r.project AND v.revision = r.revision"
+                " LEFT JOIN projects p ON p.project = r.project",
+                (DRAFT,)
+            ).fetchall()
+
+        rank = {state: idx for idx, state in enumerate(RETENTION_STATES)}
+        states: Dict[Tuple[str, str], str] = {}
+        for namespace, key, live, superseded, project_state in rows:
+            if live or project_state == LIVE:
+                state = LIVE
+            elif superseded:
+                state = SUPERSEDED
+            else:
+                state = project_state  # draft or archived
+            current = states.get((namespace, key))
+            if current is None or rank[state] > rank[current]:
+                states[(namespace, key)] = state
+        return states
+
+    # --- Queries ---
+
+    def get(self, namespace: str, key: str, ext: str) -> Optional[Dict[str, Any]]:
+        """Index row for an asset (metadata decoded), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, metadata, generation_seconds, created, last_access, hits"
+                " FROM assets WHERE namespace = ? AND key = ? AND ext = ?",
+                (namespace, key, ext)
+            ).fetchone()
+        if row is None:
+            return None
+        size, metadata, generation_seconds, created, last_access, hits = row
+        return {
+            "size": size,
+            "metadata": json.loads(metadata) if metadata else {},
+            "generation_seconds": generation_seconds,
+            "created": created,
+            "last_access": last_access,
+            "hits": hits
+        }
+
+    def entries(self) -> Iterator[Tuple[str, str, int, float, int]]:
+        """(namespace, key, bytes, last access, hits) per asset, extensions combined"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, key, SUM(size), MAX(last_access), MAX(hits)"
+                " FROM assets GROUP BY namespace, key"
+            ).fetchall()
+        return iter(rows)
+
+    def stats(self, namespace: Optional[str] = None, project: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Hit/miss counters and generation cost per (namespace, project)
+
+        Args:
+            namespace: Only this namespace or namespace prefix ("tts" covers tts/*)
+            project: Only this project
+        """
+        query = "SELECT namespace, project, hits, misses, generation_seconds, saved_seconds FROM stats WHERE 1 = 1"
+        args = []
+        if namespace:
+            query += " AND (namespace = ? OR namespace LIKE ?)"
+            args += [namespace, namespace.rstrip("/") + "/%"]
+        if project is not None:
+            query += " AND project = ?"
+            args.append(project)
+
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY namespace, project", args).fetchall()
+
+        result = []
+        for ns, proj, hits, misses, generation_seconds, saved_seconds in rows:
+            lookups = hits + misses
+            result.append({
+                "namespace": ns,
+                "project": proj,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "generation_seconds": generation_seconds,
+                "saved_seconds": saved_seconds,
+                # What a miss costs on average: the capacity-planning number
+                "seconds_per_miss": generation_seconds / misses if misses else 0.0
+            })
+        return result
+
+    def usage(self) -> Dict[str, Tuple[int, int]]:
+        """{namespace: (assets, bytes)}"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, COUNT(DISTINCT key), SUM(size) FROM assets GROUP BY namespace"
+            ).fetchall()
+        return {ns: (count, size or 0) for ns, count, size in rows}
+
+    def usage_by_state(self) -> Dict[str, Tuple[int, int]]:
+        """{retention state: (assets, bytes)}"""
+        states = self.retention_states()
+        usage: Dict[str, Tuple[int, int]] = {}
+        for namespace, key, size, _, _ in self.entries():
+            state = states.get((namespace, key), UNREFERENCED)
+            count, total = usage.get(state, (0, 0))
+            usage[state] = (count + 1, total + (size or 0))
+        return usage
+
+    def get_meta(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _bump(self, namespace: str, hits: int = 0, misses: int = 0,
+              generation_seconds: float = 0.0, saved_seconds: float = 0.0):
+        """Add to a stats row (caller holds the lock and commits)"""
+        self._conn.execute(
+            "INSERT INTO stats (namespace, project, hits, misses, generation_seconds, saved_seconds)"
+            " VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (namespace, project) DO UPDATE SET"
+            " hits = hits + excluded.hits, misses = misses + excluded.misses,"
+            " generation_seconds = generation_seconds + excluded.generation_seconds,"
+            " saved_seconds = saved_seconds + excluded.saved_seconds",
+            (namespace, self.project, hits, misses, generation_seconds, saved_seconds)
+        )
+
+
+def main():
+    import argparse
+
+    from engines.asset_store import DEFAULT_ROOT
+
+    parser = argparse.ArgumentParser(description="Asset cache usage and hit-rate report")
+    parser.add_argument("root", type=Path, nargs="?", default=DEFAULT_ROOT, help="Asset store root")
+    parser.add_argument("--namespace", help="Only this engine namespace (or prefix, e.g. 'tts')")
+    parser.add_argument("--project", help="Only this project")
+    parser.add_argument("--set-state", nargs=2, metavar=("PROJECT", "STATE"),
+                        help=f"Set a project's retention state ({', '.join(PROJECT_STATES)})")
+    args = parser.parse_args()
+
+    index_path = args.root / INDEX_NAME
+    if not index_path.exists():
+        parser.error(f"No asset index at {index_path}")
+    index = AssetIndex(index_path)
+
+    if args.set_state:
+        project, state = args.set_state
+        try:
+            index.set_project_state(project, state)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"{project}: {state}")
+        return
+
+    print(f"{'Namespace':<20} {'Assets':>8} {'Size MB':>10}")
+    for namespace, (count, size) in sorted(index.usage().items()):
+        print(f"{namespace:<20} {count:>8} {size / 1024 / 1024:>10.1f}")
+
+    print(f"\n{'Namespace':<20} {'Project':<20} {'Hits':>7} {'Misses':>7} {'Hit %':>6} "
+          f"{'Gen s':>9} {'Saved s':>9} {'s/miss':>7}")
+    for row in index.stats(args.namespace, args.project):
+        print(f"{row['namespace']:<20} {row['project'] or '-':<20} {row['hits']:>7} {row['misses']:>7} "
+              f"{row['hit_rate'] * 100:>5.1f}% {row['generation_seconds']:>9.1f} "
+              f"{row['saved_seconds']:>9.1f} {row['seconds_per_miss']:>7.1f}")
+
+    print(f"\n{'Retention':<20} {'Assets':>8} {'Size MB':>10}")
+    by_state = index.usage_by_state()
+    for state in RETENTION_STATES:
+        count, size = by_state.get(state, (0, 0))
+        print(f"{state:<20} {count:>8} {size / 1024 / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,700 @@
+"""
+Asset Store - Content-Addressed Storage Shared by All Engines
+
+Every provider stores its outputs here instead of managing its own flat
+cache directory. Assets are addressed by the request's to_cache_key():
+
+    <root>/<namespace>/<ab>/<cd>/<key><ext>
+    cache/tts/piper/4d/4b/4d4bcac0...cd167.wav
+
+- Sharding: two levels of hash prefix keep directories small (a few hundred
+  entries even with millions of assets), so lookups stay fast on network
+  and spinning-disk filesystems
+- Namespaces: one per engine ("tts/piper", "image/sdxl"), since the same
+  request produces different assets on different engines
+- Atomic publish: assets are written to a temp file in the target directory
+  and renamed into place, so readers never see a partial file
+- Legacy migration: assets found in an engine's old flat cache directory
+  (<key><ext>) are moved into the sharded layout on first lookup
+- Single-flight: a lookup that misses claims the asset until it is
+  published or released; concurrent lookups of the same
+  asset (a repeated script in a batch, the upgrade thread) in any store
+  of the process wait for that generation instead of repeating it
+- Tracking: hits touch the asset's mtime (its last use) and, like writes,
+  are reported to any tracker registered for the root (see cache_eviction)
+- Observers: every lookup, generated asset, generation cost and failed
+  generation (reported by the provider) in any store is reported to the process-wide observers
+  (see run_metrics, director_metrics)
+- Index: hits, misses, sizes, media metadata and generation cost are kept
+  in <root>/index.sqlite3 (see asset_index), so a hit needs no file reads
+- Shared tier: optionally backed by a farm-wide cache (see shared_cache);
+  local misses fall through to it, its hits are copied locally and local
+  writes are pushed to it
+- Compression: WAV audio is stored as FLAC (see audio_codec) and decoded
+  next to it on lookup, so callers still get a .wav path; decoded copies
+  can be dropped once a render is done (drop_decoded)
+
+Example:
+    store = AssetStore("cache", "tts/piper")
+
+    path = store.lookup(key, ".wav")
+    if path is None:
+        with store.writing(key, ".wav") as tmp_path:
+            write_audio(tmp_path)
+        path = store.path(key, ".wav")
+        store.describe(key, ".wav", {"duration_seconds": 4.2}, generation_seconds=1.3)
+"""
+
+import os
+import re
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+from engines import audio_codec
+from engines.asset_index import INDEX_NAME, AssetIndex
+
+
+# Shared by every engine unless a provider's config sets "asset_root" (the
+# repo's cache/ directory, wherever the director is started from)
+DEFAULT_ROOT = Path(__file__).parent.parent / "cache"
+
+_KEY_PATTERN = re.compile(r"^([0-9a-f]{64})(\..+)$")
+
+# Resolved store root -> objects told about hits and writes
+# (record_access / record_write(namespace, key, path))
+_trackers: Dict[Path, list] = {}
+_trackers_lock = threading.Lock()
+
+
+def add_tracker(root: Path, tracker) -> None:
+    """Report every hit and write under root to tracker"""
+    with _trackers_lock:
+        _trackers.setdefault(Path(root).resolve(), []).append(tracker)
+
+
+def remove_tracker(root: Path, tracker) -> None:
+    with _trackers_lock:
+        trackers = _trackers.get(Path(root).resolve(), [])
+        if tracker in trackers:
+            trackers.remove(tracker)
+
+
+# Told about every hit, miss, generated asset and generation cost, whatever the root
+# (record_hit(namespace, size, saved_seconds), record_miss(namespace),
+#  record_write(namespace, size), record_generation(namespace, seconds),
+#  record_failure(namespace))
+_observers: list = []
+
+
+def add_observer(observer) -> None:
+    """Report every lookup and generation in any store to observer"""
+    with _trackers_lock:
+        _observers.append(observer)
+
+
+def remove_observer(observer) -> None:
+    with _trackers_lock:
+        if observer in _observers:
+            _observers.remove(observer)
+
+
+class _Generation:
+    """An asset some thread of this process missed and is generating"""
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.done = threading.Event()
+
+
+# (resolved root, namespace, key, ext) -> its generation in progress
+_generating: Dict[tuple, _Generation] = {}
+
+
+# Resolved store root -> its index, shared by every store (and engine) in the process
+_indexes: Dict[Path, AssetIndex] = {}
+_project: Optional[str] = None
+
+
+def open_index(root: Path) -> AssetIndex:
+    """The metadata index of a store root (opened once per process)"""
+    root = Path(root).resolve()
+    with _trackers_lock:
+        if root not in _indexes:
+            _indexes[root] = AssetIndex(root / INDEX_NAME)
+            _indexes[root].set_project(_project)
+        return _indexes[root]
+
+
+def set_project(project_id: Optional[str]) -> None:
+    """Attribute hits and misses in every index (open now or later) to a project"""
+    global _project
+    with _trackers_lock:
+        _project = project_id
+        for index in _indexes.values():
+            index.set_project(project_id)
+
+
+class AssetStore:
+    """
+    Content-addressed asset storage for one engine namespace
+
+    Thread- and process-safe for concurrent writers of the same key: the last
+    rename wins and every version is a complete asset.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        namespace: str,
+        legacy_dirs: Iterable[Path] = (),
+        sidecars: Iterable[str] = (),
+        index: Optional[AssetIndex] = None,
+        shared=None,
+        compress: bool = False,
+        claim_timeout: float = 900.0
+    ):
+        """
+        Args:
+            root: Store root shared by all engines
+            namespace: Engine namespace, e.g. "tts/piper"
+            legacy_dirs: Old flat cache directories to migrate assets from
+            sidecars: Suffixes of companion files that travel with an asset
+                (".timings.json" moves <key>.timings.json along with <key>.wav)
+            index: Metadata index to keep up to date (None: no index)
+            shared: shared_cache.SharedTier behind the local store (None: local only)
+            compress: Store WAV assets as FLAC, decoding them on lookup
+            claim_timeout: Seconds a lookup waits on another thread's claim
+                before taking the asset over
+        """
+        self.root = Path(root)
+        self.namespace = namespace.strip("/")
+        self.directory = self.root / self.namespace
+        self.legacy_dirs = [Path(d) for d in legacy_dirs if d]
+        self.sidecars = list(sidecars)
+        self.index = index
+        self.shared = shared
+        self.compress = compress
+        self.claim_timeout = claim_timeout
+        self._claims = set()  # (key, ext) this process holds the shared generation lease for
+        self._claims_lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Dict[str, Any],
+        namespace: str,
+        legacy_dirs: Iterable[Path] = (),
+        sidecars: Iterable[str] = ()
+    ) -> "AssetStore":
+        """
+        Store for a provider config
+
+        Configuration:
+            asset_root: Store root (default: <repo>/cache)
+            asset_namespace: Override the engine's namespace
+            asset_index: Keep <asset_root>/index.sqlite3 up to date (default: True)
+            shared_cache: Farm-wide second tier, a directory or http:// URL (optional)
+            shared_cache_lease: Seconds other nodes wait on an asset being generated (default: 900)
+            audio_compression: Store WAV audio as FLAC (default: True if soundfile is installed)
+            asset_claim_timeout: Seconds a lookup waits on an asset another thread
+                is generating before taking it over (default: 900)
+        """
+        root = config.get("asset_root", DEFAULT_ROOT)
+
+        shared = None
+        if config.get("shared_cache"):
+            from engines.shared_cache import open_shared
+            shared = open_shared(str(config["shared_cache"]), lease_seconds=config.get("shared_cache_lease", 900.0))
+
+        return cls(
+            root,
+            config.get("asset_namespace", namespace),
+            legacy_dirs=legacy_dirs,
+            sidecars=sidecars,
+            index=open_index(root) if config.get("asset_index", True) else None,
+            shared=shared,
+            compress=config.get("audio_compression", audio_codec.available()),
+            claim_timeout=config.get("asset_claim_timeout", 900.0)
+        )
+
+    def path(self, key: str, ext: str) -> Path:
+        """Where the asset for a key lives (whether or not it exists yet)"""
+        return self.directory / key[:2] / key[2:4] / f"{key}{ext}"
+
+    def lookup(self, key: str, ext: str) -> Optional[Path]:
+        """
+        Find a stored asset, counting the hit or miss
+
+        A miss claims the asset, so the caller is expected to generate and
+        publish (or release) it, possibly from another thread; while
+        another thread of the process holds the claim, this waits for its
+        copy instead (for up to claim_timeout, then the claim is taken over,
+        so a stuck generator can't block its waiters forever). Lookups by
+        the claiming thread itself don't wait.
+
+        With a shared tier, a local miss falls through to it. A shared miss
+        claims the asset for this node; if another node is already
+        generating it, this waits for that node's copy instead.
+
+        Returns:
+            Path to the asset (decoded, if stored compressed), or None on a miss
+        """
+        path = self._find(key, ext)
+        while path is None:
+            generation = self._start_generation(key, ext)
+            if generation is None:
+                break  # Ours to generate
+            generation.done.wait(self.claim_timeout)
+            path = self._find(key, ext)
+            if path is None and not generation.done.is_set() and self._take_over(key, ext, generation):
+                break  # Stuck: ours to generate now
+        if path is None and self.shared is not None:
+            path = self._from_shared(key, ext)
+            if path is not None:
+                self._end_generation(key, ext)  # Promoted: nothing to generate here
+        if path is None:
+            if self.index:
+                self.index.record_miss(self.namespace)
+            for observer in self._observers():
+                observer.record_miss(self.namespace)
+            return None
+
+        index_ext = self._index_ext(key, ext)
+        stored_path = self.path(key, index_ext)
+        if self.index and not self.index.record_hit(self.namespace, key, index_ext):
+            self.index.record_write(self.namespace, key, index_ext, stored_path.stat().st_size)
+
+        observers = self._observers()
+        if observers:
+            row = self.index.get(self.namespace, key, index_ext) if self.index else None
+            size = row["size"] if row else stored_path.stat().st_size
+            for observer in observers:
+                observer.record_hit(self.namespace, size, row["generation_seconds"] if row else None)
+
+        for used in {path, stored_path}:
+            try:
+                os.utime(used)  # mtime = last use, for eviction
+            except OSError:
+                pass
+        for tracker in self._trackers():
+            tracker.record_access(self.namespace, key, path)
+        return path
+
+    def contains(self, key: str, ext: str) -> bool:
+        """Whether an asset is stored (not counted as a use)"""
+        return self._find(key, ext, decode=False) is not None
+
+    def compressed_path(self, key: str, ext: str) -> Optional[Path]:
+        """
+        The stored FLAC of a compressed asset, or None
+
+        For consumers that read FLAC directly (ffmpeg), so they don't need
+        the decoded copy.
+        """
+        stored_ext = self._stored_ext(ext)
+        if stored_ext == ext or not self.path(key, stored_ext).exists():
+            return None
+        return self.path(key, stored_ext)
+
+    def drop_decoded(self, key: str, ext: str) -> bool:
+        """
+        Delete the decoded copy of a compressed asset
+
+        The next lookup decodes it again. Call when whatever used the
+        decoded file (a render) is done with it.
+
+        Returns:
+            True if a decoded copy was deleted
+        """
+        if self.compressed_path(key, ext) is None:
+            return False
+        try:
+            self.path(key, ext).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def contains_many(self, keys: Iterable[str], ext: str) -> Set[str]:
+        """
+        Which of many keys are stored (not counted as uses, nothing migrated)
+
+        Lists each shard directory (and legacy directory) once instead of
+        checking every asset on its own, so planning a large manifest
+        against a network filesystem costs one scan per shard.
+
+        Returns:
+            The stored keys
+        """
+        exts = {ext, self._stored_ext(ext)}
+        by_shard: Dict[Path, Set[str]] = {}
+        for key in keys:
+            by_shard.setdefault(self.path(key, ext).parent, set()).add(key)
+
+        found = set()
+        for directory, wanted in by_shard.items():
+            found |= wanted & self._keys_in(directory, exts)
+
+        missing = set().union(*by_shard.values()) - found
+        for legacy_dir in self.legacy_dirs:
+            if not missing:
+                break
+            in_legacy = missing & self._keys_in(legacy_dir, exts)
+            found |= in_legacy
+            missing -= in_legacy
+        return found
+
+    def metadata(self, key: str, ext: str) -> Dict[str, Any]:
+        """Indexed media metadata of an asset ({} if unknown)"""
+        if not self.index:
+            return {}
+        row = self.index.get(self.namespace, key, self._index_ext(key, ext))
+        return row["metadata"] if row else {}
+
+    def describe(self, key: str, ext: str, metadata: Optional[Dict[str, Any]] = None,
+                 generation_seconds: Optional[float] = None) -> None:
+        """Record an asset's media metadata and/or what it cost to generate"""
+        if self.index:
+            self.index.describe(self.namespace, key, self._index_ext(key, ext), metadata, generation_seconds)
+        if generation_seconds is not None:
+            for observer in self._observers():
+                observer.record_generation(self.namespace, generation_seconds)
+
+    @contextmanager
+    def writing(self, key: str, ext: str) -> Iterator[Path]:
+        """
+        Write an asset through a temp file, published when the block exits
+
+        With compression, the published WAV becomes the decoded copy of
+        the FLAC that is stored.
+
+        Yields:
+            Temp path to write to. On an exception the temp file is removed
+            and nothing is published.
+        """
+        path = self.path(key, ext)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(path)
+        try:
+            yield tmp_path
+            os.replace(tmp_path, path)
+        except BaseException:
+            self.release(key, ext)
+            raise
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        stored_ext = self._stored_ext(ext)
+        if stored_ext != ext and not self._compress(key, ext, path):
+            stored_ext = ext
+        stored_path = self.path(key, stored_ext)
+        self._published(key, stored_ext, stored_path)
+        self._end_generation(key, ext)
+        for observer in self._observers():
+            observer.record_write(self.namespace, stored_path.stat().st_size)
+
+        if self.shared is not None:
+            # The push releases the shared lease (taken under the stored name) once the asset is there
+            with self._claims_lock:
+                self._claims.discard((key, ext))
+            self.shared.push_async(self.namespace, key, self._sidecar_exts(key, ext) + [stored_ext], path.parent,
+                                   release_ext=self._stored_ext(ext))
+
+    def claim(self, key: str, ext: str) -> bool:
+        """
+        Claim an asset for generation without waiting or counting a miss
+
+        For work that finishes after its caller gave up on it (a late
+        answer), which should only be published if nobody else has.
+
+        Returns:
+            True if claimed; False if the asset is stored or another
+            thread of the process is generating it
+        """
+        if self._find(key, ext, decode=False) is not None:
+            return False
+        if self._start_generation(key, ext) is not None:
+            return False
+        if self._find(key, ext, decode=False) is not None:
+            self._end_generation(key, ext)  # Published while we claimed
+            return False
+        return True
+
+    def record_failure(self, key: str, ext: str) -> None:
+        """
+        Report a failed attempt to generate an asset to the observers
+
+        Claims are kept (the caller may retry); release() them when giving up.
+        """
+        for observer in self._observers():
+            observer.record_failure(self.namespace)
+
+    def release(self, key: str, ext: str) -> None:
+        """
+        Give up generating an asset after a lookup miss
+
+        The local and shared generation claims (if held) are released.
+        No-op once the asset is published.
+        """
+        self._end_generation(key, ext)
+        with self._claims_lock:
+            claimed = (key, ext) in self._claims
+            self._claims.discard((key, ext))
+        if not claimed:
+            return
+        try:
+            self.shared.release(self.namespace, key, self._stored_ext(ext))
+        except OSError as e:
+            print(f"  [SharedCache] Could not release {self.namespace}/{key[:12]}{ext}: {e}")
+
+    def publish(self, key: str, ext: str, data: bytes) -> Path:
+        """Atomically store an asset's bytes; returns its path"""
+        with self.writing(key, ext) as tmp_path:
+            tmp_path.write_bytes(data)
+        return self.path(key, ext)
+
+    def sidecar_path(self, key: str, ext: str, suffix: str) -> Path:
+        """Companion file of an asset (e.g. its .timings.json)"""
+        return self.path(key, ext).with_suffix(suffix)
+
+    def migrate_legacy(self) -> int:
+        """
+        Move every asset in the legacy directories into the sharded layout
+
+        Lookups migrate lazily; call this to convert a whole cache up front.
+
+        Returns:
+            Number of files moved
+        """
+        moved = 0
+        for legacy_dir in self.legacy_dirs:
+            if not legacy_dir.is_dir():
+                continue
+            with os.scandir(legacy_dir) as entries:
+                names = [entry.name for entry in entries if entry.is_file()]
+            for name in names:
+                match = _KEY_PATTERN.match(name)
+                if match:
+                    key, ext = match.groups()
+                    moved += self._move(legacy_dir / name, self.path(key, ext))
+        return moved
+
+    def _stored_ext(self, ext: str) -> str:
+        """Extension an asset is stored under (.flac for .wav audio when compressing)"""
+        return audio_codec.compressed_ext(ext) if self.compress else ext
+
+    def _index_ext(self, key: str, ext: str) -> str:
+        """Extension of the file an asset's index row describes: the stored one, if present"""
+        stored_ext = self._stored_ext(ext)
+        if stored_ext != ext and self.path(key, stored_ext).exists():
+            return stored_ext
+        return ext
+
+    def _compress(self, key: str, ext: str, path: Path) -> bool:
+        """Store a WAV asset as FLAC next to it; False (WAV kept as the asset) if it can't be"""
+        stored = self.path(key, self._stored_ext(ext))
+        tmp_path = self._tmp_path(stored)
+        try:
+            if not audio_codec.encode_flac(path, tmp_path):
+                return False
+            os.replace(tmp_path, stored)
+            return True
+        except (OSError, RuntimeError) as e:
+            print(f"  [AssetStore] Could not compress {self.namespace}/{key[:12]}{ext}, keeping WAV: {e}")
+            return False
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _decode(self, stored: Path, path: Path) -> None:
+        """Write the decoded copy of a compressed asset"""
+        tmp_path = self._tmp_path(path)
+        try:
+            audio_codec.decode_flac(stored, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _published(self, key: str, ext: str, path: Path) -> None:
+        """Tell the index and trackers about a new local asset"""
+        if self.index:
+            self.index.record_write(self.namespace, key, ext, path.stat().st_size)
+        for tracker in self._trackers():
+            tracker.record_write(self.namespace, key, path)
+
+    def _sidecar_exts(self, key: str, ext: str) -> list:
+        """Extensions of an asset's sidecars (<key>.int8.wav -> .int8.timings.json)"""
+        name = f"{key}{ext}"
+        return [Path(name).with_suffix(suffix).name[len(key):] for suffix in self.sidecars]
+
+    def _start_generation(self, key: str, ext: str) -> Optional[_Generation]:
+        """Claim a missed asset for this thread; returns another thread's generation in progress instead"""
+        token = (self.root.resolve(), self.namespace, key, ext)
+        with _trackers_lock:
+            generation = _generating.get(token)
+            if generation is None:
+                _generating[token] = _Generation()
+                return None
+        return None if generation.thread == threading.get_ident() else generation
+
+    def _take_over(self, key: str, ext: str, stale: _Generation) -> bool:
+        """Claim a missed asset whose generation timed out for this thread; False if it moved on meanwhile"""
+        token = (self.root.resolve(), self.namespace, key, ext)
+        with _trackers_lock:
+            if _generating.get(token) is not stale:
+                return False  # Finished, or another waiter took it over
+            _generating[token] = _Generation()
+        stale.done.set()  # Other waiters re-check, then wait on our claim
+        print(f"  [AssetStore] {self.namespace}/{key[:12]}{ext} still generating after "
+              f"{self.claim_timeout:.0f}s, taking it over")
+        return True
+
+    def _end_generation(self, key: str, ext: str) -> None:
+        """Wake the lookups waiting on an asset's generation (whichever thread finishes it)"""
+        token = (self.root.resolve(), self.namespace, key, ext)
+        with _trackers_lock:
+            generation = _generating.pop(token, None)
+        if generation is not None:
+            generation.done.set()
+
+    def _from_shared(self, key: str, ext: str) -> Optional[Path]:
+        """Promote an asset from the shared tier, or claim it for generation here"""
+        with self._claims_lock:
+            if (key, ext) in self._claims:
+                return None  # Already ours to generate
+        waiting_since = None
+        while True:
+            try:
+                if self._fetch_shared(key, ext):
+                    return self._find(key, ext)
+                if self.shared.claim(self.namespace, key, self._stored_ext(ext)):
+                    with self._claims_lock:
+                        self._claims.add((key, ext))
+                    return None
+            except OSError as e:
+                print(f"  [SharedCache] Unavailable ({e}), generating locally")
+                return None
+
+            if waiting_since is None:
+                waiting_since = time.time()
+                print(f"  [SharedCache] {self.namespace}/{key[:12]} is being generated on another node, waiting")
+            elif time.time() - waiting_since > self.shared.lease_seconds:
+                return None
+            time.sleep(self.shared.poll_interval)
+
+    def _fetch_shared(self, key: str, ext: str) -> bool:
+        """
+        Copy an asset (sidecars first) from the shared tier into the local store
+
+        Compressed copies are preferred; nodes that don't compress push WAV.
+        """
+        self.path(key, ext).parent.mkdir(parents=True, exist_ok=True)
+
+        for asset_ext in dict.fromkeys([self._stored_ext(ext), ext]):
+            for fetch_ext in self._sidecar_exts(key, ext) + [asset_ext]:
+                target = self.path(key, fetch_ext)
+                tmp_path = self._tmp_path(target)
+                try:
+                    if self.shared.fetch(self.namespace, key, fetch_ext, tmp_path):
+                        os.replace(tmp_path, target)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+
+            path = self.path(key, asset_ext)
+            if path.exists():
+                self._published(key, asset_ext, path)
+                return True
+        return False
+
+    def _find(self, key: str, ext: str, decode: bool = True) -> Optional[Path]:
+        """
+        Path of a stored asset, migrating it from a legacy directory if needed
+
+        With compression, the decoded copy is written if missing (decode),
+        and uncompressed assets from before compression are compressed.
+        Without decode, the stored file itself is returned.
+        """
+        path = self.path(key, ext)
+        stored = self.path(key, self._stored_ext(ext))
+        if stored != path and stored.exists():
+            if not decode:
+                return stored
+            if not path.exists():
+                self._decode(stored, path)
+            return path
+
+        if path.exists():
+            if decode and stored != path:
+                self._compress(key, ext, path)
+            return path
+
+        for legacy_dir in self.legacy_dirs:
+            legacy_path = legacy_dir / f"{key}{ext}"
+            if legacy_path.exists():
+                self._migrate(legacy_path, path)
+                if path.exists():
+                    if self.index:
+                        self.index.record_write(self.namespace, key, ext, path.stat().st_size)
+                    if decode and stored != path:
+                        self._compress(key, ext, path)
+                    return path
+        return None
+
+    @staticmethod
+    def _keys_in(directory: Path, exts: Iterable[str]) -> Set[str]:
+        """Keys of the assets with any of some extensions in one directory"""
+        try:
+            with os.scandir(directory) as entries:
+                names = [entry.name for entry in entries]
+        except (FileNotFoundError, NotADirectoryError):
+            return set()
+        # <key>.int8.wav is not a ".wav" asset of <key>: keys are exactly 64 characters
+        return {name[:64] for name in names if name[64:] in exts}
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        """Per-writer temp file next to path (hidden, so never mistaken for an asset)"""
+        return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    def _trackers(self) -> list:
+        with _trackers_lock:
+            return list(_trackers.get(self.root.resolve(), ()))
+
+    @staticmethod
+    def _observers() -> list:
+        with _trackers_lock:
+            return list(_observers)
+
+    def _migrate(self, legacy_path: Path, path: Path) -> None:
+        """Move a legacy asset and its sidecars into place, sidecars first"""
+        for suffix in self.sidecars:
+            legacy_sidecar = legacy_path.with_suffix(suffix)
+            if legacy_sidecar.exists():
+                self._move(legacy_sidecar, path.with_suffix(suffix))
+        self._move(legacy_path, path)
+
+    @staticmethod
+    def _move(source: Path, target: Path) -> bool:
+        """Atomically move a file into the store; False if it vanished meanwhile"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(source, target)
+            return True
+        except FileNotFoundError:
+            return False  # Another process migrated it first
+        except OSError:
+            pass
+
+        # Different filesystem: copy next to the target, then rename
+        tmp_path = AssetStore._tmp_path(target)
+        try:
+            shutil.copy2(source, tmp_path)
+            os.replace(tmp_path, target)
+            source.unlink(missing_ok=True)
+            return True
+        except FileNotFoundError:
+            return False
+        finally:
+            tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,66 @@
+"""
+Audio Codec - Lossless Compression for Cached Audio
+
+Purpose: Store generated narration, music and SFX as FLAC instead of raw
+         PCM WAV (typically 40-60% smaller, bit-exact on decode)
+How: The asset store encodes every WAV it publishes and decodes on read
+     (see AssetStore, "audio_compression")
+
+Only integer PCM is compressed; float WAVs are left as they are, since FLAC
+can't hold them losslessly. soundfile (libsndfile) is imported on first
+use, so stores that never touch audio don't pay for it.
+
+Example:
+    if encode_flac(Path("narration.wav"), Path("narration.flac")):
+        decode_flac(Path("narration.flac"), Path("copy.wav"))  # identical samples
+"""
+
+import importlib.util
+from pathlib import Path
+
+
+# Served extension -> stored extension (".int8.wav" is stored as ".int8.flac")
+COMPRESSED_SUFFIXES = {".wav": ".flac"}
+
+# PCM subtypes FLAC stores losslessly
+_FLAC_SUBTYPES = ("PCM_S8", "PCM_16", "PCM_24")
+
+
+def available() -> bool:
+    """Whether soundfile is installed (without importing it)"""
+    return importlib.util.find_spec("soundfile") is not None
+
+
+def compressed_ext(ext: str) -> str:
+    """Stored extension for a served one (unchanged if it isn't compressed)"""
+    for served, stored in COMPRESSED_SUFFIXES.items():
+        if ext.endswith(served):
+            return ext[:-len(served)] + stored
+    return ext
+
+
+def encode_flac(wav_path: Path, flac_path: Path) -> bool:
+    """
+    Compress a WAV file to FLAC
+
+    Returns:
+        False if the WAV's sample format can't be stored losslessly
+    """
+    import soundfile
+
+    info = soundfile.info(str(wav_path))
+    if info.subtype not in _FLAC_SUBTYPES:
+        return False
+
+    data, rate = soundfile.read(str(wav_path), dtype="int32", always_2d=True)
+    soundfile.write(str(flac_path), data, rate, subtype=info.subtype, format="FLAC")
+    return True
+
+
+def decode_flac(flac_path: Path, wav_path: Path) -> None:
+    """Decode a FLAC file to a WAV with the same sample format"""
+    import soundfile
+
+    info = soundfile.info(str(flac_path))
+    data, rate = soundfile.read(str(flac_path), dtype="int32", always_2d=True)
+    soundfile.write(str(wav_path), data, rate, subtype=info.subtype, format="WAV")
@@ -0,0 +1,426 @@
+"""
+Cache Eviction - Keep the Asset Store Under Byte Budgets
+
+Purpose: Stop generation caches from filling the disk without purging
+         everything (and losing all reuse) by hand
+How: A background thread tracks every asset under an AssetStore root and
+     deletes the least valuable ones whenever a budget is exceeded
+
+Budgets:
+- Global: total bytes under the root
+- Per engine: bytes under a namespace or namespace prefix
+  ("tts/higgs" for one engine, "image" for every image engine)
+
+Policies:
+- lru: evict the least recently used asset first
+- lfu: evict the least frequently used (ties: least recently used)
+
+Incremental: the store reports every hit and write as it happens, and the
+starting state comes from the asset index (asset_index) - sizes, last use
+and use counts - so nothing is rescanned. The first evictor on a root
+without a complete index crawls the tree once, a few shard directories per
+step, and fills the index in as it goes.
+
+Retention: assets are collected by retention state first (see asset_index:
+superseded, archived, unreferenced, then draft), and by policy within a
+state. Each state has a retention period - an asset is only evicted once
+it has gone unused that long - and live assets (in posted exports) are
+never evicted unless a retention period is set for them. States without
+one use min_age.
+
+Pinned keys (assets referenced by active or queued manifests) are never
+evicted.
+
+Example:
+    evictor = CacheEvictor("cache", max_bytes=parse_size("200GB"),
+                           budgets={"tts/higgs": parse_size("20GB")},
+                           retention={"superseded": 0, "draft": 7 * 86400})
+    evictor.start()
+    evictor.pin("project-42", keys)
+"""
+
+import heapq
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from engines import asset_store
+from engines.asset_index import LIVE, RETENTION_STATES, UNREFERENCED
+
+
+_SHARD = re.compile(r"^[0-9a-f]{2}$")
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$", re.IGNORECASE)
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+POLICIES = ("lru", "lfu")
+
+# Asset index meta entry: set once a crawl has put every asset in the index
+CRAWLED = "eviction_crawled"
+
+
+def parse_size(value: Union[int, float, str]) -> int:
+    """Bytes from a number or a size string ("500MB", "20G", "1.5TB")"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _SIZE.match(value)
+    if not match:
+        raise ValueError(f"Invalid size: '{value}' (expected e.g. 500MB, 20GB)")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+@dataclass
+class CacheEntry:
+    """One asset (with its sidecars) in the store"""
+    leaf: Path           # Shard directory holding its files
+    size: int            # Bytes, sidecars included
+    last_access: float   # Unix time of the last hit or write
+    hits: int = 0
+
+
+class CacheEvictor:
+    """
+    Byte-budgeted LRU/LFU eviction for an asset store root
+
+    Thread-safe. Attach with start() (background thread) or drive it with
+    step() from an existing loop.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: Optional[int] = None,
+        budgets: Optional[Dict[str, int]] = None,
+        policy: str = "lru",
+        min_age: float = 300.0,
+        scan_batch: int = 64,
+        max_evictions: int = 256,
+        interval: float = 5.0,
+        use_index: bool = True,
+        retention: Optional[Dict[str, Optional[float]]] = None
+    ):
+        """
+        Args:
+            root: AssetStore root to manage
+            max_bytes: Global budget (None: unlimited)
+            budgets: {namespace or namespace prefix: bytes}
+            policy: "lru" or "lfu"
+            min_age: Never evict assets used this recently (seconds)
+            scan_batch: Shard directories crawled per step
+            max_evictions: Assets deleted per step at most
+            interval: Seconds between background steps
+            use_index: Seed from (and keep up) the root's asset index
+            retention: {retention state: seconds unused before eviction, or
+                None for never} (default: min_age, live never)
+        """
+        self.root = Path(root)
+        self.min_age = min_age
+        self.scan_batch = scan_batch
+        self.max_evictions = max_evictions
+        self.interval = interval
+        self.configure(max_bytes, budgets, policy, retention)
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, CacheEntry]] = {}  # namespace -> key -> entry
+        self._usage: Dict[str, int] = {}                       # namespace -> bytes
+        self._pins: Dict[str, Set[str]] = {}                   # owner -> keys
+        self._pinned: Set[str] = set()
+
+        self.index = asset_store.open_index(self.root) if use_index else None
+        self._crawl: Optional[Iterator[Tuple[str, Path]]] = None
+        if self.index is not None and self.index.get_meta(CRAWLED) is not None:
+            self._load_index()
+        else:
+            self._crawl = self._walk_shards()
+        self.evicted_count = 0
+        self.evicted_bytes = 0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        asset_store.add_tracker(self.root, self)
+
+    def configure(self, max_bytes: Optional[int] = None, budgets: Optional[Dict[str, int]] = None,
+                  policy: str = "lru", retention: Optional[Dict[str, Optional[float]]] = None):
+        """Change budgets/policy/retention (takes effect on the next step)"""
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}' (expected one of {', '.join(POLICIES)})")
+        unknown = set(retention or {}) - set(RETENTION_STATES)
+        if unknown:
+            raise ValueError(f"Unknown retention state(s) {', '.join(sorted(unknown))} "
+                             f"(expected {', '.join(RETENTION_STATES)})")
+        self.max_bytes = max_bytes
+        self.budgets = {prefix.strip("/"): size for prefix, size in (budgets or {}).items()}
+        self.policy = policy
+        self.retention = dict(retention or {})
+
+    # --- Pins ---
+
+    def pin(self, owner: str, keys: Iterable[str]):
+        """Protect keys (in every namespace) until unpin(owner); replaces owner's previous pins"""
+        with self._lock:
+            self._pins[owner] = set(keys)
+            self._pinned = set().union(*self._pins.values())
+
+    def unpin(self, owner: str):
+        with self._lock:
+            self._pins.pop(owner, None)
+            self._pinned = set().union(*self._pins.values()) if self._pins else set()
+
+    # --- Store events ---
+
+    def record_access(self, namespace: str, key: str, path: Path):
+        """A lookup hit"""
+        with self._lock:
+            entry = self._entries.get(namespace, {}).get(key)
+            if entry is not None:
+                entry.last_access = time.time()
+                entry.hits += 1
+                return
+        # Not crawled yet: pick it up now
+        self._track(namespace, key, path.parent, hits=1)
+
+    def record_write(self, namespace: str, key: str, path: Path):
+        """An asset was published"""
+        self._track(namespace, key, path.parent)
+
+    # --- Budgets ---
+
+    def usage(self) -> Dict[str, int]:
+        """Bytes per namespace (of what has been seen so far)"""
+        with self._lock:
+            return dict(self._usage)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(self._usage.values())
+
+    def step(self) -> int:
+        """
+        Crawl a few more shard directories, then evict until within budget
+
+        Returns:
+            Number of assets evicted
+        """
+        self._crawl_some()
+        if not self._over_budget():
+            return 0
+
+        states = self.index.retention_states() if self.index is not None else {}
+        evicted = 0
+        for prefix, budget in list(self.budgets.items()):
+            evicted += self._enforce(prefix, budget, self.max_evictions - evicted, states)
+        if self.max_bytes is not None:
+            evicted += self._enforce(None, self.max_bytes, self.max_evictions - evicted, states)
+        return evicted
+
+    def start(self):
+        """Run step() every interval seconds in a daemon thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-eviction", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                evicted = self.step()
+                if evicted:
+                    print(f"  [Cache] Evicted {evicted} assets "
+                          f"({self.evicted_bytes / 1024 / 1024:.0f} MB freed so far)")
+            except Exception as e:
+                print(f"  [Cache] Eviction step failed: {e}")
+            # Keep going without pause while there is crawling or evicting left
+            if self._crawl is None and not self._over_budget():
+                self._stop.wait(self.interval)
+            else:
+                self._stop.wait(0.05)
+
+    # --- Internals ---
+
+    def _matches(self, namespace: str, prefix: Optional[str]) -> bool:
+        return prefix is None or namespace == prefix or namespace.startswith(prefix + "/")
+
+    def _bytes_under(self, prefix: Optional[str]) -> int:
+        return sum(size for ns, size in self._usage.items() if self._matches(ns, prefix))
+
+    def _over_budget(self) -> bool:
+        with self._lock:
+            if self.max_bytes is not None and self._bytes_under(None) > self.max_bytes:
+                return True
+            return any(self._bytes_under(prefix) > budget for prefix, budget in self.budgets.items())
+
+    def _enforce(self, prefix: Optional[str], budget: int, limit: int,
+                 states: Dict[Tuple[str, str], str]) -> int:
+        """Evict from namespaces under prefix (None: all) until they fit budget"""
+        if limit <= 0:
+            return 0
+
+        with self._lock:
+            excess = self._bytes_under(prefix) - budget
+            if excess <= 0:
+                return 0
+
+            now = time.time()
+            order = {state: idx for idx, state in enumerate(RETENTION_STATES)}
+            candidates = []
+            for ns, entries in self._entries.items():
+                if not self._matches(ns, prefix):
+                    continue
+                for key, entry in entries.items():
+                    state = states.get((ns, key), UNREFERENCED)
+                    retention = self._retention(state)
+                    if key in self._pinned or retention is None or entry.last_access >= now - retention:
+                        continue
+                    candidates.append((order[state], ns, key, entry))
+
+            # Superseded drafts go first, then by policy within each state
+            if self.policy == "lfu":
+                rank = lambda c: (c[0], c[3].hits, c[3].last_access)
+            else:
+                rank = lambda c: (c[0], c[3].last_access)
+
+            victims = []
+            for _, ns, key, entry in heapq.nsmallest(limit, candidates, key=rank):
+                if excess <= 0:
+                    break
+                victims.append((ns, key, entry))
+                excess -= entry.size
+                # Forget it now so concurrent steps don't pick it again
+                del self._entries[ns][key]
+                self._usage[ns] -= entry.size
+
+        for ns, key, entry in victims:
+            freed = _delete_asset(entry.leaf, key)
+            if self.index is not None:
+                self.index.remove(ns, key)
+            self.evicted_count += 1
+            self.evicted_bytes += freed
+        return len(victims)
+
+    def _retention(self, state: str) -> Optional[float]:
+        """Seconds an asset in a retention state must go unused before eviction (None: never)"""
+        if state in self.retention:
+            return self.retention[state]
+        return None if state == LIVE else self.min_age
+
+    def _track(self, namespace: str, key: str, leaf: Path, hits: int = 0):
+        size = _group_assets(leaf).get(key, (0, 0.0))[0]
+        if size == 0:
+            return
+        with self._lock:
+            entries = self._entries.setdefault(namespace, {})
+            previous = entries.get(key)
+            if previous is not None:
+                self._usage[namespace] -= previous.size
+                hits += previous.hits
+            entries[key] = CacheEntry(leaf, size, time.time(), hits)
+            self._usage[namespace] = self._usage.get(namespace, 0) + size
+
+    def _crawl_some(self):
+        """Index the next scan_batch shard directories"""
+        if self._crawl is None:
+            return
+        for _ in range(self.scan_batch):
+            try:
+                namespace, leaf = next(self._crawl)
+            except StopIteration:
+                self._crawl = None
+                if self.index is not None:
+                    self.index.set_meta(CRAWLED, str(time.time()))
+                return
+            for key, (size, mtime) in _group_assets(leaf).items():
+                with self._lock:
+                    entries = self._entries.setdefault(namespace, {})
+                    if key in entries:
+                        continue  # Already reported by the store
+                    entries[key] = CacheEntry(leaf, size, mtime)
+                    self._usage[namespace] = self._usage.get(namespace, 0) + size
+            if self.index is not None:
+                for name, size, mtime in _list_files(leaf):
+                    key, ext = name.split(".", 1)
+                    self.index.record_write(namespace, key, "." + ext, size, mtime=mtime)
+
+    def _load_index(self):
+        """Start from the asset index instead of crawling"""
+        with self._lock:
+            for namespace, key, size, last_access, hits in self.index.entries():
+                leaf = self.root / namespace / key[:2] / key[2:4]
+                self._entries.setdefault(namespace, {})[key] = CacheEntry(leaf, size or 0, last_access, hits)
+                self._usage[namespace] = self._usage.get(namespace, 0) + (size or 0)
+
+    def _walk_shards(self, directory: Optional[Path] = None, parts: Tuple[str, ...] = ()) -> Iterator[Tuple[str, Path]]:
+        """Yield (namespace, <ab>/<cd> shard directory) for the whole tree, lazily"""
+        directory = directory or self.root
+        subdirs = _subdirs(directory)
+
+        if parts and any(_SHARD.match(name) for name in subdirs):
+            # A namespace: <namespace>/<ab>/<cd>/<key><ext>
+            for ab in filter(_SHARD.match, subdirs):
+                for cd in filter(_SHARD.match, _subdirs(directory / ab)):
+                    yield "/".join(parts), directory / ab / cd
+            return
+
+        for name in subdirs:
+            yield from self._walk_shards(directory / name, parts + (name,))
+
+
+def _subdirs(directory: Path) -> List[str]:
+    try:
+        with os.scandir(directory) as it:
+            return sorted(entry.name for entry in it if entry.is_dir())
+    except OSError:
+        return []
+
+
+def _list_files(leaf: Path) -> List[Tuple[str, int, float]]:
+    """(name, bytes, mtime) of the asset files in a shard directory"""
+    files = []
+    try:
+        with os.scandir(leaf) as it:
+            for entry in it:
+                if not entry.is_file() or entry.name.startswith(".") or "." not in entry.name:
+                    continue  # Temp files of in-progress writes
+                stat = entry.stat()
+                files.append((entry.name, stat.st_size, stat.st_mtime))
+    except OSError:
+        pass
+    return files
+
+
+def _group_assets(leaf: Path) -> Dict[str, Tuple[int, float]]:
+    """{key: (bytes, newest mtime)} for the files in a shard directory"""
+    assets: Dict[str, Tuple[int, float]] = {}
+    for name, size, mtime in _list_files(leaf):
+        key = name.split(".", 1)[0]
+        total, newest = assets.get(key, (0, 0.0))
+        assets[key] = (total + size, max(newest, mtime))
+    return assets
+
+
+def _delete_asset(leaf: Path, key: str) -> int:
+    """Delete an asset and its sidecars; returns bytes freed"""
+    freed = 0
+    try:
+        with os.scandir(leaf) as it:
+            names = [entry.name for entry in it if entry.name.startswith(key + ".")]
+    except OSError:
+        return 0
+    for name in names:
+        path = leaf / name
+        try:
+            freed += path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    return freed
@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 import hashlib
 
+from engines.asset_store import AssetStore
+
 
 @dataclass
 class ImageGenerationRequest:
@@ -66,6 +68,9 @@ class ImageProvider(ABC):
     - Local caching for efficiency
     """
 
+    # Asset store namespace under image/ (default: lowercased class name)
+    asset_namespace: Optional[str] = None
+
     def __init__(self, config: dict):
         """
         Initialize provider with configuration.
@@ -74,8 +79,15 @@ class ImageProvider(ABC):
             config: Provider-specific configuration dictionary
         """
         self.config = config
+
+        # Outputs live in the shared asset store; assets left in the old flat
+        # cache_dir are migrated on lookup
         self.cache_dir = Path(config.get("cache_dir", "./cache"))
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.assets = AssetStore.from_config(
+            config,
+            f"image/{self.asset_namespace or self.__class__.__name__.lower()}",
+            legacy_dirs=[self.cache_dir]
+        )
 
     @abstractmethod
     def generate(self, request: ImageGenerationRequest) -> ImageGenerationResult:
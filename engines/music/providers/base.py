@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 import hashlib
 
+from engines.asset_store import AssetStore
+
 
 @dataclass
 class MusicGenerationRequest:
@@ -68,6 +70,9 @@ class MusicProvider(ABC):
     - Local caching for efficiency
     """
 
+    # Asset store namespace under music/ (default: lowercased class name)
+    asset_namespace: Optional[str] = None
+
     def __init__(self, config: dict):
         """
         Initialize provider with configuration.
@@ -76,8 +81,15 @@ class MusicProvider(ABC):
             config: Provider-specific configuration dictionary
         """
         self.config = config
+
+        # Outputs live in the shared asset store; assets left in the old flat
+        # cache_dir are migrated on lookup
         self.cache_dir = Path(config.get("cache_dir", "./cache"))
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.assets = AssetStore.from_config(
+            config,
+            f"music/{self.asset_namespace or self.__class__.__name__.lower()}",
+            legacy_dirs=[self.cache_dir]
+        )
 
     @abstractmethod
     def generate(self, request: MusicGenerationRequest) -> MusicGenerationResult:
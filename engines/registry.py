@@ -0,0 +1,115 @@
+"""
+Engine Registry - Lazy Provider Lookup by Engine ID
+
+Maps the engine IDs used in EngineConfiguration (activeTTSEngineId, ...)
+to "module:attribute" strings. Provider modules are imported only when an
+engine is first created, so the director never pays for piper, requests,
+torch, etc. unless a manifest actually selects an engine that needs them.
+
+Example:
+    from engines import registry
+
+    provider = registry.create("tts", "piper", {"voice": "en_US-lessac-medium"})
+    provider.warmup()
+
+Adding an engine is one register() call - no import in main.py:
+    registry.register("image", "sdxl", "engines.image.providers.local_sdxl:SDXLProvider")
+"""
+
+import importlib
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# (kind, engine ID) -> "module:attribute" (a provider class or factory taking a config dict)
+_REGISTRY: Dict[Tuple[str, str], str] = {
+    ("tts", "piper"): "engines.tts.providers.local_piper:PiperProvider",
+    ("tts", "higgs-audio-v2"): "engines.tts.providers.colab_higgs:HiggsAudioProvider",
+    ("tts", "hybrid"): "engines.registry:create_hybrid_tts",
+}
+
+_resolved: Dict[Tuple[str, str], Callable[[Dict[str, Any]], Any]] = {}
+_lock = threading.Lock()
+
+
+def register(kind: str, engine_id: str, target: str) -> None:
+    """
+    Register an engine
+
+    Args:
+        kind: Engine kind (tts, image, music, sfx, video)
+        engine_id: ID as used in EngineConfiguration
+        target: "package.module:ClassOrFactory", imported on first use
+    """
+    if ":" not in target:
+        raise ValueError(f"Engine target must look like 'module:attribute', got '{target}'")
+    with _lock:
+        _REGISTRY[(kind, engine_id)] = target
+        _resolved.pop((kind, engine_id), None)
+
+
+def is_registered(kind: str, engine_id: str) -> bool:
+    return (kind, engine_id) in _REGISTRY
+
+
+def resolve(kind: str, engine_id: str) -> Optional[Callable[[Dict[str, Any]], Any]]:
+    """
+    Import and return the provider class/factory for an engine
+
+    Returns:
+        The callable, or None if the engine ID isn't registered
+    """
+    key = (kind, engine_id)
+    with _lock:
+        if key in _resolved:
+            return _resolved[key]
+        target = _REGISTRY.get(key)
+    if target is None:
+        return None
+
+    module_name, attribute = target.split(":", 1)
+    factory = getattr(importlib.import_module(module_name), attribute)
+
+    with _lock:
+        _resolved[key] = factory
+    return factory
+
+
+def create(kind: str, engine_id: str, config: Dict[str, Any]):
+    """
+    Instantiate an engine's provider
+
+    Returns:
+        Provider instance (not yet warmed up), or None if not registered
+    """
+    factory = resolve(kind, engine_id)
+    if factory is None:
+        return None
+    return factory(config)
+
+
+def create_hybrid_tts(settings: Dict[str, Any]):
+    """
+    Piper + Higgs behind a HybridProvider
+
+    settings["piper"] and settings["higgs"] configure the tiers; the Higgs
+    tier is only added when a worker URL (or workers file) is configured.
+    With settings["higgs"]["hedge_with_piper"], slow Higgs requests are
+    raced against the Piper tier (see HiggsAudioProvider hedging).
+    """
+    from engines.tts.providers.hybrid import HybridProvider
+
+    # Asset store settings given for the hybrid engine apply to every tier
+    shared = {k: v for k, v in settings.items() if k.startswith(("asset_", "shared_cache"))}
+
+    tiers = {"piper": create("tts", "piper", {**shared, **settings.get("piper", {})})}
+
+    higgs = {**shared, **settings.get("higgs", {})}
+    if settings.get("colab_url"):
+        higgs.setdefault("colab_url", settings["colab_url"])
+    if higgs.get("colab_url") or higgs.get("colab_urls") or higgs.get("workers_file"):
+        if higgs.pop("hedge_with_piper", False):
+            higgs["hedge_provider"] = tiers["piper"]
+        tiers["higgs"] = create("tts", "higgs-audio-v2", higgs)
+
+    return HybridProvider({**settings, "tiers": tiers})
@@ -0,0 +1,163 @@
+"""
+Run Metrics - Cache and Generation Counters for One Render
+
+The asset index keeps lifetime totals per namespace and project; this
+collects the same kind of numbers for a single run of the director, so
+every render reports what its cache actually did:
+
+- hits and misses per engine namespace
+- bytes generated (written by a provider) versus reused (served from cache)
+- seconds saved: the recorded generation cost of every asset that was hit
+- generation latency per namespace, summarized as p50/p95
+- failed generations per namespace
+
+A RunMetrics is registered as an asset store observer for the duration of
+a run (see asset_store.add_observer) and sees every lookup, write and
+generation cost in any store of the process.
+
+Example:
+    metrics = RunMetrics()
+    asset_store.add_observer(metrics)
+    try:
+        render(manifest)
+    finally:
+        asset_store.remove_observer(metrics)
+    print(metrics.format())
+"""
+
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class NamespaceMetrics:
+    """Counters of one engine namespace during a run"""
+    hits: int = 0
+    misses: int = 0
+    bytes_generated: int = 0
+    bytes_reused: int = 0
+    seconds_saved: float = 0.0
+    failures: int = 0
+    latencies: List[float] = field(default_factory=list)  # Generation seconds per generated asset
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def percentile(samples: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of some samples (None if there are none)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(len(ordered) * fraction)) - 1]
+
+
+class RunMetrics:
+    """
+    Per-run cache and generation counters, fed by the asset store
+
+    Thread-safe: providers generating in worker threads report concurrently.
+    """
+
+    def __init__(self):
+        self._namespaces: Dict[str, NamespaceMetrics] = {}
+        self._lock = threading.Lock()
+
+    # Asset store observer interface
+
+    def record_hit(self, namespace: str, size: int, saved_seconds: Optional[float]) -> None:
+        with self._lock:
+            metrics = self._get(namespace)
+            metrics.hits += 1
+            metrics.bytes_reused += size
+            metrics.seconds_saved += saved_seconds or 0.0
+
+    def record_miss(self, namespace: str) -> None:
+        with self._lock:
+            self._get(namespace).misses += 1
+
+    def record_write(self, namespace: str, size: int) -> None:
+        with self._lock:
+            self._get(namespace).bytes_generated += size
+
+    def record_generation(self, namespace: str, seconds: float) -> None:
+        with self._lock:
+            self._get(namespace).latencies.append(seconds)
+
+    def record_failure(self, namespace: str) -> None:
+        with self._lock:
+            self._get(namespace).failures += 1
+
+    # Reporting
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters so far, as the "metrics" section of RENDER_STATUS.json"""
+        with self._lock:
+            namespaces = {name: self._namespace_dict(m) for name, m in sorted(self._namespaces.items())}
+
+        hits = sum(m["hits"] for m in namespaces.values())
+        misses = sum(m["misses"] for m in namespaces.values())
+        return {
+            "cache": {
+                "hits": hits,
+                "misses": misses,
+                "hitRate": hits / (hits + misses) if hits + misses else 0.0,
+                "bytesGenerated": sum(m["bytesGenerated"] for m in namespaces.values()),
+                "bytesReused": sum(m["bytesReused"] for m in namespaces.values()),
+                "secondsSaved": sum(m["secondsSaved"] for m in namespaces.values()),
+            },
+            "engines": namespaces
+        }
+
+    def format(self) -> str:
+        """Human-readable summary for the run log"""
+        snapshot = self.snapshot()
+        lines = [
+            f"{'Namespace':<20} {'Hits':>6} {'Misses':>7} {'Hit %':>6} {'Gen MB':>8} {'Reused MB':>10} "
+            f"{'Saved s':>8} {'p50 s':>7} {'p95 s':>7} {'Failed':>6}"
+        ]
+        for name, m in snapshot["engines"].items():
+            latency = m["generationLatency"]
+            lines.append(
+                f"{name:<20} {m['hits']:>6} {m['misses']:>7} {m['hitRate'] * 100:>5.1f}% "
+                f"{m['bytesGenerated'] / 1024 / 1024:>8.1f} {m['bytesReused'] / 1024 / 1024:>10.1f} "
+                f"{m['secondsSaved']:>8.1f} {_format_seconds(latency['p50']):>7} {_format_seconds(latency['p95']):>7} "
+                f"{m['failures']:>6}"
+            )
+        cache = snapshot["cache"]
+        lines.append(
+            f"Cache: {cache['hits']}/{cache['hits'] + cache['misses']} hits ({cache['hitRate'] * 100:.1f}%), "
+            f"{cache['bytesGenerated'] / 1024 / 1024:.1f} MB generated, {cache['bytesReused'] / 1024 / 1024:.1f} MB reused, "
+            f"~{cache['secondsSaved']:.0f}s of generation saved"
+        )
+        return "\n".join(lines)
+
+    def _get(self, namespace: str) -> NamespaceMetrics:
+        if namespace not in self._namespaces:
+            self._namespaces[namespace] = NamespaceMetrics()
+        return self._namespaces[namespace]
+
+    @staticmethod
+    def _namespace_dict(metrics: NamespaceMetrics) -> Dict[str, Any]:
+        return {
+            "hits": metrics.hits,
+            "misses": metrics.misses,
+            "hitRate": metrics.hit_rate,
+            "bytesGenerated": metrics.bytes_generated,
+            "bytesReused": metrics.bytes_reused,
+            "secondsSaved": metrics.seconds_saved,
+            "failures": metrics.failures,
+            "generationLatency": {
+                "count": len(metrics.latencies),
+                "p50": percentile(metrics.latencies, 0.50),
+                "p95": percentile(metrics.latencies, 0.95),
+            }
+        }
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds:.2f}"
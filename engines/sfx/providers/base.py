@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 import hashlib
 
+from engines.asset_store import AssetStore
+
 
 @dataclass
 class SFXGenerationRequest:
@@ -65,6 +67,9 @@ class SFXProvider(ABC):
     - Local caching for efficiency
     """
 
+    # Asset store namespace under sfx/ (default: lowercased class name)
+    asset_namespace: Optional[str] = None
+
     def __init__(self, config: dict):
         """
         Initialize provider with configuration.
@@ -73,8 +78,15 @@ class SFXProvider(ABC):
             config: Provider-specific configuration dictionary
         """
         self.config = config
+
+        # Outputs live in the shared asset store; assets left in the old flat
+        # cache_dir are migrated on lookup
         self.cache_dir = Path(config.get("cache_dir", "./cache"))
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.assets = AssetStore.from_config(
+            config,
+            f"sfx/{self.asset_namespace or self.__class__.__name__.lower()}",
+            legacy_dirs=[self.cache_dir]
+        )
 
     @abstractmethod
     def generate(self, request: SFXGenerationRequest) -> SFXGenerationResult:
@@ -0,0 +1,382 @@
+"""
+Shared Cache - Second Asset Store Tier for Render Farms
+
+Purpose: An asset generated on any render node is generated exactly once
+How: Each node's AssetStore falls through local -> shared on a miss, copies
+     shared hits into its local store (promotion), and pushes everything it
+     generates to the shared tier in the background
+
+Two kinds of shared tier, chosen by the "shared_cache" setting:
+- A directory on network storage (NFS/SMB mount), same sharded layout as
+  the local store:           "shared_cache": "/mnt/farm/cache"
+- A small HTTP cache server: "shared_cache": "http://cache-host:8765"
+
+    python -m engines.shared_cache serve --root /srv/asset-cache --port 8765
+
+Exactly once: before generating, a node claims the asset on the shared
+tier (a lease). Other nodes that miss the same asset while the lease is
+held wait for it to be published instead of generating it themselves.
+Leases expire (lease_seconds), so a node that dies mid-generation only
+delays the others.
+
+Shared-tier failures are logged and treated as misses; they never fail a
+render.
+"""
+
+import os
+import re
+import shutil
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+_FILE_PATTERN = re.compile(r"^[0-9a-f]{64}\.[A-Za-z0-9_.]+$")
+_NAMESPACE_PART = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+# Pushes run in the background; the pool's threads are joined at interpreter exit
+_push_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="shared-push")
+
+
+def _shard(key: str) -> str:
+    return f"{key[:2]}/{key[2:4]}"
+
+
+class SharedTier(ABC):
+    """
+    Interface of a shared cache tier
+
+    Assets are addressed like the local store: namespace, key and file
+    extension (sidecars are just other extensions of the same key).
+    """
+
+    def __init__(self, lease_seconds: float = 900.0, poll_interval: float = 2.0):
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    @abstractmethod
+    def fetch(self, namespace: str, key: str, ext: str, destination: Path) -> bool:
+        """Copy an asset to destination; False if the tier doesn't have it"""
+        pass
+
+    @abstractmethod
+    def push(self, namespace: str, key: str, ext: str, source: Path) -> None:
+        """Store an asset (atomically) and release any claim on it"""
+        pass
+
+    @abstractmethod
+    def claim(self, namespace: str, key: str, ext: str) -> bool:
+        """Take the generation lease; False if another node holds a live one"""
+        pass
+
+    @abstractmethod
+    def release(self, namespace: str, key: str, ext: str) -> None:
+        """Give up the generation lease"""
+        pass
+
+    def push_async(self, namespace: str, key: str, exts: Iterable[str], directory: Path,
+                   release_ext: Optional[str] = None) -> None:
+        """
+        Push an asset and its sidecars in the background (sidecars first)
+
+        Pushing a file releases the claim on it; release_ext names a claim
+        taken under another extension, released once everything is pushed.
+        """
+        exts = list(exts)
+
+        def push_all():
+            for ext in exts:
+                path = directory / f"{key}{ext}"
+                try:
+                    if path.exists():
+                        self.push(namespace, key, ext, path)
+                except (OSError, urllib.error.URLError) as e:
+                    print(f"  [SharedCache] Could not push {namespace}/{key[:12]}{ext}: {e}")
+            if release_ext and release_ext not in exts:
+                try:
+                    self.release(namespace, key, release_ext)
+                except (OSError, urllib.error.URLError) as e:
+                    print(f"  [SharedCache] Could not release {namespace}/{key[:12]}{release_ext}: {e}")
+        _push_executor.submit(push_all)
+
+
+class DirectoryTier(SharedTier):
+    """
+    Shared tier on a network filesystem
+
+    Leases are <asset>.lock files created with O_EXCL and holding the
+    owner; a lock older than lease_seconds is considered abandoned. Only
+    the owner removes its lock, so a node whose lease was taken over can't
+    release the new holder's.
+    """
+
+    def __init__(self, root: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.root = Path(root)
+
+    def _path(self, namespace: str, key: str, ext: str) -> Path:
+        return self.root / namespace / _shard(key) / f"{key}{ext}"
+
+    def fetch(self, namespace: str, key: str, ext: str, destination: Path) -> bool:
+        try:
+            shutil.copyfile(self._path(namespace, key, ext), destination)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def push(self, namespace: str, key: str, ext: str, source: Path) -> None:
+        path = self._path(namespace, key, ext)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{socket.gethostname()}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self.release(namespace, key, ext)
+
+    def claim(self, namespace: str, key: str, ext: str) -> bool:
+        lock_path = self._path(namespace, key, ext + ".lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if lock_path.read_text() == self.owner:
+                        return True
+                    if time.time() - lock_path.stat().st_mtime < self.lease_seconds:
+                        return False
+                    lock_path.unlink()  # Abandoned lease: take it over
+                except FileNotFoundError:
+                    pass  # Released meanwhile
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(self.owner)
+            return True
+        return False
+
+    def release(self, namespace: str, key: str, ext: str) -> None:
+        lock_path = self._path(namespace, key, ext + ".lock")
+        try:
+            if lock_path.read_text() == self.owner:
+                lock_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class HTTPTier(SharedTier):
+    """
+    Shared tier served by `python -m engines.shared_cache serve`
+
+    Protocol:
+        GET/HEAD/PUT  /assets/<namespace>/<key><ext>
+        POST/DELETE   /claims/<namespace>/<key><ext>?ttl=<seconds>&owner=<node>
+                      (POST: 201 claimed, 409 held by someone else)
+    """
+
+    def __init__(self, url: str, timeout: float = 30.0, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _url(self, kind: str, namespace: str, key: str, ext: str, **query) -> str:
+        url = f"{self.url}/{kind}/{urllib.parse.quote(namespace)}/{key}{urllib.parse.quote(ext)}"
+        return url + ("?" + urllib.parse.urlencode(query) if query else "")
+
+    def fetch(self, namespace: str, key: str, ext: str, destination: Path) -> bool:
+        try:
+            with urllib.request.urlopen(self._url("assets", namespace, key, ext), timeout=self.timeout) as response, \
+                    open(destination, "wb") as f:
+                shutil.copyfileobj(response, f)
+            return True
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+
+    def push(self, namespace: str, key: str, ext: str, source: Path) -> None:
+        with open(source, "rb") as f:
+            request = urllib.request.Request(
+                self._url("assets", namespace, key, ext), data=f, method="PUT",
+                headers={"Content-Length": str(os.fstat(f.fileno()).st_size)}
+            )
+            urllib.request.urlopen(request, timeout=self.timeout).close()
+
+    def claim(self, namespace: str, key: str, ext: str) -> bool:
+        request = urllib.request.Request(
+            self._url("claims", namespace, key, ext, ttl=int(self.lease_seconds), owner=self.owner),
+            data=b"", method="POST"
+        )
+        try:
+            urllib.request.urlopen(request, timeout=self.timeout).close()
+            return True
+        except urllib.error.HTTPError as e:
+            if e.code == 409:
+                return False
+            raise
+
+    def release(self, namespace: str, key: str, ext: str) -> None:
+        request = urllib.request.Request(
+            self._url("claims", namespace, key, ext, owner=self.owner), method="DELETE"
+        )
+        urllib.request.urlopen(request, timeout=self.timeout).close()
+
+
+def open_shared(spec: str, **kwargs) -> SharedTier:
+    """Shared tier for a "shared_cache" setting (URL or directory)"""
+    if spec.startswith(("http://", "https://")):
+        return HTTPTier(spec, **kwargs)
+    return DirectoryTier(Path(spec), **kwargs)
+
+
+# --- Cache server ---
+
+def serve(root: Path, host: str = "0.0.0.0", port: int = 8765):
+    """Run the HTTP shared cache (stdlib only, one thread per request)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    store = DirectoryTier(root)
+    claims = {}  # (namespace, file name) -> (owner, expiry)
+    claims_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _parse(self):
+            """(kind, namespace, key, ext, query) or None after sending 400"""
+            parsed = urllib.parse.urlsplit(self.path)
+            parts = [urllib.parse.unquote(p) for p in parsed.path.strip("/").split("/")]
+            if (len(parts) < 3 or parts[0] not in ("assets", "claims")
+                    or not _FILE_PATTERN.match(parts[-1])
+                    or not all(_NAMESPACE_PART.match(p) and p not in (".", "..") for p in parts[1:-1])):
+                self.send_error(400, "Expected /assets|claims/<namespace>/<key><ext>")
+                return None
+            key, ext = parts[-1][:64], parts[-1][64:]
+            query = dict(urllib.parse.parse_qsl(parsed.query))
+            return parts[0], "/".join(parts[1:-1]), key, ext, query
+
+        def do_HEAD(self):
+            self._get(body=False)
+
+        def do_GET(self):
+            self._get(body=True)
+
+        def _get(self, body: bool):
+            request = self._parse()
+            if request is None:
+                return
+            _, namespace, key, ext, _ = request
+            path = store._path(namespace, key, ext)
+            if not path.is_file():
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(path.stat().st_size))
+            self.end_headers()
+            if body:
+                with open(path, "rb") as f:
+                    shutil.copyfileobj(f, self.wfile)
+
+        def do_PUT(self):
+            request = self._parse()
+            if request is None:
+                return
+            kind, namespace, key, ext, _ = request
+            if kind != "assets":
+                self.send_error(405)
+                return
+
+            path = store._path(namespace, key, ext)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+            remaining = int(self.headers.get("Content-Length", 0))
+            try:
+                with open(tmp_path, "wb") as f:
+                    while remaining > 0:
+                        chunk = self.rfile.read(min(remaining, 1024 * 1024))
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        remaining -= len(chunk)
+                if remaining:
+                    self.send_error(400, "Incomplete upload")
+                    return
+                os.replace(tmp_path, path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+            with claims_lock:
+                claims.pop((namespace, key + ext), None)
+            self.send_response(201)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_POST(self):
+            request = self._parse()
+            if request is None:
+                return
+            kind, namespace, key, ext, query = request
+            if kind != "claims":
+                self.send_error(405)
+                return
+
+            now = time.time()
+            with claims_lock:
+                holder = claims.get((namespace, key + ext))
+                if holder and holder[1] > now and holder[0] != query.get("owner"):
+                    self.send_error(409, f"Claimed by {holder[0]}")
+                    return
+                claims[(namespace, key + ext)] = (query.get("owner", ""), now + float(query.get("ttl", 900)))
+            self.send_response(201)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_DELETE(self):
+            request = self._parse()
+            if request is None:
+                return
+            _, namespace, key, ext, query = request
+            with claims_lock:
+                holder = claims.get((namespace, key + ext))
+                if holder and holder[0] == query.get("owner", ""):
+                    del claims[(namespace, key + ext)]
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass  # One line per asset transfer is too noisy for a farm
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"[SharedCache] Serving {root} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shared asset cache server for render farms")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Run the HTTP cache server")
+    serve_parser.add_argument("--root", type=Path, required=True, help="Directory to store assets in")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    serve(args.root, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Test AssetStore publishing and in-process single-flight
+
+Tests:
+1. Atomic publish (failed writes leave nothing behind)
+2. Lookups waiting on another thread's claim
+3. Releasing and taking over stuck claims
+4. Late claims of already-published assets
+
+Run: python -m pytest -q engines/test_asset_store.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Repo root (engines.asset_store) on the path, as for the engine test scripts
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engines.asset_store import AssetStore
+
+
+KEY = "ab" * 32
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AssetStore(tmp_path, "tts/test")
+
+
+def lookup_in_thread(store: AssetStore, key: str = KEY):
+    """Start a lookup on another thread; returns (thread, results list)"""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(store.lookup(key, ".wav")))
+    thread.start()
+    return thread, results
+
+
+def test_publish_then_lookup_hits(store):
+    assert store.lookup(KEY, ".wav") is None
+    path = store.publish(KEY, ".wav", b"audio")
+
+    assert path == store.path(KEY, ".wav")
+    assert store.lookup(KEY, ".wav") == path
+    assert path.read_bytes() == b"audio"
+
+
+def test_failed_write_publishes_nothing(store):
+    assert store.lookup(KEY, ".wav") is None
+    with pytest.raises(RuntimeError):
+        with store.writing(KEY, ".wav") as tmp_path:
+            tmp_path.write_bytes(b"partial")
+            raise RuntimeError("generation failed")
+
+    assert not store.contains(KEY, ".wav")
+    assert list(store.path(KEY, ".wav").parent.iterdir()) == []  # No temp file left
+
+
+def test_waiter_gets_the_claimed_asset(store):
+    assert store.lookup(KEY, ".wav") is None  # Claimed by this thread
+
+    thread, results = lookup_in_thread(store)
+    time.sleep(0.1)
+    assert thread.is_alive()  # Waiting on our claim, not generating a second copy
+
+    store.publish(KEY, ".wav", b"audio")
+    thread.join(timeout=5)
+    assert results == [store.path(KEY, ".wav")]
+
+
+def test_claiming_thread_does_not_wait_on_itself(store):
+    assert store.lookup(KEY, ".wav") is None
+    assert store.lookup(KEY, ".wav") is None
+
+
+def test_release_hands_the_claim_to_a_waiter(store):
+    assert store.lookup(KEY, ".wav") is None
+
+    thread, results = lookup_in_thread(store)
+    time.sleep(0.1)
+    store.release(KEY, ".wav")
+    thread.join(timeout=5)
+    assert results == [None]  # The waiter's own miss: it generates now
+
+
+def test_stuck_claim_is_taken_over(tmp_path):
+    store = AssetStore(tmp_path, "tts/test", claim_timeout=0.1)
+    assert store.lookup(KEY, ".wav") is None  # Claimed, never published
+
+    thread, results = lookup_in_thread(store)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert results == [None]
+
+
+def test_claim_skips_published_and_claimed_assets(store):
+    store.publish(KEY, ".wav", b"audio")
+    assert not store.claim(KEY, ".wav")
+
+    other = "cd" * 32
+    assert store.claim(other, ".wav")
+    claimed_elsewhere = []
+    thread = threading.Thread(target=lambda: claimed_elsewhere.append(store.claim(other, ".wav")))
+    thread.start()
+    thread.join(timeout=5)
+    assert claimed_elsewhere == [False]
+    store.release(other, ".wav")
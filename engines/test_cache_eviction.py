@@ -0,0 +1,126 @@
+"""
+Test CacheEvictor budgets, eviction order and pins
+
+Run: python -m pytest -q engines/test_cache_eviction.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Repo root (engines.cache_eviction) on the path, as for the engine test scripts
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from engines import asset_store
+from engines.cache_eviction import CacheEvictor, parse_size
+
+
+def key(char: str) -> str:
+    return char * 64
+
+
+def put_asset(root: Path, namespace: str, asset_key: str, size: int, age: float) -> Path:
+    """An asset of size bytes, last used age seconds ago"""
+    path = root / namespace / asset_key[:2] / asset_key[2:4] / f"{asset_key}.wav"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+    used = time.time() - age
+    os.utime(path, (used, used))
+    return path
+
+
+@pytest.fixture
+def make_evictor(tmp_path):
+    evictors = []
+
+    def make(**kwargs):
+        evictor = CacheEvictor(tmp_path, use_index=False, min_age=0, **kwargs)
+        evictors.append(evictor)
+        return evictor
+
+    yield make
+    for evictor in evictors:
+        asset_store.remove_tracker(tmp_path, evictor)
+
+
+def test_parse_size():
+    assert parse_size("500MB") == 500 * 1024 ** 2
+    assert parse_size("1.5G") == int(1.5 * 1024 ** 3)
+    assert parse_size(1234) == 1234
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_lru_evicts_least_recently_used_first(tmp_path, make_evictor):
+    oldest = put_asset(tmp_path, "tts/piper", key("a"), 100, age=300)
+    middle = put_asset(tmp_path, "tts/piper", key("b"), 100, age=200)
+    newest = put_asset(tmp_path, "tts/piper", key("c"), 100, age=100)
+
+    evictor = make_evictor(max_bytes=250)
+    assert evictor.step() == 1
+
+    assert not oldest.exists()
+    assert middle.exists() and newest.exists()
+    assert evictor.total_bytes() == 200
+
+
+def test_lfu_evicts_least_used_first(tmp_path, make_evictor):
+    popular = put_asset(tmp_path, "tts/piper", key("a"), 100, age=300)
+    rare = put_asset(tmp_path, "tts/piper", key("b"), 100, age=200)
+
+    evictor = make_evictor(policy="lfu")
+    evictor.step()  # Crawl only: no budget yet
+    evictor.record_access("tts/piper", key("a"), popular)
+    evictor.record_access("tts/piper", key("a"), popular)
+    evictor.record_access("tts/piper", key("b"), rare)  # Most recent, but used less
+
+    evictor.configure(max_bytes=150, policy="lfu")
+    assert evictor.step() == 1
+
+    assert popular.exists()
+    assert not rare.exists()
+
+
+def test_pinned_assets_are_never_evicted(tmp_path, make_evictor):
+    pinned = put_asset(tmp_path, "tts/piper", key("a"), 100, age=300)
+    unpinned = put_asset(tmp_path, "tts/piper", key("b"), 100, age=200)
+
+    evictor = make_evictor(max_bytes=150)
+    evictor.pin("project-1", [key("a")])
+    evictor.step()
+
+    assert pinned.exists()
+    assert not unpinned.exists()
+
+    # Once unpinned it is the oldest asset again
+    evictor.unpin("project-1")
+    evictor.record_write("tts/piper", key("c"), put_asset(tmp_path, "tts/piper", key("c"), 100, age=0))
+    evictor.step()
+    assert not pinned.exists()
+
+
+def test_namespace_budget_only_touches_its_namespaces(tmp_path, make_evictor):
+    image = put_asset(tmp_path, "image/sdxl", key("a"), 100, age=400)
+    higgs_old = put_asset(tmp_path, "tts/higgs", key("b"), 100, age=300)
+    higgs_new = put_asset(tmp_path, "tts/higgs", key("c"), 100, age=200)
+
+    evictor = make_evictor(budgets={"tts": 150})
+    assert evictor.step() == 1
+
+    assert image.exists()  # Oldest overall, but outside the budget's prefix
+    assert not higgs_old.exists()
+    assert higgs_new.exists()
+
+
+def test_recently_used_assets_are_kept(tmp_path):
+    recent = put_asset(tmp_path, "tts/piper", key("a"), 100, age=10)
+
+    evictor = CacheEvictor(tmp_path, use_index=False, max_bytes=50, min_age=300)
+    try:
+        assert evictor.step() == 0
+        assert recent.exists()
+    finally:
+        asset_store.remove_tracker(tmp_path, evictor)
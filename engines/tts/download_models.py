@@ -1,12 +1,23 @@
 """
 Download Piper voice models from HuggingFace
 Uses chunked downloading with retry logic for large files
+
+Usage:
+    python download_models.py              # fp32 voices
+    python download_models.py --quantize   # also build <voice>.int8.onnx variants
 """
 
+import argparse
 import requests
+import sys
 from pathlib import Path
 import time
 
+# Repo root, for engines.asset_store (imported by the providers package)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from providers.quantize import quantize_voice, quantized_path
+
 # Model configuration
 MODELS_DIR = Path(__file__).parent / "models"
 MODELS_DIR.mkdir(exist_ok=True)
@@ -82,6 +93,13 @@ def download_file(url: str, output_path: Path, max_retries: int = 3):
                 return False
 
 def main():
+    parser = argparse.ArgumentParser(description="Download Piper voice models")
+    parser.add_argument("--quantize", action="store_true",
+                        help="Build 8-bit variants (<voice>.int8.onnx) for CPU-only render nodes")
+    parser.add_argument("--force-quantize", action="store_true",
+                        help="Rebuild 8-bit variants even if they already exist")
+    args = parser.parse_args()
+
     print("="*60)
     print("PIPER VOICE MODEL DOWNLOADER")
     print("="*60)
@@ -112,6 +130,17 @@ def main():
         else:
             download_file(json_url, json_path)
 
+        # Build quantized variant from the fp32 model
+        if args.quantize or args.force_quantize:
+            int8_path = quantized_path(onnx_path)
+            if int8_path.exists() and not args.force_quantize:
+                print(f"  [SKIP] {int8_path.name} already exists")
+            else:
+                try:
+                    quantize_voice(onnx_path, int8_path, force=True)
+                except Exception as e:
+                    print(f"  [FAIL] Quantization failed: {e}")
+
     print()
     print("="*60)
     print("DOWNLOAD COMPLETE")
@@ -121,12 +150,15 @@ def main():
     print()
 
     # List downloaded models
-    models = list(MODELS_DIR.glob("*.onnx"))
+    models = [m for m in MODELS_DIR.glob("*.onnx") if not m.name.endswith(".int8.onnx")]
     if models:
         print(f"Downloaded {len(models)} voice models:")
         for model in sorted(models):
             size_mb = model.stat().st_size / 1024 / 1024
             print(f"  [OK] {model.name} ({size_mb:.1f} MB)")
+            int8_path = quantized_path(model)
+            if int8_path.exists():
+                print(f"       {int8_path.name} ({int8_path.stat().st_size / 1024 / 1024:.1f} MB)")
     else:
         print("[WARN] No models downloaded successfully")
         print("\nTroubleshooting:")
@@ -8,12 +8,16 @@ from .base import (
     AudioProvider,
     AudioGenerationRequest,
     AudioGenerationResult,
-    AudioGenerationError
+    AudioGenerationError,
+    SpeechTimings,
+    TimedSpan
 )
 
 __all__ = [
     "AudioProvider",
     "AudioGenerationRequest",
     "AudioGenerationResult",
-    "AudioGenerationError"
+    "AudioGenerationError",
+    "SpeechTimings",
+    "TimedSpan"
 ]
@@ -13,11 +13,15 @@ Design Philosophy:
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import hashlib
 import json
+import re
+import wave
+
+from engines.asset_store import AssetStore
 
 
 @dataclass
@@ -59,6 +63,93 @@ class AudioGenerationRequest:
         return hashlib.sha256(serialized.encode()).hexdigest()
 
 
+@dataclass
+class TimedSpan:
+    """A word or sentence and when it is spoken (seconds from audio start)"""
+    text: str
+    start: float
+    end: float
+
+
+@dataclass
+class SpeechTimings:
+    """
+    Word and sentence timestamps produced alongside synthesized audio.
+
+    Stored next to cached audio as <audio>.timings.json so SFX placement
+    and captions don't need a separate alignment pass.
+    """
+    words: List[TimedSpan] = field(default_factory=list)
+    sentences: List[TimedSpan] = field(default_factory=list)
+
+    def find_phrase(self, phrase: str) -> Optional[TimedSpan]:
+        """
+        Locate the first occurrence of a phrase (case and punctuation insensitive)
+
+        Returns:
+            Span from the start of its first word to the end of its last, or None
+        """
+        target = [_normalize_word(w) for w in phrase.split()]
+        target = [w for w in target if w]
+        words = [_normalize_word(w.text) for w in self.words]
+        if not target:
+            return None
+
+        for i in range(len(words) - len(target) + 1):
+            if words[i:i + len(target)] == target:
+                return TimedSpan(phrase, self.words[i].start, self.words[i + len(target) - 1].end)
+        return None
+
+    def scaled(self, duration: float) -> "SpeechTimings":
+        """
+        Stretch these timings onto another take of the same text lasting duration seconds
+
+        A linear estimate for providers that don't report timings (the pace
+        of a different voice isn't uniform, but the words keep their order
+        and relative position).
+        """
+        length = self.sentences[-1].end if self.sentences else (self.words[-1].end if self.words else 0.0)
+        factor = duration / length if length > 0 else 1.0
+
+        def stretch(spans: List[TimedSpan]) -> List[TimedSpan]:
+            return [TimedSpan(s.text, round(s.start * factor, 3), round(s.end * factor, 3)) for s in spans]
+
+        return SpeechTimings(words=stretch(self.words), sentences=stretch(self.sentences))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "words": [vars(w) for w in self.words],
+            "sentences": [vars(s) for s in self.sentences]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpeechTimings":
+        return cls(
+            words=[TimedSpan(**w) for w in data.get("words", [])],
+            sentences=[TimedSpan(**s) for s in data.get("sentences", [])]
+        )
+
+    @staticmethod
+    def sidecar_path(audio_path: Path) -> Path:
+        return Path(audio_path).with_suffix(".timings.json")
+
+    def save(self, audio_path: Path) -> None:
+        """Write the sidecar file for an audio file"""
+        self.sidecar_path(audio_path).write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+    @classmethod
+    def load(cls, audio_path: Path) -> Optional["SpeechTimings"]:
+        """Read the sidecar for an audio file, or None if there isn't one"""
+        path = cls.sidecar_path(audio_path)
+        if not path.exists():
+            return None
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower()).strip("'")
+
+
 @dataclass
 class AudioGenerationResult:
     """
@@ -73,6 +164,9 @@ class AudioGenerationResult:
     generation_time_seconds: float     # Time spent generating (0 if cached)
     quality_score: Optional[float] = None  # 0-1 quality metric (if measurable)
     provider_name: str = "unknown"     # Which provider generated this
+    timings: Optional[SpeechTimings] = None  # Word/sentence timestamps (if the provider knows them)
+    compressed_path: Optional[Path] = None  # Lossless FLAC of the same audio, for consumers that read it (ffmpeg)
+    hedged: bool = False               # Answered by a hedge tier racing this provider, not by the provider itself
 
 
 class AudioProvider(ABC):
@@ -86,6 +180,26 @@ class AudioProvider(ABC):
     - HybridProvider: Intelligent routing based on load/quality needs
     """
 
+    # Typical narration pace (~150 WPM) used to turn text length into audio length
+    CHARS_PER_SECOND = 15.0
+
+    # Prior real-time factor (generation time / audio duration) before any
+    # generation has been observed. None means "unknown".
+    default_rtf: Optional[float] = None
+
+    # Baseline quality score (0-1) this provider is expected to deliver
+    nominal_quality: Optional[float] = None
+
+    # Weight of the newest observation in the RTF moving average
+    RTF_SMOOTHING = 0.3
+
+    # Asset store namespace under tts/ (default: lowercased class name)
+    asset_namespace: Optional[str] = None
+
+    # Flat cache directory used before the asset store; its files are
+    # migrated on lookup. Overridden by config["cache_dir"].
+    legacy_cache_dir: Optional[Path] = None
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize provider with configuration from manifest.
@@ -96,15 +210,26 @@ class AudioProvider(ABC):
         self.config = config
         self.provider_name = self.__class__.__name__
 
+        # Generated audio (and its .timings.json) lives in the shared asset store
+        self.assets = AssetStore.from_config(
+            config,
+            f"tts/{self.asset_namespace or self.__class__.__name__.lower()}",
+            legacy_dirs=[config.get("cache_dir", self.legacy_cache_dir)],
+            sidecars=[".timings.json"]
+        )
+
+        # Learned real-time factor (seeded from config or class prior)
+        self.observed_rtf: Optional[float] = config.get("rtf", self.default_rtf)
+
     @abstractmethod
     def generate(self, request: AudioGenerationRequest) -> AudioGenerationResult:
         """
         Generate speech audio from text.
 
         Implementations MUST:
-        1. Check cache before generating (via AssetManager)
+        1. Check cache before generating (self.assets.lookup)
         2. Generate audio if cache miss
-        3. Save to content-addressed path
+        3. Publish to the asset store (self.assets.writing / publish)
         4. Return AudioGenerationResult with metrics
 
         Args:
@@ -118,6 +243,21 @@ class AudioProvider(ABC):
         """
         pass
 
+    def generate_batch(self, requests: List[AudioGenerationRequest]) -> List[AudioGenerationResult]:
+        """
+        Generate several requests (optional override).
+
+        Providers with high per-request overhead can override this to
+        combine requests. Results are returned in request order.
+
+        Args:
+            requests: Audio generation requests
+
+        Returns:
+            One AudioGenerationResult per request
+        """
+        return [self.generate(request) for request in requests]
+
     @abstractmethod
     def is_available(self) -> bool:
         """
@@ -143,11 +283,22 @@ class AudioProvider(ABC):
         """
         pass
 
+    def close(self) -> None:
+        """
+        Release threads, connections and models (optional override).
+
+        Called when the director replaces this provider (e.g. after a
+        config reload). The provider is not used afterwards.
+        """
+        pass
+
     def estimate_generation_time(self, text_length: int) -> float:
         """
         Estimate how long generation will take (optional).
 
         Used by HybridProvider to decide between local and remote.
+        Based on the learned real-time factor and the expected audio
+        length for the given amount of text.
 
         Args:
             text_length: Number of characters in input text
@@ -155,7 +306,79 @@ class AudioProvider(ABC):
         Returns:
             Estimated seconds to generate (0 if unknown)
         """
-        return 0.0
+        if self.observed_rtf is None:
+            return 0.0
+        return (text_length / self.CHARS_PER_SECOND) * self.observed_rtf
+
+    def record_generation(self, duration_seconds: float, generation_time_seconds: float) -> None:
+        """
+        Fold a completed (non-cached) generation into the learned RTF.
+
+        Args:
+            duration_seconds: Length of the generated audio
+            generation_time_seconds: Wall-clock time spent generating
+        """
+        if duration_seconds <= 0:
+            return
+        rtf = generation_time_seconds / duration_seconds
+        if self.observed_rtf is None:
+            self.observed_rtf = rtf
+        else:
+            self.observed_rtf += self.RTF_SMOOTHING * (rtf - self.observed_rtf)
+
+    def max_concurrency(self) -> int:
+        """
+        How many requests this provider can run in parallel (optional).
+
+        Used with queue depth to estimate waiting time.
+        """
+        return 1
+
+    def _audio_info(self, key: str, ext: str, path: Path):
+        """(duration, sample rate) of a stored WAV, from the asset index or its header"""
+        metadata = self.assets.metadata(key, ext)
+        if "duration_seconds" in metadata and "sample_rate" in metadata:
+            return metadata["duration_seconds"], metadata["sample_rate"]
+
+        with wave.open(str(path), "rb") as wav_file:
+            rate = wav_file.getframerate()
+            duration = wav_file.getnframes() / float(rate)
+        self.assets.describe(key, ext, {"duration_seconds": duration, "sample_rate": rate})
+        return duration, rate
+
+    def is_cached(self, request: AudioGenerationRequest) -> bool:
+        """
+        Whether a request would be served from cache (optional).
+
+        Returns:
+            True if generate() would return without synthesizing
+        """
+        return False
+
+    def cached_batch(self, requests: List[AudioGenerationRequest]) -> List[bool]:
+        """
+        is_cached() for many requests at once (optional override).
+
+        Used to plan a manifest before rendering. Providers that store
+        their audio under asset_key() can answer with one asset store scan
+        per shard (see AssetStore.contains_many).
+
+        Returns:
+            One flag per request, in request order
+        """
+        return [self.is_cached(request) for request in requests]
+
+    def asset_key(self, request: AudioGenerationRequest) -> Tuple[str, str]:
+        """Asset store (key, extension) a request's audio is stored under"""
+        return request.to_cache_key(), ".wav"
+
+    def _stored_batch(self, requests: List[AudioGenerationRequest]) -> List[bool]:
+        """Which requests have their asset_key() in the asset store (no hits counted)"""
+        keys = [self.asset_key(request) for request in requests]
+        stored = set()
+        for ext in {ext for _, ext in keys}:
+            stored |= {(key, ext) for key in self.assets.contains_many([k for k, e in keys if e == ext], ext)}
+        return [key in stored for key in keys]
 
     def supports_voice_cloning(self) -> bool:
         """Whether this provider can clone voices from samples."""
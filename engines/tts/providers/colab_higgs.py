@@ -20,22 +20,120 @@ Use Cases:
 """
 
 from pathlib import Path
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import replace
+from typing import List
+import numpy as np
 import requests
+import io
+import random
 import time
 from .base import AudioProvider, AudioGenerationRequest, AudioGenerationResult
+from .worker_pool import WorkerPool
 import hashlib
 import wave
 
+
+def _percentile(values, q: float) -> float:
+    """Linear-interpolated percentile (q in 0-1) of a non-empty sequence"""
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def _find_split_points(samples: np.ndarray, rate: int, weights: List[int],
+                       window: float = 0.02, silence_ratio: float = 0.05,
+                       min_pause: float = 0.15) -> List[int]:
+    """
+    Locate the pauses separating packed segments in one audio track
+
+    Silent runs (RMS below silence_ratio of the loudest window, at least
+    min_pause long) are scored by length and by closeness to where each
+    boundary is expected from the segments' text lengths.
+
+    Args:
+        samples: Mono PCM samples
+        rate: Sample rate (Hz)
+        weights: Relative length of each segment (e.g. character counts)
+
+    Returns:
+        Sample index of each boundary (len(weights) - 1 entries)
+
+    Raises:
+        ValueError: If not enough distinct pauses are found
+    """
+    win = max(1, int(rate * window))
+    n = len(samples) // win
+    if n == 0:
+        raise ValueError("Audio too short to split")
+
+    frames = samples[:n * win].astype(np.float64).reshape(n, win)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    silent = rms < rms.max() * silence_ratio
+
+    # Interior silent runs as (start_frame, end_frame)
+    runs = []
+    start = None
+    for i, is_silent in enumerate(silent):
+        if is_silent and start is None:
+            start = i
+        elif not is_silent and start is not None:
+            if start > 0 and i - start >= min_pause / window:
+                runs.append((start, i))
+            start = None
+
+    cuts = []
+    total = float(sum(weights))
+    cumulative = 0
+    previous = 0
+    for weight in weights[:-1]:
+        cumulative += weight
+        expected = n * cumulative / total
+        candidates = [r for r in runs if r[0] >= previous]
+        if not candidates:
+            raise ValueError(f"Found {len(cuts)} of {len(weights) - 1} segment boundaries")
+
+        def score(run):
+            mid = (run[0] + run[1]) / 2
+            return (run[1] - run[0]) * np.exp(-((mid - expected) / (0.15 * n)) ** 2)
+
+        best = max(candidates, key=score)
+        runs.remove(best)
+        previous = best[1]
+        cuts.append(((best[0] + best[1]) // 2) * win)
+
+    return cuts
+
+
 class HiggsAudioProvider(AudioProvider):
     """
     Tier 3: Ultimate quality engine using Higgs Audio V2 on Google Colab
 
     Configuration:
-        colab_url: Public ngrok URL from Colab worker (REQUIRED)
+        colab_url: Public ngrok URL from Colab worker (REQUIRED unless colab_urls/workers_file given)
+        colab_urls: List of worker URLs to balance across (Colab, Kaggle, ...)
+        workers_file: File of worker URLs (one per line), re-read when it changes
+        max_worker_failures: Connection failures before a worker is retired (default: 3)
         temperature: Prosody control (0.2-0.5, default 0.3)
+        worker_engine: Engine name sent to multi-engine workers (default: "higgs")
         top_p: Sampling parameter (0.9-0.99, default 0.95)
-        cache_dir: Local cache directory (default: ../cache/higgs/)
-        timeout: Request timeout in seconds (default: 300)
+        asset_root: Shared asset store root; audio goes to <asset_root>/tts/higgs/ (default: <repo>/cache)
+        cache_dir: Pre-asset-store flat audio cache, migrated on lookup (default: ../cache/higgs/)
+        timeout: Maximum request timeout in seconds (default: 300)
+        min_timeout: Floor for adaptive timeouts in seconds (default: 30)
+        timeout_multiplier: Headroom over p99 expected latency (default: 3.0)
+        max_retries: Retries after timeouts/5xx/connection errors (default: 2)
+        backoff_base: First retry delay in seconds, doubled each retry (default: 2.0)
+        hedge_url: Extra worker, added to the pool (optional)
+        hedge_provider: Fallback tier (e.g. PiperProvider) for slow requests (optional;
+            the hybrid engine sets it from "hedge_with_piper")
+        min_hedge_delay: Never hedge before this many seconds (default: 2.0)
+        pack_max_chars: Scripts up to this length are packed in generate_batch (default: 200)
+        pack_budget_chars: Maximum characters per packed request (default: 600)
+        pack_separator: Text inserted between packed scripts to force a pause (default: blank line)
 
     Example:
         provider = HiggsAudioProvider({
@@ -55,55 +153,126 @@ class HiggsAudioProvider(AudioProvider):
     Architecture:
         Local Machine → HTTP POST → ngrok → Colab GPU → Higgs V2 → WAV
                       ← HTTP Response ← ngrok ← Audio File ←
+
+    Tail latency:
+        Timeouts scale with text length and the observed RTF distribution
+        instead of a fixed 300s. Once a request runs past its p95 expected
+        latency, a duplicate is sent to another pool worker (or to
+        hedge_provider) and whichever finishes first wins.
+
+    Worker pool:
+        Requests are balanced across all workers by queue depth and measured
+        latency. Workers whose tunnel dies are drained and retired; new ones
+        can be added at runtime via add_worker() or the workers file.
+
+    Short scenes:
+        generate_batch() packs short scripts into one request separated by
+        pauses, then splits the returned audio at those pauses and caches
+        every piece under its own request's key. Per-request overhead
+        (HTTP, ngrok, model prefill) is paid once per pack.
     """
 
+    # Observations needed before timeouts/hedging switch to the RTF distribution
+    MIN_LATENCY_SAMPLES = 5
+
+    # Free-tier T4 runs at roughly real time (HIGGS_SETUP_GUIDE.md)
+    default_rtf = 1.0
+    nominal_quality = 0.92
+
+    asset_namespace = "higgs"
+    legacy_cache_dir = Path(__file__).parent.parent / "cache" / "higgs"
+
     def __init__(self, config: dict):
         super().__init__(config)
 
-        self.colab_url = config.get("colab_url")
-        if not self.colab_url:
+        urls = list(config.get("colab_urls") or [])
+        if config.get("colab_url"):
+            urls.insert(0, config["colab_url"])
+        if config.get("hedge_url"):
+            urls.append(config["hedge_url"])
+
+        if not urls and not config.get("workers_file"):
             raise ValueError(
                 "colab_url is required for HiggsAudioProvider\n"
                 "Get URL from Colab notebook Cell 6 output\n"
                 "Example: https://xxxx-xx-xxx.ngrok-free.app"
             )
 
-        # Remove trailing slash if present
-        self.colab_url = self.colab_url.rstrip('/')
+        self.pool = WorkerPool(
+            urls,
+            max_failures=config.get("max_worker_failures", 3),
+            workers_file=config.get("workers_file")
+        )
+
+        # Primary URL (remove trailing slash if present), kept for messages
+        self.colab_url = urls[0].rstrip('/') if urls else "<workers_file>"
 
         # Generation parameters
         self.temperature = config.get("temperature", 0.3)
+        self.worker_engine = config.get("worker_engine", "higgs")
         self.top_p = config.get("top_p", 0.95)
 
-        # Cache configuration
-        if "cache_dir" in config:
-            self.cache_dir = Path(config["cache_dir"])
-        else:
-            self.cache_dir = Path(__file__).parent.parent / "cache" / "higgs"
+        # Timeout configuration (Higgs can be slow on free Colab)
+        self.timeout = config.get("timeout", 300)  # 5 minutes default (upper bound)
+        self.min_timeout = config.get("min_timeout", 30)
+        self.timeout_multiplier = config.get("timeout_multiplier", 3.0)
 
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Retry configuration
+        self.max_retries = config.get("max_retries", 2)
+        self.backoff_base = config.get("backoff_base", 2.0)
 
-        # Timeout configuration (Higgs can be slow on free Colab)
-        self.timeout = config.get("timeout", 300)  # 5 minutes default
+        # Hedging target besides other pool workers
+        self.hedge_provider = config.get("hedge_provider")
+        self.min_hedge_delay = config.get("min_hedge_delay", 2.0)
+
+        # Short-scene packing
+        self.pack_max_chars = config.get("pack_max_chars", 200)
+        self.pack_budget_chars = config.get("pack_budget_chars", 600)
+        self.pack_separator = config.get("pack_separator", "\n\n")
+
+        # Recent real-time factors, for timeout and hedge thresholds
+        self._rtf_samples = deque(maxlen=config.get("latency_window", 200))
+        self._executor = ThreadPoolExecutor(max_workers=config.get("max_concurrency", 4))
 
     def warmup(self):
         """
-        Verify Colab worker is accessible and healthy
+        Verify Colab workers are accessible and healthy
+
+        Unhealthy workers are removed from the pool. Fails only if no
+        worker passes the health check.
 
         Raises:
-            ConnectionError: If worker is not accessible
+            ConnectionError: If no worker is accessible
             RuntimeError: If worker health check fails
         """
+        urls = self.pool.active_urls()
+        if not urls:
+            raise ConnectionError("No Higgs workers configured")
+
+        error = None
+        for url in urls:
+            try:
+                self._check_health(url)
+            except Exception as e:
+                print(f"  [Higgs] Worker {url} failed health check, removing from pool")
+                self.pool.remove(url)
+                error = e
+
+        if not self.pool.active_urls():
+            raise error
+
+    def _check_health(self, url: str):
+        """Health check a single worker"""
         try:
             response = requests.get(
-                f"{self.colab_url}/health",
+                f"{url}/health",
                 timeout=10
             )
             response.raise_for_status()
 
             health = response.json()
 
-            print(f"[OK] Higgs worker healthy")
+            print(f"[OK] Higgs worker healthy ({url})")
             print(f"     Engine: {health.get('engine')}")
             print(f"     Quality: {health.get('quality')}")
             print(f"     Voice cloning: {health.get('voice_cloning')}")
@@ -111,26 +280,30 @@ class HiggsAudioProvider(AudioProvider):
 
         except requests.exceptions.ConnectionError:
             raise ConnectionError(
-                f"Failed to connect to Colab worker at {self.colab_url}\n"
+                f"Failed to connect to Colab worker at {url}\n"
                 f"Troubleshooting:\n"
                 f"1. Ensure Colab notebook is running\n"
                 f"2. Verify Cell 6 (ngrok server) is active\n"
                 f"3. Check ngrok URL hasn't changed (regenerates on restart)\n"
-                f"4. Test URL in browser: {self.colab_url}/health"
+                f"4. Test URL in browser: {url}/health"
             )
         except requests.exceptions.Timeout:
             raise TimeoutError(
                 f"Connection to Colab worker timed out\n"
-                f"URL: {self.colab_url}/health\n"
+                f"URL: {url}/health\n"
                 f"Colab may be overloaded or crashed"
             )
         except Exception as e:
             raise RuntimeError(
                 f"Higgs worker health check failed\n"
-                f"URL: {self.colab_url}/health\n"
+                f"URL: {url}/health\n"
                 f"Error: {e}"
             )
 
+    def close(self):
+        """Stop the request executor (requests already sent finish in the background)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
     def generate(self, request: AudioGenerationRequest) -> AudioGenerationResult:
         """
         Generate speech using Higgs Audio V2 on Google Colab
@@ -157,25 +330,43 @@ class HiggsAudioProvider(AudioProvider):
 
         # Generate cache key from all parameters
         cache_key = request.to_cache_key()
-        output_path = self.cache_dir / f"{cache_key}.wav"
 
         # Check local cache first
-        if output_path.exists():
-            with wave.open(str(output_path), "rb") as wav_file:
-                frames = wav_file.getnframes()
-                rate = wav_file.getframerate()
-                duration = frames / float(rate)
-
-            return AudioGenerationResult(
-                audio_path=output_path,
-                duration_seconds=duration,
-                sample_rate=rate,
-                was_cached=True,
-                generation_time_seconds=0.0,
-                provider_name="Higgs Audio V2",
-                quality_score=0.92  # 92/100 baseline
-            )
+        output_path = self.assets.lookup(cache_key, ".wav")
+        if output_path is not None:
+            return self._cached(cache_key, output_path)
+
+        return self._generate_uncached(request)
+
+    def _cached(self, cache_key: str, output_path: Path) -> AudioGenerationResult:
+        """Result for audio found in the asset store"""
+        duration, rate = self._audio_info(cache_key, ".wav", output_path)
+
+        return AudioGenerationResult(
+            audio_path=output_path,
+            duration_seconds=duration,
+            sample_rate=rate,
+            was_cached=True,
+            generation_time_seconds=0.0,
+            provider_name="Higgs Audio V2",
+            quality_score=0.92,  # 92/100 baseline
+            compressed_path=self.assets.compressed_path(cache_key, ".wav")
+        )
 
+    def _generate_uncached(self, request: AudioGenerationRequest) -> AudioGenerationResult:
+        """Generate a request whose lookup missed, reporting a failure and releasing its claim if it fails"""
+        cache_key = request.to_cache_key()
+        try:
+            return self._generate_via_workers(request, cache_key)
+        except Exception:
+            self.assets.record_failure(cache_key, ".wav")
+            raise
+        finally:
+            # No-op once published; otherwise lets other threads and render nodes generate it
+            self.assets.release(cache_key, ".wav")
+
+    def _generate_via_workers(self, request: AudioGenerationRequest, cache_key: str) -> AudioGenerationResult:
+        """Send a request to the Colab workers (hedged) and publish the audio"""
         # Generate via Colab worker
         print(f"  [Higgs] Generating via Colab worker...")
         print(f"          Text length: {len(request.text)} characters")
@@ -185,50 +376,26 @@ class HiggsAudioProvider(AudioProvider):
 
         payload = {
             "text": request.text,
+            "engine": self.worker_engine,
             "temperature": self.temperature,
             "top_p": self.top_p
         }
+        timeout = self.adaptive_timeout(len(request.text))
 
         try:
-            response = requests.post(
-                f"{self.colab_url}/generate",
-                json=payload,
-                timeout=self.timeout
-            )
-
-            response.raise_for_status()
-
-            # Save audio to local cache
-            with open(output_path, "wb") as f:
-                f.write(response.content)
-
-            gen_time = time.time() - start_time
-
-            # Get audio duration
-            with wave.open(str(output_path), "rb") as wav_file:
-                frames = wav_file.getnframes()
-                rate = wav_file.getframerate()
-                duration = frames / float(rate)
-
-            # Calculate real-time factor
-            rtf = gen_time / duration if duration > 0 else 0
+            outcome = self._generate_hedged(request, payload, timeout, start_time)
 
-            print(f"  [Higgs] Generated {duration:.2f}s audio in {gen_time:.2f}s (RTF: {rtf:.2f}x)")
-            print(f"          Quality: 92/100 (production-grade)")
+            if isinstance(outcome, AudioGenerationResult):
+                # Hedge tier won; its audio lives in that tier's own cache
+                print(f"  [Higgs] Hedge tier answered first ({outcome.provider_name})")
+                return replace(outcome, hedged=True)
 
-            return AudioGenerationResult(
-                audio_path=output_path,
-                duration_seconds=duration,
-                sample_rate=rate,
-                was_cached=False,
-                generation_time_seconds=gen_time,
-                provider_name="Higgs Audio V2",
-                quality_score=0.92  # 92/100 baseline
-            )
+            return self._store(cache_key, outcome, start_time)
 
         except requests.exceptions.Timeout:
             raise TimeoutError(
-                f"Higgs generation timed out after {self.timeout}s\n"
+                f"Higgs generation timed out after {timeout:.0f}s "
+                f"({self.max_retries + 1} attempts)\n"
                 f"Text length: {len(request.text)} characters\n"
                 f"Suggestions:\n"
                 f"- Reduce text length (<500 characters per request)\n"
@@ -245,28 +412,388 @@ class HiggsAudioProvider(AudioProvider):
             )
         except requests.exceptions.RequestException as e:
             raise RuntimeError(
-                f"Failed to generate audio via Colab worker\n"
-                f"URL: {self.colab_url}/generate\n"
+                f"Failed to generate audio via Colab workers\n"
+                f"Workers: {', '.join(self.pool.active_urls()) or 'none active'}\n"
                 f"Error: {e}\n"
                 f"Check network connection and Colab status"
             )
 
-    def is_available(self) -> bool:
+    def generate_batch(self, requests: List[AudioGenerationRequest]) -> List[AudioGenerationResult]:
         """
-        Check if Colab worker is accessible
+        Generate several requests, packing short uncached scripts together
+
+        Short scripts are looked up first (counting hits and misses, and
+        claiming misses locally and on the shared tier), then the misses
+        are concatenated (up to pack_budget_chars) into single worker
+        requests. If a packed request fails or its audio can't be split
+        cleanly, its scripts are generated one request each.
 
         Returns:
-            True if /health endpoint responds with 200
-            False if connection fails or times out
+            One AudioGenerationResult per request, in request order
         """
+        by_key = {}
+
+        # Look up short, distinct scripts; the misses are ours to generate
+        claimed = {}
+        for request in requests:
+            key = request.to_cache_key()
+            if len(request.text) > self.pack_max_chars or key in by_key or key in claimed:
+                continue
+            output_path = self.assets.lookup(key, ".wav")
+            if output_path is not None:
+                by_key[key] = self._cached(key, output_path)
+            else:
+                claimed[key] = request
+
+        # Group the misses into packs
+        packs = []
+        current = []
+        current_chars = 0
+        for request in claimed.values():
+            if current and current_chars + len(request.text) > self.pack_budget_chars:
+                packs.append(current)
+                current, current_chars = [], 0
+            current.append(request)
+            current_chars += len(request.text)
+        if current:
+            packs.append(current)
+
         try:
-            response = requests.get(
-                f"{self.colab_url}/health",
-                timeout=5
+            # Spread packs, then everything else, over the worker pool
+            with ThreadPoolExecutor(max_workers=self.max_concurrency()) as batch_executor:
+                futures = {batch_executor.submit(self._generate_packed, pack): pack for pack in packs if len(pack) > 1}
+                for future, pack in futures.items():
+                    try:
+                        pieces = future.result()
+                    except (ValueError, wave.Error) as e:
+                        print(f"  [Higgs] Could not split packed audio ({e}), generating scenes individually")
+                        continue
+                    except RuntimeError as e:
+                        print(f"  [Higgs] Packed request failed ({e}), generating scenes individually")
+                        continue
+                    for request, result in zip(pack, pieces):
+                        by_key[request.to_cache_key()] = result
+
+                # Everything else (long scripts, lone or failed pack scripts), once per distinct script
+                singles = {}
+                for request in requests:
+                    key = request.to_cache_key()
+                    if key in by_key or key in singles:
+                        continue
+                    generate = self._generate_uncached if key in claimed else self.generate
+                    singles[key] = batch_executor.submit(generate, request)
+                for key, future in singles.items():
+                    by_key[key] = future.result()
+        finally:
+            # No-op for published scripts; frees the claims of anything that failed
+            for key in claimed:
+                self.assets.release(key, ".wav")
+
+        return [by_key[request.to_cache_key()] for request in requests]
+
+    def _generate_packed(self, pack: List[AudioGenerationRequest]) -> List[AudioGenerationResult]:
+        """
+        Generate several short scripts in one worker request and split the audio
+
+        If that fails, a failure is reported for every script; their claims
+        are kept for generate_batch to generate them one by one.
+
+        Raises:
+            ValueError: If the audio can't be split into one piece per script
+            RuntimeError: If the worker request fails
+        """
+        try:
+            return self._request_packed(pack)
+        except Exception:
+            for request in pack:
+                self.assets.record_failure(request.to_cache_key(), ".wav")
+            raise
+
+    def _request_packed(self, pack: List[AudioGenerationRequest]) -> List[AudioGenerationResult]:
+        """Send the packed scripts to the Colab workers and publish one piece per script"""
+        text = self.pack_separator.join(r.text.strip() for r in pack)
+        payload = {
+            "text": text,
+            "engine": self.worker_engine,
+            "temperature": self.temperature,
+            "top_p": self.top_p
+        }
+
+        print(f"  [Higgs] Packing {len(pack)} short scenes into one request ({len(text)} characters)")
+        start_time = time.time()
+
+        try:
+            audio = self._post_with_retries(payload, self.adaptive_timeout(len(text)))
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(
+                f"Failed to generate packed audio via Colab workers\n"
+                f"Workers: {', '.join(self.pool.active_urls()) or 'none active'}\n"
+                f"Error: {e}"
             )
-            return response.status_code == 200
-        except:
-            return False
+
+        gen_time = time.time() - start_time
+
+        with wave.open(io.BytesIO(audio), "rb") as wav_file:
+            params = wav_file.getparams()
+            raw = wav_file.readframes(params.nframes)
+
+        dtype = {2: np.int16, 4: np.int32}.get(params.sampwidth)
+        if dtype is None:
+            raise ValueError(f"Unsupported sample width: {params.sampwidth} bytes")
+        samples = np.frombuffer(raw, dtype=dtype).reshape(-1, params.nchannels).mean(axis=1)
+
+        cuts = _find_split_points(samples, params.framerate, [len(r.text) for r in pack])
+        bounds = [0] + cuts + [len(samples)]
+        frame_bytes = params.sampwidth * params.nchannels
+
+        total_duration = len(samples) / float(params.framerate)
+        self.record_generation(total_duration, gen_time)
+        if total_duration > 0:
+            self._rtf_samples.append(gen_time / total_duration)
+
+        results = []
+        for request, start, end in zip(pack, bounds[:-1], bounds[1:]):
+            tmp = io.BytesIO()
+            with wave.open(tmp, "wb") as piece:
+                piece.setnchannels(params.nchannels)
+                piece.setsampwidth(params.sampwidth)
+                piece.setframerate(params.framerate)
+                piece.writeframes(raw[start * frame_bytes:end * frame_bytes])
+            output_path = self.assets.publish(request.to_cache_key(), ".wav", tmp.getvalue())
+
+            duration = (end - start) / float(params.framerate)
+            # Attribute the shared request time by audio share
+            share = gen_time * duration / total_duration if total_duration else 0.0
+            self.assets.describe(request.to_cache_key(), ".wav",
+                                 {"duration_seconds": duration, "sample_rate": params.framerate},
+                                 generation_seconds=share)
+            results.append(AudioGenerationResult(
+                audio_path=output_path,
+                duration_seconds=duration,
+                sample_rate=params.framerate,
+                was_cached=False,
+                generation_time_seconds=share,
+                provider_name="Higgs Audio V2",
+                quality_score=0.92,  # 92/100 baseline
+                compressed_path=self.assets.compressed_path(request.to_cache_key(), ".wav")
+            ))
+
+        rtf = gen_time / total_duration if total_duration > 0 else 0
+        print(f"  [Higgs] Generated {total_duration:.2f}s packed audio in {gen_time:.2f}s (RTF: {rtf:.2f}x), "
+              f"split into {len(results)} scenes")
+        return results
+
+    def expected_latency(self, text_length: int, quantile: float) -> float:
+        """
+        Latency at the given quantile of the observed RTF distribution
+
+        Returns:
+            Expected seconds, or 0 if too few generations have been observed
+        """
+        if len(self._rtf_samples) < self.MIN_LATENCY_SAMPLES:
+            return 0.0
+        expected_audio = text_length / self.CHARS_PER_SECOND
+        return _percentile(self._rtf_samples, quantile) * expected_audio
+
+    def adaptive_timeout(self, text_length: int) -> float:
+        """
+        Per-request timeout derived from text length and observed RTFs
+
+        Uses the configured maximum until enough samples are collected.
+        """
+        p99 = self.expected_latency(text_length, 0.99)
+        if p99 <= 0:
+            return self.timeout
+        return max(self.min_timeout, min(self.timeout, p99 * self.timeout_multiplier))
+
+    def _store(self, cache_key: str, wav_bytes: bytes, start_time: float) -> AudioGenerationResult:
+        """Publish a worker's WAV to the asset store and learn from its timing"""
+        # Save audio to local cache (atomically, so readers never see partial files)
+        output_path = self.assets.publish(cache_key, ".wav", wav_bytes)
+
+        gen_time = time.time() - start_time
+
+        # Get audio duration
+        with wave.open(str(output_path), "rb") as wav_file:
+            frames = wav_file.getnframes()
+            rate = wav_file.getframerate()
+            duration = frames / float(rate)
+        self.assets.describe(cache_key, ".wav", {"duration_seconds": duration, "sample_rate": rate},
+                             generation_seconds=gen_time)
+
+        # Calculate real-time factor
+        rtf = gen_time / duration if duration > 0 else 0
+        self.record_generation(duration, gen_time)
+        if duration > 0:
+            self._rtf_samples.append(rtf)
+
+        print(f"  [Higgs] Generated {duration:.2f}s audio in {gen_time:.2f}s (RTF: {rtf:.2f}x)")
+        print(f"          Quality: 92/100 (production-grade)")
+
+        return AudioGenerationResult(
+            audio_path=output_path,
+            duration_seconds=duration,
+            sample_rate=rate,
+            was_cached=False,
+            generation_time_seconds=gen_time,
+            provider_name="Higgs Audio V2",
+            quality_score=0.92,  # 92/100 baseline
+            compressed_path=self.assets.compressed_path(cache_key, ".wav")
+        )
+
+    def _generate_hedged(self, request: AudioGenerationRequest, payload: dict, timeout: float, start_time: float):
+        """
+        Run the request, duplicating it once it passes its p95 latency
+
+        If the hedge tier wins, the Higgs request keeps running and its
+        audio is still published to the cache when it lands.
+
+        Returns:
+            WAV bytes from a Higgs worker, or an AudioGenerationResult
+            if the hedge tier answered first
+        """
+        primary_workers = []
+        primary = self._executor.submit(self._post_with_retries, payload, timeout, primary_workers)
+
+        hedge_after = self.expected_latency(len(request.text), 0.95)
+        if hedge_after <= 0 or not (self.pool.active_count() > 1 or self.hedge_provider):
+            return primary.result()
+        hedge_after = max(hedge_after, self.min_hedge_delay)
+
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        # An untried worker first, then the hedge tier; with neither, keep waiting
+        if set(self.pool.active_urls()) - set(primary_workers):
+            hedge = self._executor.submit(self._post_with_retries, payload, timeout, list(primary_workers))
+        elif self.hedge_provider:
+            hedge = self._executor.submit(self.hedge_provider.generate, request)
+        else:
+            return primary.result()
+        print(f"  [Higgs] Request passed p95 ({hedge_after:.1f}s), sending hedge")
+
+        # First successful answer wins; only fail if both fail
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: f is not primary):  # Higgs audio first on a tie
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                if isinstance(outcome, AudioGenerationResult) and primary in pending:
+                    primary.add_done_callback(lambda f: self._store_late(request.to_cache_key(), f, start_time))
+                return outcome
+        raise error
+
+    def _store_late(self, cache_key: str, primary: Future, start_time: float):
+        """
+        Publish a Higgs answer that lost the race to the hedge tier
+
+        The request's claim was released when the hedge answer returned, so
+        the answer is only stored if it can claim the asset again (nobody
+        published or started generating it since).
+        """
+        if primary.exception() is not None:
+            return
+        if not self.assets.claim(cache_key, ".wav"):
+            return
+        try:
+            self._store(cache_key, primary.result(), start_time)
+        except (OSError, wave.Error) as e:
+            print(f"  [Higgs] Could not cache late answer for {cache_key[:12]}: {e}")
+        finally:
+            self.assets.release(cache_key, ".wav")  # No-op once published
+
+    def _post_with_retries(self, payload: dict, timeout: float, tried: list = None) -> bytes:
+        """
+        POST to the best pool worker's /generate, retrying transient failures
+
+        Timeouts, connection errors and 5xx responses are retried with
+        exponential backoff (plus jitter), on a different worker when one is
+        available. 4xx responses fail immediately.
+
+        Args:
+            payload: JSON body for /generate
+            timeout: Per-attempt timeout in seconds
+            tried: Worker URLs to avoid; URLs used here are appended to it
+        """
+        tried = [] if tried is None else tried
+
+        for attempt in range(self.max_retries + 1):
+            worker = self.pool.acquire(exclude=tried) or self.pool.acquire()
+            if worker is None:
+                raise requests.exceptions.ConnectionError("No active Higgs workers in pool")
+            tried.append(worker.url)
+
+            start = time.time()
+            try:
+                response = requests.post(f"{worker.url}/generate", json=payload, timeout=timeout)
+                response.raise_for_status()
+                self.pool.release(worker, ok=True, seconds=time.time() - start, chars=len(payload["text"]))
+                return response.content
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code if e.response is not None else 0
+                # ngrok answers 404/502/504 itself when the tunnel or server is gone
+                self.pool.release(worker, ok=False, connection_failed=status in (404, 502, 504))
+                if status < 500 and status != 404:
+                    raise
+                if attempt == self.max_retries:
+                    raise
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self.pool.release(worker, ok=False,
+                                  connection_failed=isinstance(e, requests.exceptions.ConnectionError))
+                if attempt == self.max_retries:
+                    raise
+            except Exception:
+                self.pool.release(worker, ok=False)
+                raise
+
+            delay = self.backoff_base * (2 ** attempt) * (1 + random.random() * 0.25)
+            print(f"  [Higgs] Attempt {attempt + 1} on {worker.url} failed, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def is_available(self) -> bool:
+        """
+        Check if any Colab worker is accessible
+
+        Returns:
+            True if some worker's /health endpoint responds with 200
+            False if every connection fails or times out
+        """
+        for url in self.pool.active_urls():
+            try:
+                response = requests.get(
+                    f"{url}/health",
+                    timeout=5
+                )
+                if response.status_code == 200:
+                    return True
+            except:
+                pass
+        return False
+
+    def add_worker(self, url: str):
+        """Add a worker to the pool at runtime"""
+        self.pool.add(url)
+
+    def remove_worker(self, url: str):
+        """Drain a worker; it retires after its in-flight requests finish"""
+        self.pool.remove(url)
+
+    def max_concurrency(self) -> int:
+        """One request per active worker runs in parallel"""
+        return max(1, self.pool.active_count())
+
+    def is_cached(self, request: AudioGenerationRequest) -> bool:
+        """Check whether the request's audio is already in the local cache"""
+        return self.assets.contains(*self.asset_key(request))
+
+    def cached_batch(self, requests: List[AudioGenerationRequest]) -> List[bool]:
+        return self._stored_batch(requests)
 
     def supports_voice_cloning(self) -> bool:
         """Higgs supports zero-shot voice cloning"""
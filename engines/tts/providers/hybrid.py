@@ -0,0 +1,271 @@
+"""
+Hybrid TTS Provider - Latency and Load-Aware Tier Routing
+
+Purpose: Single entry point that dispatches each request to the best tier
+Routing: Lowest expected latency among tiers that meet the quality floor
+Fallback: Automatic, when a tier is unreachable or fails mid-request
+
+How expected latency is computed:
+- Each tier learns its real-time factor (RTF) from completed generations
+- Requests already queued on a tier count against it (queue depth)
+- Cached requests cost nothing, so a cache hit always wins
+
+Use Cases:
+- Production renders with Higgs, falling back to Piper if Colab drops
+- Prototyping with a low quality floor (Piper answers instantly)
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .base import AudioProvider, AudioGenerationRequest, AudioGenerationResult, AudioGenerationError
+
+
+@dataclass
+class TierState:
+    """Live routing state for a single tier"""
+    name: str
+    provider: AudioProvider
+    in_flight: int = 0                     # Requests currently dispatched to this tier
+    available: Optional[bool] = None       # Last availability check (None = never checked)
+    checked_at: float = 0.0                # When availability was last checked
+    quality: Optional[float] = None        # Last reported quality score
+
+    @property
+    def expected_quality(self) -> float:
+        if self.quality is not None:
+            return self.quality
+        return self.provider.nominal_quality or 0.0
+
+
+class HybridProvider(AudioProvider):
+    """
+    Routes requests across several tiers (e.g. Piper + Higgs)
+
+    Configuration:
+        tiers: Mapping of tier name -> AudioProvider instance (REQUIRED)
+        quality_floor: Minimum acceptable quality score, 0-1 (default: 0.0)
+        availability_ttl: Seconds an availability check stays valid (default: 30)
+
+    Example:
+        provider = HybridProvider({
+            "tiers": {
+                "piper": PiperProvider({"voice": "en_US-lessac-medium"}),
+                "higgs": HiggsAudioProvider({"colab_url": url}),
+            },
+            "quality_floor": 0.9
+        })
+
+        result = provider.generate(request)
+        print(f"Served by: {result.provider_name}")
+
+    With quality_floor=0.9 every request goes to Higgs while it is reachable.
+    If the Colab worker disappears, requests fall back to Piper instead of failing.
+    """
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+
+        tiers = config.get("tiers")
+        if not tiers:
+            raise ValueError("HybridProvider requires at least one tier in config['tiers']")
+
+        self.tiers: Dict[str, TierState] = {
+            name: TierState(name=name, provider=provider)
+            for name, provider in tiers.items()
+        }
+        self.quality_floor = config.get("quality_floor", 0.0)
+        self.availability_ttl = config.get("availability_ttl", 30.0)
+
+        self._lock = threading.Lock()
+
+    def warmup(self):
+        """
+        Warm up every tier
+
+        Tiers that fail to warm up are marked unavailable rather than
+        aborting startup. Raises only if no tier could be warmed up.
+        """
+        errors = []
+        for tier in self.tiers.values():
+            try:
+                tier.provider.warmup()
+                self._mark(tier, True)
+            except Exception as e:
+                self._mark(tier, False)
+                errors.append(f"{tier.name}: {e}")
+                print(f"  [Hybrid] Tier '{tier.name}' unavailable: {e}")
+
+        if len(errors) == len(self.tiers):
+            raise AudioGenerationError("No TTS tier could be warmed up\n" + "\n".join(errors))
+
+    def close(self):
+        """Close every tier"""
+        for tier in self.tiers.values():
+            tier.provider.close()
+
+    def generate(self, request: AudioGenerationRequest) -> AudioGenerationResult:
+        """
+        Generate speech on the best tier for this request
+
+        Tiers are tried in routing order; a tier that raises is marked
+        unavailable and the next one is tried.
+
+        Raises:
+            AudioGenerationError: If every candidate tier failed
+        """
+        candidates = self.route(request)
+        if not candidates:
+            raise AudioGenerationError("No TTS tier is available")
+
+        errors = []
+        for name in candidates:
+            try:
+                return self.generate_on(name, request)
+            except Exception as e:
+                self._mark(self.tiers[name], False)
+                errors.append(f"{name}: {e}")
+                print(f"  [Hybrid] Tier '{name}' failed, falling back: {e}")
+
+        raise AudioGenerationError("All TTS tiers failed\n" + "\n".join(errors))
+
+    def generate_batch(self, requests: List[AudioGenerationRequest]) -> List[AudioGenerationResult]:
+        """
+        Route each request, then hand every tier its share as one batch
+
+        Lets tiers that combine requests (e.g. Higgs packing short scenes)
+        do so. If a tier's batch fails, its requests go through generate()
+        individually so the usual fallback applies.
+        """
+        by_tier: Dict[str, List[int]] = {}
+        for idx, request in enumerate(requests):
+            candidates = self.route(request)
+            if not candidates:
+                raise AudioGenerationError("No TTS tier is available")
+            by_tier.setdefault(candidates[0], []).append(idx)
+
+        results = [None] * len(requests)
+        for name, indices in by_tier.items():
+            tier = self.tiers[name]
+            with self._lock:
+                tier.in_flight += len(indices)
+            try:
+                batch = tier.provider.generate_batch([requests[i] for i in indices])
+                for idx, result in zip(indices, batch):
+                    results[idx] = result
+            except Exception as e:
+                self._mark(tier, False)
+                print(f"  [Hybrid] Tier '{name}' batch failed, falling back: {e}")
+            finally:
+                with self._lock:
+                    tier.in_flight -= len(indices)
+
+        for idx, request in enumerate(requests):
+            if results[idx] is None:
+                results[idx] = self.generate(request)
+        return results
+
+    def generate_on(self, tier_name: str, request: AudioGenerationRequest) -> AudioGenerationResult:
+        """
+        Generate on a specific tier, bypassing routing
+
+        Still tracks queue depth and learned quality for that tier.
+        """
+        tier = self.tiers[tier_name]
+
+        with self._lock:
+            tier.in_flight += 1
+        try:
+            result = tier.provider.generate(request)
+        finally:
+            with self._lock:
+                tier.in_flight -= 1
+
+        if result.quality_score is not None and not result.hedged:
+            # A hedged result is another tier's audio; it says nothing about this tier's quality
+            tier.quality = result.quality_score
+        return result
+
+    def route(self, request: AudioGenerationRequest) -> List[str]:
+        """
+        Order tiers by preference for this request
+
+        Tiers meeting the quality floor come first, sorted by expected
+        latency (ties go to the higher quality tier). Tiers below the floor
+        follow as fallbacks, best quality first.
+
+        Returns:
+            Tier names in the order they should be tried
+        """
+        available = [t for t in self.tiers.values() if self._check_available(t)]
+
+        qualified = [t for t in available if t.expected_quality >= self.quality_floor]
+        fallback = [t for t in available if t.expected_quality < self.quality_floor]
+
+        qualified.sort(key=lambda t: (self.expected_latency(t.name, request), -t.expected_quality))
+        fallback.sort(key=lambda t: -t.expected_quality)
+
+        return [t.name for t in qualified + fallback]
+
+    def expected_latency(self, tier_name: str, request: AudioGenerationRequest) -> float:
+        """
+        Expected seconds until this tier would return audio for the request
+
+        Cache hits are free; otherwise the request waits behind everything
+        already in flight on the tier, spread over its parallel capacity.
+        """
+        tier = self.tiers[tier_name]
+        if tier.provider.is_cached(request):
+            return 0.0
+
+        estimate = tier.provider.estimate_generation_time(len(request.text))
+        rounds = -(-(tier.in_flight + 1) // max(1, tier.provider.max_concurrency()))
+        return estimate * rounds
+
+    def is_tier_available(self, tier_name: str) -> bool:
+        """Whether a specific tier can currently generate"""
+        return self._check_available(self.tiers[tier_name])
+
+    def is_available(self) -> bool:
+        """True if at least one tier can currently generate"""
+        return any(self._check_available(t) for t in self.tiers.values())
+
+    def is_cached(self, request: AudioGenerationRequest) -> bool:
+        """True if any tier already has this request cached"""
+        return any(t.provider.is_cached(request) for t in self.tiers.values())
+
+    def cached_batch(self, requests: List[AudioGenerationRequest]) -> List[bool]:
+        """True for each request that any tier already has cached"""
+        flags = [False] * len(requests)
+        for tier in self.tiers.values():
+            flags = [a or b for a, b in zip(flags, tier.provider.cached_batch(requests))]
+        return flags
+
+    def estimate_generation_time(self, text_length: int) -> float:
+        """Estimate for the tier that routing would currently prefer"""
+        request = AudioGenerationRequest(text="x" * text_length, voice_id="")
+        candidates = self.route(request)
+        if not candidates:
+            return 0.0
+        return self.tiers[candidates[0]].provider.estimate_generation_time(text_length)
+
+    def supports_voice_cloning(self) -> bool:
+        return any(t.provider.supports_voice_cloning() for t in self.tiers.values())
+
+    def supports_emotion_control(self) -> bool:
+        return any(t.provider.supports_emotion_control() for t in self.tiers.values())
+
+    def _check_available(self, tier: TierState) -> bool:
+        """Availability with a TTL, so remote tiers aren't pinged per request"""
+        if tier.available is None or time.time() - tier.checked_at > self.availability_ttl:
+            try:
+                self._mark(tier, tier.provider.is_available())
+            except Exception:
+                self._mark(tier, False)
+        return tier.available
+
+    def _mark(self, tier: TierState, available: bool):
+        tier.available = available
+        tier.checked_at = time.time()
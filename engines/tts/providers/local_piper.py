@@ -14,12 +14,22 @@ Use Cases:
 """
 
 from pathlib import Path
+from typing import List
 from piper.voice import PiperVoice
-from .base import AudioProvider, AudioGenerationRequest, AudioGenerationResult
+from .base import AudioProvider, AudioGenerationRequest, AudioGenerationResult, SpeechTimings, TimedSpan
+from .phoneme_cache import PhonemeCache, split_sentences
+from .quantize import quantize_voice, quantized_path
+from .onnx_cache import load_voice
 import wave
 import time
 import hashlib
 
+
+# Phonemes that end a word: word gaps, sentence start/end markers, pause punctuation
+_WORD_BREAKS = {" ", "^", "$"}
+_PAUSE_PUNCTUATION = set(".,;:!?…—-()\"")
+
+
 class PiperProvider(AudioProvider):
     """
     Tier 1: Fast prototyping engine using Piper TTS
@@ -27,7 +37,15 @@ class PiperProvider(AudioProvider):
     Configuration:
         voice: Voice model name (e.g., "en_US-lessac-medium")
         models_dir: Directory containing .onnx model files (default: ../models/)
-        cache_dir: Directory for caching generated audio (default: ../cache/piper/)
+        config_path: Voice config JSON (default: <voice>.onnx.json or <voice>.json)
+        quantized: Use the 8-bit variant <voice>.int8.onnx, built on first use (default: False)
+        optimized_model_cache: Reuse the optimized ONNX graph across processes (default: True)
+        onnx_threads: Intra-op threads per ONNX session, for multi-process pools (default: auto)
+        asset_root: Shared asset store root; audio goes to <asset_root>/tts/piper/ (default: <repo>/cache)
+        cache_dir: Pre-asset-store flat audio cache, migrated on lookup; also holds
+            the phoneme cache (default: ../cache/piper/)
+        phoneme_cache: Reuse espeak phonemes across sentences and runs (default: True)
+        phoneme_cache_path: SQLite file for the phoneme cache (default: <cache_dir>/phonemes.sqlite3)
 
     Example:
         provider = PiperProvider({
@@ -45,6 +63,13 @@ class PiperProvider(AudioProvider):
         print(f"Speed: {result.generation_time_seconds:.2f}s")
     """
 
+    # Measured on CPU in TIER1_TEST_RESULTS.md (0.05-0.07x)
+    default_rtf = 0.07
+    nominal_quality = 0.72
+
+    asset_namespace = "piper"
+    legacy_cache_dir = Path(__file__).parent.parent / "cache" / "piper"
+
     def __init__(self, config: dict):
         super().__init__(config)
 
@@ -57,16 +82,33 @@ class PiperProvider(AudioProvider):
         else:
             self.models_dir = Path(__file__).parent.parent / "models"
 
-        if "cache_dir" in config:
-            self.cache_dir = Path(config["cache_dir"])
+        self.cache_dir = Path(config.get("cache_dir", self.legacy_cache_dir))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Model paths (quantized variants share the fp32 voice config)
+        self.base_model_path = self.models_dir / f"{self.voice_model}.onnx"
+        self.quantized = config.get("quantized", False)
+        self.model_path = quantized_path(self.base_model_path) if self.quantized else self.base_model_path
+        self.variant = "int8" if self.quantized else None
+        self.display_name = f"Piper ({self.variant})" if self.variant else "Piper"
+
+        if "config_path" in config:
+            self.config_path = Path(config["config_path"])
+        elif self.base_model_path.with_suffix(".onnx.json").exists():
+            self.config_path = self.base_model_path.with_suffix(".onnx.json")
         else:
-            self.cache_dir = Path(__file__).parent.parent / "cache" / "piper"
+            self.config_path = self.models_dir / f"{self.voice_model}.json"
 
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Phoneme cache (shared by every voice of the same language)
+        self.phoneme_cache = None
+        if config.get("phoneme_cache", True):
+            self.phoneme_cache = PhonemeCache(
+                config.get("phoneme_cache_path", self.cache_dir / "phonemes.sqlite3")
+            )
 
-        # Model paths
-        self.model_path = self.models_dir / f"{self.voice_model}.onnx"
-        self.config_path = self.models_dir / f"{self.voice_model}.json"
+        # ONNX session options
+        self.optimized_model_cache = config.get("optimized_model_cache", True)
+        self.onnx_threads = config.get("onnx_threads")
 
         # Voice instance (loaded on first use or during warmup)
         self.voice = None
@@ -86,37 +128,49 @@ class PiperProvider(AudioProvider):
                 f"Download from: https://huggingface.co/rhasspy/piper-voices"
             )
 
-        print(f"Loading Piper voice: {self.voice_model}")
+        if self.quantized and not self.model_path.exists():
+            print(f"Quantizing Piper voice: {self.voice_model}")
+            quantize_voice(self.base_model_path, self.model_path)
+
+        print(f"Loading Piper voice: {self.voice_model}" + (f" ({self.variant})" if self.variant else ""))
         start_time = time.time()
 
-        self.voice = PiperVoice.load(str(self.model_path))
+        if self.optimized_model_cache:
+            self.voice = load_voice(self.model_path, self.config_path, num_threads=self.onnx_threads)
+        else:
+            self.voice = self._load_voice()
+        if self.phoneme_cache:
+            self.phoneme_cache.attach(self.voice)
 
         load_time = time.time() - start_time
         print(f"[OK] Piper loaded in {load_time:.2f}s (SR: {self.voice.config.sample_rate}Hz)")
 
+    def close(self):
+        """Close the phoneme cache database"""
+        if self.phoneme_cache:
+            self.phoneme_cache.close()
+            self.phoneme_cache = None
+
     def generate(self, request: AudioGenerationRequest) -> AudioGenerationResult:
         """
         Generate speech using Piper
 
         Process:
-        1. Check cache for existing audio (hash-based)
+        1. Look the request up in the asset store
         2. If cached, return immediately
         3. If not cached, load model (if needed) and synthesize
-        4. Save to cache
+           sentence by sentence, recording word/sentence timings
+        4. Publish audio and timings (<key>.timings.json) to the store
         5. Return result with metrics
         """
 
-        # Generate cache key from request
-        cache_key = request.to_cache_key()
-        output_path = self.cache_dir / f"{cache_key}.wav"
+        key, ext = self.asset_key(request)
 
         # Check cache
-        if output_path.exists():
-            # Return cached result
-            with wave.open(str(output_path), "rb") as wav_file:
-                frames = wav_file.getnframes()
-                rate = wav_file.getframerate()
-                duration = frames / float(rate)
+        output_path = self.assets.lookup(key, ext)
+        if output_path is not None:
+            # Return cached result (duration from the asset index when known)
+            duration, rate = self._audio_info(key, ext, output_path)
 
             return AudioGenerationResult(
                 audio_path=output_path,
@@ -124,49 +178,100 @@ class PiperProvider(AudioProvider):
                 sample_rate=rate,
                 was_cached=True,
                 generation_time_seconds=0.0,
-                provider_name="Piper",
-                quality_score=0.72  # 72/100 baseline
+                provider_name=self.display_name,
+                quality_score=0.72,  # 72/100 baseline
+                timings=SpeechTimings.load(output_path),
+                compressed_path=self.assets.compressed_path(key, ext)
             )
 
-        # Load model if not loaded
-        if not self.voice:
-            self.warmup()
+        try:
+            # Load model if not loaded
+            if not self.voice:
+                self.warmup()
+
+            # Generate audio
+            start_time = time.time()
+            output_path = self.assets.path(key, ext)
+
+            with self.assets.writing(key, ext) as tmp_path, wave.open(str(tmp_path), "wb") as wav_file:
+                # Configure WAV file
+                wav_file.setnchannels(1)  # Mono
+                wav_file.setsampwidth(2)  # 16-bit
+                wav_file.setframerate(self.voice.config.sample_rate)
+
+                # Synthesize one sentence at a time so every chunk maps back to its text
+                timings = SpeechTimings()
+                rate = self.voice.config.sample_rate
+                offset = 0
+                for sentence in split_sentences(request.text):
+                    sentence_start = offset
+                    word_spans = []
+                    for audio_chunk in self._synthesize(sentence):
+                        audio = audio_chunk.audio_int16_bytes
+                        wav_file.writeframes(audio)
+                        num_samples = len(audio) // 2
+                        word_spans.extend(
+                            (offset + start, offset + end)
+                            for start, end in _word_sample_spans(audio_chunk, num_samples)
+                        )
+                        offset += num_samples
+
+                    timings.sentences.append(TimedSpan(sentence, round(sentence_start / rate, 3), round(offset / rate, 3)))
+                    timings.words.extend(_label_words(sentence, word_spans, sentence_start, offset, rate))
+
+                # Sidecar first, so a published WAV always has its timings
+                timings.save(output_path)
+
+            gen_time = time.time() - start_time
+            if self.phoneme_cache:
+                self.phoneme_cache.commit()
+
+            # Get audio duration
+            with wave.open(str(output_path), "rb") as wav_file:
+                frames = wav_file.getnframes()
+                rate = wav_file.getframerate()
+                duration = frames / float(rate)
+            self.assets.describe(key, ext, {"duration_seconds": duration, "sample_rate": rate}, generation_seconds=gen_time)
 
-        # Generate audio
-        start_time = time.time()
+            # Calculate real-time factor (for logging and time estimates)
+            rtf = gen_time / duration if duration > 0 else 0
+            self.record_generation(duration, gen_time)
 
-        with wave.open(str(output_path), "wb") as wav_file:
-            # Configure WAV file
-            wav_file.setnchannels(1)  # Mono
-            wav_file.setsampwidth(2)  # 16-bit
-            wav_file.setframerate(self.voice.config.sample_rate)
-
-            # Synthesize text to audio chunks
-            for audio_chunk in self.voice.synthesize(request.text):
-                wav_file.writeframes(audio_chunk.audio_int16_bytes)
-
-        gen_time = time.time() - start_time
-
-        # Get audio duration
-        with wave.open(str(output_path), "rb") as wav_file:
-            frames = wav_file.getnframes()
-            rate = wav_file.getframerate()
-            duration = frames / float(rate)
-
-        # Calculate real-time factor (for logging)
-        rtf = gen_time / duration if duration > 0 else 0
-
-        print(f"  [Piper] Generated {duration:.2f}s audio in {gen_time:.2f}s (RTF: {rtf:.2f}x)")
-
-        return AudioGenerationResult(
-            audio_path=output_path,
-            duration_seconds=duration,
-            sample_rate=rate,
-            was_cached=False,
-            generation_time_seconds=gen_time,
-            provider_name="Piper",
-            quality_score=0.72  # 72/100 baseline
-        )
+            print(f"  [{self.display_name}] Generated {duration:.2f}s audio in {gen_time:.2f}s (RTF: {rtf:.2f}x)")
+
+            return AudioGenerationResult(
+                audio_path=output_path,
+                duration_seconds=duration,
+                sample_rate=rate,
+                was_cached=False,
+                generation_time_seconds=gen_time,
+                provider_name=self.display_name,
+                quality_score=0.72,  # 72/100 baseline
+                timings=timings,
+                compressed_path=self.assets.compressed_path(key, ext)
+            )
+        except Exception:
+            self.assets.record_failure(key, ext)
+            raise
+        finally:
+            # No-op once published; otherwise wakes anyone waiting on this asset
+            self.assets.release(key, ext)
+
+    def _load_voice(self) -> PiperVoice:
+        """Load the voice patched for phoneme alignments when this piper version supports it"""
+        try:
+            return PiperVoice.load(
+                str(self.model_path), config_path=str(self.config_path), include_alignments=True
+            )
+        except TypeError:
+            return PiperVoice.load(str(self.model_path), config_path=str(self.config_path))
+
+    def _synthesize(self, text: str):
+        """Synthesize with phoneme alignments when this piper version/model provides them"""
+        try:
+            return self.voice.synthesize(text, include_alignments=True)
+        except TypeError:
+            return self.voice.synthesize(text)
 
     def is_available(self) -> bool:
         """
@@ -174,8 +279,22 @@ class PiperProvider(AudioProvider):
 
         Returns:
             True if both .onnx model and .json config exist
+            (for quantized voices, the fp32 model it is built from is enough)
         """
-        return self.model_path.exists() and self.config_path.exists()
+        model = self.base_model_path if self.quantized else self.model_path
+        return (model.exists() or self.model_path.exists()) and self.config_path.exists()
+
+    def is_cached(self, request: AudioGenerationRequest) -> bool:
+        """Check whether the request's audio is already in the cache"""
+        return self.assets.contains(*self.asset_key(request))
+
+    def cached_batch(self, requests: List[AudioGenerationRequest]) -> List[bool]:
+        return self._stored_batch(requests)
+
+    def asset_key(self, request: AudioGenerationRequest):
+        """Asset store (key, extension) for a request; variants get their own files"""
+        suffix = f".{self.variant}" if self.variant else ""
+        return request.to_cache_key(), f"{suffix}.wav"
 
     def supports_voice_cloning(self) -> bool:
         """Piper uses pre-trained voices only (no cloning)"""
@@ -200,3 +319,67 @@ class PiperProvider(AudioProvider):
                 voices.append(onnx_file.stem)
 
         return sorted(voices)
+
+
+def _word_sample_spans(audio_chunk, num_samples: int) -> list:
+    """
+    (start, end) sample offsets of each spoken word in a Piper audio chunk
+
+    Uses per-phoneme sample counts when the voice reports alignments;
+    otherwise the chunk is split evenly across its phonemes.
+    """
+    alignments = getattr(audio_chunk, "phoneme_alignments", None)
+    if alignments:
+        items = [(a.phoneme, a.num_samples) for a in alignments]
+    else:
+        phonemes = list(getattr(audio_chunk, "phonemes", None) or [])
+        if not phonemes:
+            return [(0, num_samples)]
+        items = [(p, num_samples / len(phonemes)) for p in phonemes]
+
+    spans = []
+    position = 0.0
+    word_start = None
+    for phoneme, samples in items:
+        if phoneme in _WORD_BREAKS or phoneme in _PAUSE_PUNCTUATION:
+            if word_start is not None:
+                spans.append((word_start, position))
+                word_start = None
+        elif word_start is None:
+            word_start = position
+        position += samples
+    if word_start is not None:
+        spans.append((word_start, position))
+
+    # Alignment sample counts don't always add up to the audio length exactly
+    scale = num_samples / position if position else 1.0
+    return [(int(start * scale), int(end * scale)) for start, end in spans]
+
+
+def _label_words(sentence: str, spans: list, start: int, end: int, rate: int) -> list:
+    """
+    Attach the sentence's words to phoneme word spans
+
+    espeak can expand or merge words (numbers, abbreviations), so when the
+    counts differ the voiced part of the sentence is shared out by
+    character count instead.
+    """
+    words = sentence.split()
+    if not words:
+        return []
+
+    if len(words) != len(spans):
+        first = spans[0][0] if spans else start
+        last = spans[-1][1] if spans else end
+        total_chars = sum(len(word) for word in words)
+        spans = []
+        cursor = first
+        for word in words:
+            length = (last - first) * len(word) / total_chars
+            spans.append((cursor, cursor + length))
+            cursor += length
+
+    return [
+        TimedSpan(word, round(s / rate, 3), round(e / rate, 3))
+        for word, (s, e) in zip(words, spans)
+    ]
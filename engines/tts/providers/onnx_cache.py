@@ -0,0 +1,172 @@
+"""
+Optimized ONNX Model Cache - Fast Piper Start-up
+
+Purpose: Pay ONNX Runtime's graph optimization once per model, not per process
+How: The first load saves the optimized graph (SessionOptions.optimized_model_filepath);
+     later loads open that file with optimization disabled
+Where: <models_dir>/optimized/<voice>.<key>.onnx
+
+The key covers the model contents, the onnxruntime version, the
+optimization level, the execution providers, the CPU architecture and
+whether the graph was patched for alignments.
+Fully optimized graphs can contain hardware-specific kernels, so a cached
+graph is only reused where it was built. Model hashes are remembered in a
+sidecar file keyed by size and mtime, so a start-up doesn't re-hash
+every voice.
+
+Stock Piper voices don't output phoneme durations. Before optimizing, the
+graph is patched (piper.patch_voice_with_alignment, needs the onnx
+package) to expose them, so synthesize(..., include_alignments=True)
+returns real per-phoneme timings. If the patch can't be applied, the voice
+loads unpatched and word timings fall back to an even split.
+
+With this, a pool of N workers costs roughly one optimization plus N
+cheap loads.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import platform
+import threading
+from pathlib import Path
+from typing import Optional
+
+import onnxruntime
+from piper.config import PiperConfig
+from piper.voice import PiperVoice
+
+
+OPTIMIZED_DIR = "optimized"
+
+
+def _can_patch_alignments() -> bool:
+    """True when the onnx package needed to patch in alignments is installed"""
+    return importlib.util.find_spec("onnx") is not None
+
+
+def _with_alignments(model_path: Path):
+    """
+    Model with its phoneme-duration tensor added as a graph output
+
+    Returns:
+        Serialized model bytes, or the model path unchanged when it can't be
+        patched (onnx missing, tensor not found, or already an output)
+    """
+    try:
+        import onnx
+        from piper.patch_voice_with_alignment import add_alignment_output
+
+        model = onnx.load(str(model_path))
+        add_alignment_output(model)
+        return model.SerializeToString()
+    except (ImportError, ValueError) as e:
+        print(f"  [Piper] No alignment output for {Path(model_path).name}: {e}")
+        return str(model_path)
+
+
+def model_hash(model_path: Path) -> str:
+    """
+    SHA256 of a model file, cached in <model>.sha256
+
+    The sidecar stores the size and mtime it was computed for and is
+    ignored once either changes.
+    """
+    model_path = Path(model_path)
+    sidecar = model_path.with_name(model_path.name + ".sha256")
+    stat = model_path.stat()
+
+    try:
+        cached = json.loads(sidecar.read_text(encoding="utf-8"))
+        if cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime:
+            return cached["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+
+    try:
+        sidecar.write_text(
+            json.dumps({"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest.hexdigest()}),
+            encoding="utf-8"
+        )
+    except OSError:
+        pass  # Read-only models dir: just hash again next time
+
+    return digest.hexdigest()
+
+
+def optimized_model_path(model_path: Path, providers=("CPUExecutionProvider",)) -> Path:
+    """Where the optimized graph for this model/runtime combination lives"""
+    model_path = Path(model_path)
+    key = hashlib.sha256(json.dumps({
+        "model": model_hash(model_path),
+        "onnxruntime": onnxruntime.__version__,
+        "level": "ORT_ENABLE_ALL",
+        "providers": list(providers),
+        "machine": platform.machine(),
+        "alignments": _can_patch_alignments()
+    }, sort_keys=True).encode()).hexdigest()[:16]
+
+    stem = model_path.name[:-len(".onnx")] if model_path.name.endswith(".onnx") else model_path.name
+    return model_path.parent / OPTIMIZED_DIR / f"{stem}.{key}.onnx"
+
+
+def load_voice(
+    model_path: Path,
+    config_path: Path,
+    num_threads: Optional[int] = None,
+    use_cuda: bool = False
+) -> PiperVoice:
+    """
+    Load a PiperVoice, reusing (or creating) its optimized graph
+
+    The graph is patched for alignments before it is optimized, so the
+    cached copy keeps the extra output.
+
+    Args:
+        model_path: .onnx voice model
+        config_path: Voice config JSON
+        num_threads: Intra-op threads per session (default: onnxruntime's choice).
+            Set this for multi-process pools so workers don't oversubscribe cores.
+        use_cuda: Run on CUDA instead of CPU
+
+    Returns:
+        Ready-to-use PiperVoice
+    """
+    providers = ["CUDAExecutionProvider"] if use_cuda else ["CPUExecutionProvider"]
+    optimized_path = optimized_model_path(model_path, providers)
+
+    options = onnxruntime.SessionOptions()
+    if num_threads:
+        options.intra_op_num_threads = num_threads
+
+    if optimized_path.exists():
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+        session = onnxruntime.InferenceSession(str(optimized_path), sess_options=options, providers=providers)
+    else:
+        optimized_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Unique temp name: concurrent workers may all be building the same graph
+        tmp_path = optimized_path.with_name(
+            f"{optimized_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.optimized_model_filepath = str(tmp_path)
+        session = onnxruntime.InferenceSession(
+            _with_alignments(model_path), sess_options=options, providers=providers
+        )
+
+        try:
+            os.replace(tmp_path, optimized_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = PiperConfig.from_dict(json.load(f))
+
+    return PiperVoice(config=config, session=session)
@@ -0,0 +1,177 @@
+"""
+Phoneme Cache - Persistent espeak Results for Piper
+
+Purpose: Skip espeak phonemization for sentences Piper has already seen
+Storage: SQLite, keyed by normalized sentence + voice language
+Payoff: Documentary scripts repeat names, recaps and intro/outro lines,
+        and re-renders repeat everything
+
+Phonemes depend only on the espeak voice (language), so they are shared
+between every Piper voice of the same language. Phoneme IDs depend on the
+voice's phoneme map and are stored alongside, tagged with that map.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+# Sentence ends: terminal punctuation (plus closing quotes/brackets) followed by whitespace
+_SENTENCE_END = re.compile(r'(?:(?<=[.!?…])|(?<=[.!?…]["\'”’)\]]))\s+')
+
+
+def normalize_sentence(text: str) -> str:
+    """Canonical form used as the cache key (NFC, collapsed whitespace)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into normalized sentences, dropping empty pieces"""
+    sentences = []
+    for piece in _SENTENCE_END.split(text):
+        piece = normalize_sentence(piece)
+        if piece:
+            sentences.append(piece)
+    return sentences
+
+
+class PhonemeCache:
+    """
+    SQLite-backed phoneme and phoneme-ID cache for PiperVoice
+
+    Example:
+        cache = PhonemeCache("cache/piper/phonemes.sqlite3")
+        voice = PiperVoice.load("models/en_US-lessac-medium.onnx")
+        cache.attach(voice)
+
+        voice.synthesize(text)   # espeak only runs for unseen sentences
+        print(cache.hits, cache.misses)
+    """
+
+    # Phoneme-ID lookups kept in memory between phonemize() and phonemes_to_ids()
+    MAX_MEMORY_ENTRIES = 10000
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS phonemes ("
+            " key TEXT PRIMARY KEY,"
+            " language TEXT NOT NULL,"
+            " sentence TEXT NOT NULL,"
+            " phonemes TEXT NOT NULL,"
+            " id_map TEXT,"
+            " phoneme_ids TEXT,"
+            " hits INTEGER NOT NULL DEFAULT 0,"
+            " updated REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sentence: str, language: str) -> Optional[Tuple[list, Optional[str], Optional[list]]]:
+        """
+        Look up a normalized sentence
+
+        Returns:
+            (phonemes, id_map, phoneme_ids) or None if not cached
+        """
+        key = self._key(sentence, language)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT phonemes, id_map, phoneme_ids FROM phonemes WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute("UPDATE phonemes SET hits = hits + 1 WHERE key = ?", (key,))
+
+        phonemes, id_map, ids = row
+        return json.loads(phonemes), id_map, (json.loads(ids) if ids else None)
+
+    def put(self, sentence: str, language: str, phonemes: list, id_map: str, phoneme_ids: list):
+        """Store phonemes (and IDs for the given phoneme map) for a normalized sentence"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO phonemes"
+                " (key, language, sentence, phonemes, id_map, phoneme_ids, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(sentence, language), language, sentence,
+                    json.dumps(phonemes, ensure_ascii=False), id_map,
+                    json.dumps(phoneme_ids), time.time()
+                )
+            )
+
+    def commit(self):
+        """Flush pending writes (called once per synthesized request)"""
+        with self._lock:
+            self._conn.commit()
+
+    def attach(self, voice):
+        """
+        Route a PiperVoice's phonemization through this cache
+
+        Overrides phonemize() and phonemes_to_ids() on the instance only;
+        synthesize() picks them up unchanged.
+        """
+        language = f"{getattr(voice.config.phoneme_type, 'value', voice.config.phoneme_type)}:{voice.config.espeak_voice}"
+        id_map = hashlib.sha256(
+            json.dumps(voice.config.phoneme_id_map, sort_keys=True).encode()
+        ).hexdigest()[:16]
+
+        phonemize = voice.phonemize
+        phonemes_to_ids = voice.phonemes_to_ids
+        known_ids = {}
+
+        def cached_phonemize(text: str) -> List[List[str]]:
+            result = []
+            for sentence in split_sentences(text):
+                entry = self.get(sentence, language)
+                if entry is not None:
+                    sentence_phonemes, entry_map, ids = entry
+                    if entry_map != id_map or ids is None:
+                        ids = [phonemes_to_ids(p) for p in sentence_phonemes]
+                        self.put(sentence, language, sentence_phonemes, id_map, ids)
+                else:
+                    sentence_phonemes = phonemize(sentence)
+                    ids = [phonemes_to_ids(p) for p in sentence_phonemes]
+                    self.put(sentence, language, sentence_phonemes, id_map, ids)
+
+                if len(known_ids) > self.MAX_MEMORY_ENTRIES:
+                    known_ids.clear()
+                for phonemes, phoneme_ids in zip(sentence_phonemes, ids):
+                    known_ids[tuple(phonemes)] = phoneme_ids
+                result.extend(sentence_phonemes)
+            return result
+
+        def cached_phonemes_to_ids(phonemes: List[str]) -> List[int]:
+            ids = known_ids.get(tuple(phonemes))
+            if ids is None:
+                ids = phonemes_to_ids(phonemes)
+            return ids
+
+        voice.phonemize = cached_phonemize
+        voice.phonemes_to_ids = cached_phonemes_to_ids
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    @staticmethod
+    def _key(sentence: str, language: str) -> str:
+        return hashlib.sha256(f"{language}\n{sentence}".encode("utf-8")).hexdigest()
@@ -0,0 +1,67 @@
+"""
+Piper Voice Quantization
+
+Purpose: Build 8-bit variants of downloaded Piper voices for CPU-only nodes
+Method: onnxruntime dynamic quantization (weights stored as 8-bit, activations
+        quantized on the fly), so no calibration data is needed
+Output: <voice>.int8.onnx next to <voice>.onnx (the voice config is shared)
+
+Quality loss is voice dependent; measure it with
+research/benchmarks/test_quantized_voices.py before using a variant.
+"""
+
+from pathlib import Path
+from typing import Optional, Sequence
+
+
+QUANTIZED_SUFFIX = ".int8.onnx"
+
+
+def quantized_path(model_path: Path) -> Path:
+    """Path of the 8-bit variant for an fp32 voice model"""
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.name[:-len(".onnx")] + QUANTIZED_SUFFIX)
+
+
+def quantize_voice(
+    model_path: Path,
+    output_path: Optional[Path] = None,
+    op_types: Optional[Sequence[str]] = None,
+    force: bool = False
+) -> Path:
+    """
+    Dynamically quantize a Piper voice model
+
+    Args:
+        model_path: fp32 .onnx voice model
+        output_path: Where to write the variant (default: <voice>.int8.onnx)
+        op_types: ONNX op types to quantize (default: every supported type)
+        force: Rebuild even if the variant already exists
+
+    Returns:
+        Path to the quantized model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    model_path = Path(model_path)
+    output_path = Path(output_path) if output_path else quantized_path(model_path)
+
+    if output_path.exists() and not force:
+        return output_path
+
+    # Write next to the target and rename, so a crash never leaves a truncated model
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    quantize_dynamic(
+        model_input=str(model_path),
+        model_output=str(tmp_path),
+        op_types_to_quantize=list(op_types) if op_types else None,
+        # ConvInteger (VITS decoder) only has uint8 weight kernels on CPU
+        weight_type=QuantType.QUInt8
+    )
+    tmp_path.replace(output_path)
+
+    before = model_path.stat().st_size / 1024 / 1024
+    after = output_path.stat().st_size / 1024 / 1024
+    print(f"  [Quantize] {model_path.name} ({before:.1f} MB) -> {output_path.name} ({after:.1f} MB)")
+
+    return output_path
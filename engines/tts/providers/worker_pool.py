@@ -0,0 +1,218 @@
+"""
+Remote Worker Pool - Load Balancing Across GPU Runtimes
+
+Purpose: Spread remote TTS requests over every Colab/Kaggle runtime we have up
+Balancing: Live queue depth x measured latency (seconds per character)
+Lifecycle: Workers whose tunnel dies are drained, then retired
+
+Workers can be added or removed at runtime, either through add()/remove()
+or by editing a workers file (one URL per line, '#' for comments) that the
+pool re-reads when it changes.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+
+ACTIVE = "active"
+DRAINING = "draining"
+RETIRED = "retired"
+
+
+@dataclass
+class Worker:
+    """A single remote worker endpoint"""
+    url: str
+    state: str = ACTIVE
+    in_flight: int = 0                         # Requests currently sent to this worker
+    seconds_per_char: Optional[float] = None   # Smoothed latency per input character
+    failures: int = 0                          # Consecutive connection failures
+    completed: int = 0
+
+
+class WorkerPool:
+    """
+    Thread-safe pool of remote worker URLs
+
+    Example:
+        pool = WorkerPool(["https://a.ngrok-free.app", "https://b.ngrok-free.app"])
+
+        worker = pool.acquire()
+        try:
+            ...  # POST to f"{worker.url}/generate"
+            pool.release(worker, ok=True, seconds=elapsed, chars=len(text))
+        except ConnectionError:
+            pool.release(worker, ok=False)
+    """
+
+    # Weight of the newest observation in the latency moving average
+    SMOOTHING = 0.3
+
+    # Minimum seconds between checks of the workers file
+    FILE_POLL_INTERVAL = 5.0
+
+    def __init__(self, urls: Iterable[str] = (), max_failures: int = 3, workers_file: Optional[str] = None):
+        """
+        Args:
+            urls: Initial worker URLs
+            max_failures: Consecutive connection failures before a worker is drained
+            workers_file: Optional file listing worker URLs, re-read on change
+        """
+        self.max_failures = max_failures
+        self.workers_file = Path(workers_file) if workers_file else None
+
+        self._workers = {}
+        self._lock = threading.Lock()
+        self._file_mtime = None
+        self._file_checked = 0.0
+        self._file_urls = set()
+
+        for url in urls:
+            self.add(url)
+        self.refresh()
+
+    def add(self, url: str) -> None:
+        """Add a worker (or reactivate one that was draining)"""
+        url = url.rstrip('/')
+        with self._lock:
+            worker = self._workers.get(url)
+            if worker is None:
+                self._workers[url] = Worker(url=url)
+                print(f"  [Pool] Added worker {url}")
+            elif worker.state != ACTIVE:
+                worker.state = ACTIVE
+                worker.failures = 0
+                print(f"  [Pool] Reactivated worker {url}")
+
+    def remove(self, url: str) -> None:
+        """Stop routing to a worker; it retires once its in-flight requests finish"""
+        with self._lock:
+            worker = self._workers.get(url.rstrip('/'))
+            if worker is not None:
+                self._drain(worker)
+
+    def acquire(self, exclude: Iterable[str] = ()) -> Optional[Worker]:
+        """
+        Reserve the worker with the lowest expected wait
+
+        Expected wait is (in_flight + 1) x the worker's latency. Workers
+        without measurements are assumed as fast as the pool average, so new
+        workers get traffic straight away.
+
+        Args:
+            exclude: URLs not to pick (e.g. the worker a request is hedging against)
+
+        Returns:
+            The chosen Worker, or None if no active worker is left
+        """
+        self.refresh()
+        excluded = set(exclude)
+
+        with self._lock:
+            candidates = [w for w in self._workers.values() if w.state == ACTIVE and w.url not in excluded]
+            if not candidates:
+                return None
+
+            known = [w.seconds_per_char for w in candidates if w.seconds_per_char is not None]
+            default = sum(known) / len(known) if known else 1.0
+
+            worker = min(
+                candidates,
+                key=lambda w: (w.in_flight + 1) * (w.seconds_per_char if w.seconds_per_char is not None else default)
+            )
+            worker.in_flight += 1
+            return worker
+
+    def release(self, worker: Worker, ok: bool, seconds: float = 0.0, chars: int = 0,
+                connection_failed: bool = False) -> None:
+        """
+        Return a worker after a request
+
+        Args:
+            worker: Worker from acquire()
+            ok: Whether the request succeeded
+            seconds: Request latency (only used when ok)
+            chars: Input characters of the request (only used when ok)
+            connection_failed: The tunnel looked dead (connection error / 404 from ngrok)
+        """
+        with self._lock:
+            worker.in_flight -= 1
+
+            if ok:
+                worker.failures = 0
+                worker.completed += 1
+                if chars > 0:
+                    spc = seconds / chars
+                    if worker.seconds_per_char is None:
+                        worker.seconds_per_char = spc
+                    else:
+                        worker.seconds_per_char += self.SMOOTHING * (spc - worker.seconds_per_char)
+            elif connection_failed:
+                worker.failures += 1
+                if worker.failures >= self.max_failures and worker.state == ACTIVE:
+                    print(f"  [Pool] Worker {worker.url} unreachable {worker.failures}x, draining")
+                    self._drain(worker)
+
+            if worker.state == DRAINING and worker.in_flight == 0:
+                self._retire(worker)
+
+    def active_urls(self) -> List[str]:
+        """URLs currently accepting requests"""
+        self.refresh()
+        with self._lock:
+            return [w.url for w in self._workers.values() if w.state == ACTIVE]
+
+    def active_count(self) -> int:
+        return len(self.active_urls())
+
+    def snapshot(self) -> List[Worker]:
+        """Copy of all known workers (for status reporting)"""
+        with self._lock:
+            return [Worker(**vars(w)) for w in self._workers.values()]
+
+    def refresh(self) -> None:
+        """Re-read the workers file if it changed since the last check"""
+        if self.workers_file is None:
+            return
+
+        now = time.time()
+        if now - self._file_checked < self.FILE_POLL_INTERVAL and self._file_mtime is not None:
+            return
+        self._file_checked = now
+
+        try:
+            mtime = self.workers_file.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._file_mtime:
+            return
+        self._file_mtime = mtime
+
+        lines = self.workers_file.read_text(encoding="utf-8").splitlines()
+        listed = {line.strip().rstrip('/') for line in lines if line.strip() and not line.strip().startswith("#")}
+
+        for url in listed:
+            self.add(url)
+
+        # Only workers that came from the file can be removed through it
+        with self._lock:
+            for url in self._file_urls - listed:
+                worker = self._workers.get(url)
+                if worker is not None and worker.state == ACTIVE:
+                    self._drain(worker)
+        self._file_urls = listed
+
+    def _drain(self, worker: Worker) -> None:
+        # Caller holds the lock
+        worker.state = DRAINING
+        if worker.in_flight == 0:
+            self._retire(worker)
+
+    def _retire(self, worker: Worker) -> None:
+        # Caller holds the lock
+        worker.state = RETIRED
+        self._workers.pop(worker.url, None)
+        print(f"  [Pool] Retired worker {worker.url}")
@@ -0,0 +1,187 @@
+"""
+Quantized Piper Voice Benchmark
+Compares each voice's 8-bit variant (<voice>.int8.onnx) against fp32:
+- Speed: real-time factor and speedup
+- Accuracy: waveform RMSE / SNR and log-spectral distance (LSD)
+
+Accuracy is measured with noise disabled (noise_scale = noise_w_scale = 0)
+so both models are deterministic and differences come from quantization
+only. Speed is measured with the voice's default synthesis settings.
+
+Usage:
+    python test_quantized_voices.py
+    python test_quantized_voices.py --voices en_US-lessac-medium --runs 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from piper import PiperVoice, SynthesisConfig
+
+# benchmarks/ -> research/ -> tts/
+TTS_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(TTS_DIR))
+sys.path.insert(0, str(TTS_DIR.parent.parent))  # Repo root, for engines.asset_store
+from providers.quantize import quantize_voice, quantized_path
+
+MODELS_DIR = TTS_DIR / "models"
+
+# Same scenes as test_piper.py
+TEST_SCENES = {
+    "neutral": "The investigation began on a cold November morning when Detective Martinez received an anonymous tip.",
+    "dramatic": "But nothing could have prepared them for what they found behind that door.",
+    "conversational": "You might be wondering, how did they miss such obvious clues? Let me explain.",
+    "long_form": """In the world of true crime, some cases stand out not just for their brutality,
+    but for the intricate web of lies and deception that surrounds them. Today, we're diving deep
+    into a case that has baffled investigators for over a decade. A case where every answer
+    led to more questions, and where the truth, when it finally emerged, was far stranger
+    than anyone could have imagined."""
+}
+
+DETERMINISTIC = SynthesisConfig(noise_scale=0.0, noise_w_scale=0.0)
+
+
+def synthesize(voice, text, syn_config=None) -> np.ndarray:
+    """Synthesize text to a float32 array in [-1, 1]"""
+    chunks = [chunk.audio_float_array for chunk in voice.synthesize(text, syn_config=syn_config)]
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+
+
+def waveform_distance(reference: np.ndarray, test: np.ndarray):
+    """RMSE and SNR (dB) over the overlapping samples"""
+    n = min(len(reference), len(test))
+    reference, test = reference[:n], test[:n]
+    error = reference - test
+    rmse = float(np.sqrt(np.mean(error ** 2)))
+    snr = 10 * np.log10(np.sum(reference ** 2) / max(np.sum(error ** 2), 1e-12))
+    return rmse, float(snr)
+
+
+def log_spectral_distance(reference: np.ndarray, test: np.ndarray, frame: int = 1024, hop: int = 256) -> float:
+    """Mean log-spectral distance (dB) between power spectrograms"""
+    def power_spectrogram(signal):
+        window = np.hanning(frame)
+        frames = [signal[i:i + frame] * window for i in range(0, len(signal) - frame + 1, hop)]
+        return np.abs(np.fft.rfft(np.array(frames), axis=1)) ** 2
+
+    n = min(len(reference), len(test))
+    if n < frame:
+        return float("nan")
+    ref_spec = power_spectrogram(reference[:n])
+    test_spec = power_spectrogram(test[:n])
+
+    diff = 10 * np.log10(ref_spec + 1e-10) - 10 * np.log10(test_spec + 1e-10)
+    return float(np.mean(np.sqrt(np.mean(diff ** 2, axis=1))))
+
+
+def time_synthesis(voice, text, runs: int):
+    """Best-of-N generation time and audio duration"""
+    best = None
+    duration = 0.0
+    for _ in range(runs):
+        start = time.time()
+        audio = synthesize(voice, text)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+        duration = len(audio) / voice.config.sample_rate
+    return best, duration
+
+
+def config_for(model_path: Path) -> Path:
+    onnx_json = model_path.with_suffix(".onnx.json")
+    return onnx_json if onnx_json.exists() else model_path.with_suffix(".json")
+
+
+def benchmark_voice(voice_name: str, models_dir: Path, runs: int):
+    """Benchmark one voice; returns a summary dict or None if it is missing"""
+    model_path = models_dir / f"{voice_name}.onnx"
+    if not model_path.exists():
+        print(f"  [SKIP] Model not found: {model_path}")
+        return None
+
+    int8_path = quantize_voice(model_path, quantized_path(model_path))
+    config_path = config_for(model_path)
+
+    fp32 = PiperVoice.load(str(model_path), config_path=str(config_path))
+    int8 = PiperVoice.load(str(int8_path), config_path=str(config_path))
+
+    rows = []
+    for scene_name, text in TEST_SCENES.items():
+        fp32_time, fp32_dur = time_synthesis(fp32, text, runs)
+        int8_time, int8_dur = time_synthesis(int8, text, runs)
+
+        reference = synthesize(fp32, text, DETERMINISTIC)
+        test = synthesize(int8, text, DETERMINISTIC)
+        rmse, snr = waveform_distance(reference, test)
+        lsd = log_spectral_distance(reference, test)
+
+        row = {
+            "scene": scene_name,
+            "fp32_rtf": fp32_time / fp32_dur if fp32_dur > 0 else 0,
+            "int8_rtf": int8_time / int8_dur if int8_dur > 0 else 0,
+            "length_diff": (len(test) - len(reference)) / fp32.config.sample_rate,
+            "rmse": rmse,
+            "snr": snr,
+            "lsd": lsd
+        }
+        row["speedup"] = row["fp32_rtf"] / row["int8_rtf"] if row["int8_rtf"] > 0 else 0
+        rows.append(row)
+
+        print(f"  {scene_name:<15} RTF {row['fp32_rtf']:.3f}x -> {row['int8_rtf']:.3f}x "
+              f"({row['speedup']:.2f}x faster)  RMSE {rmse:.4f}  SNR {snr:5.1f} dB  "
+              f"LSD {lsd:5.2f} dB  length {row['length_diff']:+.2f}s")
+
+    summary = {
+        "voice": voice_name,
+        "fp32_mb": model_path.stat().st_size / 1024 / 1024,
+        "int8_mb": int8_path.stat().st_size / 1024 / 1024,
+        "speedup": float(np.mean([r["speedup"] for r in rows])),
+        "snr": float(np.mean([r["snr"] for r in rows])),
+        "lsd": float(np.mean([r["lsd"] for r in rows]))
+    }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quantized Piper voices against fp32")
+    parser.add_argument("--models-dir", type=Path, default=MODELS_DIR)
+    parser.add_argument("--voices", nargs="*", help="Voice names (default: every fp32 voice in models dir)")
+    parser.add_argument("--runs", type=int, default=3, help="Timing runs per scene (best is kept)")
+    args = parser.parse_args()
+
+    voices = args.voices or sorted(
+        m.stem for m in args.models_dir.glob("*.onnx") if not m.name.endswith(".int8.onnx")
+    )
+
+    print(f"{'='*60}")
+    print("QUANTIZED VOICE BENCHMARK (fp32 vs int8)")
+    print(f"{'='*60}\n")
+
+    summaries = []
+    for voice_name in voices:
+        print(f"\nVoice: {voice_name}")
+        summary = benchmark_voice(voice_name, args.models_dir, args.runs)
+        if summary:
+            summaries.append(summary)
+
+    if not summaries:
+        print("\n[WARN] No voices benchmarked - run download_models.py first")
+        return
+
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}\n")
+    print(f"{'Voice':<25} {'Size MB':>15} {'Speedup':>8} {'SNR dB':>7} {'LSD dB':>7}")
+    for s in summaries:
+        print(f"{s['voice']:<25} {s['fp32_mb']:6.1f} -> {s['int8_mb']:5.1f} "
+              f"{s['speedup']:7.2f}x {s['snr']:7.1f} {s['lsd']:7.2f}")
+
+    print("\nRule of thumb: SNR above ~20 dB and LSD below ~1.5 dB are hard to hear;")
+    print("listen to the long_form scene before using a variant for anything but drafts.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Test splitting packed Higgs audio on the pauses between scenes
+
+Run: python -m pytest -q engines/tts/test_higgs_packing.py
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory (providers) and repo root (engines.asset_store) to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+pytest.importorskip("requests")  # The Higgs client's HTTP dependency
+
+from providers.colab_higgs import _find_split_points
+
+
+RATE = 24000
+
+
+def tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (0.5 * np.sin(2 * np.pi * 220 * t) * 32767).astype(np.int16)
+
+
+def pause(seconds: float) -> np.ndarray:
+    return np.zeros(int(RATE * seconds), dtype=np.int16)
+
+
+def track(*parts) -> np.ndarray:
+    return np.concatenate(parts)
+
+
+def test_cuts_land_in_the_pauses_between_segments():
+    samples = track(tone(1.0), pause(0.4), tone(2.0), pause(0.4), tone(1.0))
+    cuts = _find_split_points(samples, RATE, [10, 20, 10])
+
+    assert len(cuts) == 2
+    assert RATE * 1.0 <= cuts[0] <= RATE * 1.4
+    assert RATE * 3.4 <= cuts[1] <= RATE * 3.8
+
+
+def test_pause_nearest_the_expected_boundary_wins():
+    # A breath early in the first segment, and the real boundary halfway through
+    samples = track(tone(0.5), pause(0.3), tone(1.5), pause(0.3), tone(2.0))
+    cuts = _find_split_points(samples, RATE, [1, 1])
+
+    assert RATE * 2.3 <= cuts[0] <= RATE * 2.6
+
+
+def test_short_gaps_are_not_pauses():
+    samples = track(tone(1.0), pause(0.05), tone(1.0))
+    with pytest.raises(ValueError):
+        _find_split_points(samples, RATE, [1, 1])
+
+
+def test_too_few_pauses_raise():
+    samples = track(tone(1.0), pause(0.4), tone(1.0))
+    with pytest.raises(ValueError):
+        _find_split_points(samples, RATE, [1, 1, 1])
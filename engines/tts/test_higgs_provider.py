@@ -17,8 +17,9 @@ Expected Results:
 import sys
 from pathlib import Path
 
-# Add parent directory to path for imports
+# Add parent directory (providers) and repo root (engines.asset_store) to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from providers.colab_higgs import HiggsAudioProvider
 from providers.base import AudioGenerationRequest
@@ -174,7 +175,7 @@ def test_higgs_provider():
     print(f"   - Caching system: OK")
     print(f"   - Quality: 92/100 (meets 90+ requirement)")
     print(f"\n🎯 Next Steps:")
-    print(f"   1. Listen to generated audio files in cache/higgs/")
+    print(f"   1. Listen to generated audio files in cache/tts/higgs/")
     print(f"   2. Verify voice quality matches your requirements")
     print(f"   3. Test with longer documentary scenes")
     print(f"   4. Integrate with HybridTTSDirector")
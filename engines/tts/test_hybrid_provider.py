@@ -0,0 +1,128 @@
+"""
+Test HybridProvider tier routing and fallback
+
+Run: python -m pytest -q engines/tts/test_hybrid_provider.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory (providers) and repo root (engines.asset_store) to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from providers.base import AudioProvider, AudioGenerationRequest, AudioGenerationResult, AudioGenerationError
+from providers.hybrid import HybridProvider
+
+
+class FakeTier(AudioProvider):
+    """Answers instantly with a fixed quality; speed comes from the configured RTF"""
+
+    def __init__(self, name: str, tmp_path: Path, quality: float, rtf: float, fails: bool = False):
+        super().__init__({"asset_root": tmp_path, "asset_index": False, "asset_namespace": f"tts/{name}",
+                          "rtf": rtf})
+        self.name = name
+        self.nominal_quality = quality
+        self.fails = fails
+        self.available = True
+        self.cached = set()
+        self.calls = 0
+
+    def generate(self, request: AudioGenerationRequest) -> AudioGenerationResult:
+        self.calls += 1
+        if self.fails:
+            raise AudioGenerationError(f"{self.name} is down")
+        return AudioGenerationResult(
+            audio_path=Path(f"{self.name}.wav"),
+            duration_seconds=1.0,
+            sample_rate=24000,
+            was_cached=False,
+            generation_time_seconds=0.0,
+            quality_score=self.nominal_quality,
+            provider_name=self.name
+        )
+
+    def is_available(self) -> bool:
+        return self.available
+
+    def is_cached(self, request: AudioGenerationRequest) -> bool:
+        return request.text in self.cached
+
+    def warmup(self) -> None:
+        pass
+
+
+REQUEST = AudioGenerationRequest(text="The investigation began on a cold November morning.", voice_id="narrator")
+
+
+@pytest.fixture
+def tiers(tmp_path):
+    return {
+        "piper": FakeTier("piper", tmp_path, quality=0.72, rtf=0.05),
+        "higgs": FakeTier("higgs", tmp_path, quality=0.92, rtf=0.8),
+    }
+
+
+@pytest.fixture
+def make_hybrid(tiers, tmp_path):
+    def make(**config):
+        return HybridProvider({"tiers": tiers, "asset_root": tmp_path, "asset_index": False, **config})
+    return make
+
+
+def test_fastest_tier_wins_without_a_quality_floor(make_hybrid):
+    provider = make_hybrid()
+    assert provider.route(REQUEST) == ["piper", "higgs"]
+
+
+def test_quality_floor_puts_slower_tiers_first(make_hybrid):
+    provider = make_hybrid(quality_floor=0.9)
+    assert provider.route(REQUEST) == ["higgs", "piper"]  # Piper stays as the fallback
+
+
+def test_cache_hit_wins_over_faster_tier(tiers, make_hybrid):
+    tiers["higgs"].cached.add(REQUEST.text)
+    provider = make_hybrid()
+    assert provider.route(REQUEST)[0] == "higgs"
+
+
+def test_queue_depth_counts_against_a_tier(tiers, make_hybrid):
+    tiers["piper"].observed_rtf = 0.5
+    provider = make_hybrid()
+    assert provider.route(REQUEST)[0] == "piper"
+
+    provider.tiers["piper"].in_flight = 2  # Third in line: 3 x 0.5 > 0.8
+    assert provider.route(REQUEST)[0] == "higgs"
+
+
+def test_unavailable_tiers_are_skipped(tiers, make_hybrid):
+    tiers["piper"].available = False
+    provider = make_hybrid()
+    assert provider.route(REQUEST) == ["higgs"]
+
+
+def test_failed_tier_falls_back_and_is_marked_down(tiers, make_hybrid):
+    tiers["higgs"].fails = True
+    provider = make_hybrid(quality_floor=0.9)
+
+    result = provider.generate(REQUEST)
+    assert result.provider_name == "piper"
+    assert provider.tiers["higgs"].available is False
+    assert provider.route(REQUEST) == ["piper"]  # Until the availability TTL expires
+
+
+def test_every_tier_failing_raises(tiers, make_hybrid):
+    for tier in tiers.values():
+        tier.fails = True
+    provider = make_hybrid()
+    with pytest.raises(AudioGenerationError):
+        provider.generate(REQUEST)
+
+
+def test_generate_on_tracks_reported_quality(make_hybrid):
+    provider = make_hybrid()
+    provider.generate_on("piper", REQUEST)
+    assert provider.tiers["piper"].quality == 0.72
+    assert provider.tiers["piper"].in_flight == 0
@@ -12,8 +12,9 @@ Tests:
 import sys
 from pathlib import Path
 
-# Add parent directory to path for imports
+# Add parent directory (providers) and repo root (engines.asset_store) to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from providers.local_piper import PiperProvider
 from providers.base import AudioGenerationRequest
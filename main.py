@@ -13,20 +13,37 @@ Architecture:
 import json
 import time
 import logging
+import signal
+import threading
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-from datetime import datetime
+from typing import Any, Dict, Optional, Set
+from datetime import datetime, timedelta
 
 from manifest_types import (
     RenderManifest,
     RenderStatus,
     RenderJobStatus,
     ExportArtifact,
+    EngineConfiguration,
     Scene,
     VisualBeat,
     MediaType,
     parse_manifest
 )
+from engines import asset_store, registry
+from engines.asset_index import SCENE_ASSET
+from engines.cache_eviction import CacheEvictor, parse_size
+from engines.run_metrics import RunMetrics
+from engines.image.providers.base import ImageGenerationRequest
+from engines.music.providers.base import MusicGenerationRequest
+from engines.sfx.providers.base import SFXGenerationRequest
+from engines.tts.providers.base import AudioGenerationRequest, SpeechTimings
+from cache_plan import CachePlan, EnginePlan, plan_tts, untracked
+from director_metrics import DirectorMetrics
+from run_profiler import PROFILE_MODES, PhaseProfiler
+from tts_planner import TTSTierPlanner, scene_priorities
 
 # Set up logging
 logging.basicConfig(
@@ -35,6 +52,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Engine kind -> EngineConfiguration field selecting its engine ID
+ENGINE_ID_FIELDS = {
+    "tts": "activeTTSEngineId",
+    "image": "activeImageEngineId",
+    "music": "activeAudioEngineId",
+    "video": "activeVideoEngineId",
+}
+
+# Eviction pin owner of the manifest waiting behind the one rendering
+QUEUED_PIN = "queued"
+
+# Rough cost of the phases after TTS (image, SFX, music, assembly) per visual
+# beat; deadline plans keep this much time free once narration is done
+POST_TTS_SECONDS_PER_BEAT = 45
+
 
 class ProductionDirector:
     """
@@ -48,8 +80,39 @@ class ProductionDirector:
     - Handle errors gracefully
     """
 
-    def __init__(self):
-        """Initialize Director and locate engines."""
+    def __init__(
+        self,
+        deadline: Optional[datetime] = None,
+        progressive: bool = False,
+        config_path: Optional[Path] = None,
+        metrics_port: Optional[int] = None,
+        metrics_textfile: Optional[Path] = None,
+        profile: Optional[str] = None
+    ):
+        """
+        Initialize Director and locate engines.
+
+        Args:
+            deadline: Optional wall-clock time by which renders must finish.
+                When set, TTS scenes are planned across tiers to meet it.
+            progressive: Narrate every scene on the fast tier first, then
+                upgrade scenes to the quality tier in the background.
+            config_path: Optional JSON file of local engine settings (same
+                fields as EngineConfiguration), layered over each manifest's
+                engineConfig and reloaded when it changes or on SIGHUP.
+                An "assetCache" section sets asset store byte budgets and
+                the farm-wide shared tier (a network directory or cache URL):
+                {"root": "cache", "maxBytes": "200GB", "policy": "lru",
+                 "budgets": {"tts/higgs": "20GB", "image": "100GB"},
+                 "retentionSeconds": {"superseded": 0, "draft": 604800},
+                 "shared": "http://cache-host:8765"}
+            metrics_port: Serve Prometheus metrics on this port (/metrics)
+            metrics_textfile: Write Prometheus metrics to this .prom file
+                after every phase, for node_exporter's textfile collector
+            profile: Profile every phase of each render: "cpu" (cProfile),
+                "mem" (tracemalloc) or "both"; reports go to
+                output/profiles/<projectId>_<timestamp>/
+        """
         self.root = Path(__file__).parent
         self.manifest_path = self.root / ".ai_collaboration" / "gemini_to_claude" / "render_manifest.json"
         self.status_path = self.root / ".ai_collaboration" / "claude_to_gemini" / "RENDER_STATUS.json"
@@ -58,42 +121,473 @@ class ProductionDirector:
 
         # Current project state
         self.current_manifest: Optional[RenderManifest] = None
+        self._manifest_mtime: Optional[float] = None  # Of the manifest file current_manifest was read from
+        self._queued_mtime: Optional[float] = None    # Of the manifest file pinned as queued
         self.current_status: Optional[RenderStatus] = None
-
-        # Engine placeholders (will be initialized when engines are ready)
-        self.tts_engine = None
-        self.image_engine = None
-        self.music_engine = None
-        self.sfx_engine = None
-        self.video_engine = None
+        self.deadline = deadline
+        self.progressive = progressive
+
+        # Progressive mode: background quality upgrades of draft narration
+        self._upgrade_thread: Optional[threading.Thread] = None
+        self._upgrade_cancel = threading.Event()
+        self._upgrade_lock = threading.Lock()
+        self._assembled_jobs: set = set()
+        self._status_lock = threading.Lock()
+
+        # Engines warm up in the background; get_engine() waits only for the one it needs
+        self._engine_executor = ThreadPoolExecutor(max_workers=len(ENGINE_ID_FIELDS), thread_name_prefix="warmup")
+        self._engine_futures: Dict[str, Future] = {}
+        self._engine_keys: Dict[str, str] = {}
+        self._engine_lock = threading.Lock()
+
+        # Local engine config (hot-reloadable)
+        self.config_path = Path(config_path) if config_path else None
+        self._config: Dict[str, Any] = {}
+        self._config_mtime: Optional[float] = None
+        self._reload_requested = threading.Event()
+
+        # Asset store eviction (only when the local config sets budgets)
+        self.evictor: Optional[CacheEvictor] = None
+
+        # Cache hits, bytes and generation latency of the current (or last) run
+        self.run_metrics: Optional[RunMetrics] = None
+
+        # Prometheus metrics across all runs (only when exposed)
+        self.metrics: Optional[DirectorMetrics] = None
+        self.metrics_textfile = Path(metrics_textfile) if metrics_textfile else None
+        if metrics_port is not None or self.metrics_textfile:
+            self.start_metrics(metrics_port)
+
+        # Per-phase profiling of each render (--profile)
+        self.profile = profile
+        self.profiler: Optional[PhaseProfiler] = None
+
+        if self.config_path:
+            self.load_config()
 
         logger.info("ProductionDirector initialized")
         logger.info(f"Watching: {self.manifest_path}")
         logger.info(f"Status output: {self.status_path}")
 
-    def load_engines(self):
+    def load_engines(self, engine_config: Optional[EngineConfiguration] = None):
         """
-        Load production engines.
+        Start loading the production engines selected by an EngineConfiguration.
+
+        Every engine is created and warmed up concurrently in the background;
+        this returns immediately. Engines whose ID and settings are unchanged
+        since the last call are kept as they are.
 
-        NOTE: For now, this is a placeholder. Engines will be imported and
-        initialized here once the implementations are ready.
+        Args:
+            engine_config: Engine selection (default: EngineConfiguration defaults)
         """
+        engine_config = engine_config or EngineConfiguration()
         logger.info("Loading production engines...")
 
-        # TODO: Import and initialize engines
-        # from engines.tts.providers.colab_higgs import HiggsAudioProvider
-        # from engines.image.providers.local_sdxl import SDXLProvider
-        # from engines.music.providers.local_musicgen import MusicGenProvider
-        # from engines.sfx.providers.local_audioldm import AudioLDMProvider
-        # from engines.video.providers.ffmpeg_gpu import FFmpegGPUProvider
+        for kind in ENGINE_ID_FIELDS:
+            self._ensure_engine(kind, *self.engine_settings(engine_config, kind))
+
+    def engine_settings(self, engine_config: EngineConfiguration, kind: str):
+        """(engine ID, provider settings) an EngineConfiguration selects for an engine kind."""
+        engine_id = getattr(engine_config, ENGINE_ID_FIELDS[kind])
+        settings = dict(engine_config.engineSettings.get(engine_id, {}))
+        if engine_config.colabUrl:
+            settings.setdefault("colab_url", engine_config.colabUrl)
+        return engine_id, {**self.asset_settings(), **settings}
+
+    def asset_settings(self) -> Dict[str, Any]:
+        """Asset store settings every engine gets from the local config's assetCache section."""
+        cache = self._config.get("assetCache") or {}
+        settings = {}
+        if cache.get("root"):
+            settings["asset_root"] = cache["root"]
+        if cache.get("shared"):
+            settings["shared_cache"] = cache["shared"]
+        if cache.get("sharedLeaseSeconds"):
+            settings["shared_cache_lease"] = cache["sharedLeaseSeconds"]
+        return settings
+
+    def load_config(self) -> bool:
+        """
+        (Re)read the local engine config file.
+
+        A missing or invalid file keeps the previous config.
+
+        Returns:
+            True if the config changed
+        """
+        try:
+            mtime = self.config_path.stat().st_mtime
+            config = json.loads(self.config_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read engine config {self.config_path}: {e}")
+            return False
+
+        self._config_mtime = mtime
+        if config == self._config:
+            return False
+        self._config = config
+        logger.info(f"Engine config loaded from {self.config_path}")
+        self.configure_cache()
+        return True
+
+    def configure_cache(self):
+        """Start (or re-budget) asset store eviction from the config's assetCache section."""
+        cache = self._config.get("assetCache")
+        if not cache:
+            if self.evictor:
+                self.evictor.configure()  # No budgets: stop evicting
+            return
+
+        try:
+            max_bytes = parse_size(cache["maxBytes"]) if cache.get("maxBytes") is not None else None
+            budgets = {prefix: parse_size(size) for prefix, size in cache.get("budgets", {}).items()}
+            policy = cache.get("policy", "lru")
+
+            if self.evictor is None:
+                self.evictor = CacheEvictor(
+                    Path(cache.get("root", asset_store.DEFAULT_ROOT)),
+                    max_bytes=max_bytes,
+                    budgets=budgets,
+                    policy=policy,
+                    min_age=cache.get("minAgeSeconds", 300.0),
+                    retention=cache.get("retentionSeconds")
+                )
+                self.evictor.start()
+            else:
+                self.evictor.configure(max_bytes, budgets, policy, cache.get("retentionSeconds"))
+        except ValueError as e:
+            logger.error(f"Invalid assetCache config, eviction unchanged: {e}")
+            return
+
+        limits = [f"{prefix} {size / 1024 ** 3:.1f} GB" for prefix, size in budgets.items()]
+        if max_bytes is not None:
+            limits.insert(0, f"total {max_bytes / 1024 ** 3:.1f} GB")
+        logger.info(f"Asset cache budgets ({policy}): {', '.join(limits) or 'none'}")
+
+    def pin_manifest_assets(self, manifest: RenderManifest, wait: bool = False):
+        """
+        Protect the cached assets a manifest uses from eviction while it renders.
+
+        Without wait, narration is pinned only under the keys of a TTS engine
+        that has finished warming up; the TTS phase pins again with wait=True.
+        """
+        if self.evictor is None:
+            return
+        self.evictor.pin(manifest.projectId, self.manifest_asset_keys(manifest, wait))
+        self.pin_queued_manifest()
+
+    def pin_queued_manifest(self):
+        """
+        Protect the assets of a manifest written while another one renders.
+
+        The watcher executes it next; until then its assets are pinned
+        under QUEUED_PIN (replaced whenever a newer one is written).
+        """
+        if self.evictor is None or self._manifest_mtime is None:
+            return
+        try:
+            modified = self.manifest_path.stat().st_mtime
+        except OSError:
+            return
+        if modified <= self._manifest_mtime:
+            if self._queued_mtime is not None:
+                # The queued manifest is the one rendering now (pinned under its project)
+                self.evictor.unpin(QUEUED_PIN)
+                self._queued_mtime = None
+            return
+        if modified == self._queued_mtime:
+            return
+
+        self._queued_mtime = modified
+        try:
+            queued = parse_manifest(json.loads(self.manifest_path.read_text(encoding="utf-8")))
+        except Exception as e:
+            logger.warning(f"  Queued manifest not pinned, could not be parsed: {e}")
+            return
+        logger.info(f"  Pinning assets of queued manifest: {queued.projectTitle} ({queued.projectId})")
+        self.evictor.pin(QUEUED_PIN, self.manifest_asset_keys(queued))
+
+    def manifest_asset_keys(self, manifest: RenderManifest, wait: bool = False) -> Set[str]:
+        """
+        Cache keys of every asset a manifest's render builds.
+
+        Narration under the key each TTS tier stores it as (and the plain
+        request key, for engines a queued manifest may select instead),
+        plus images, background music and sound effects. The tier keys are
+        left out while the TTS engine warms up, unless wait is set.
+        """
+        keys = set()
+        providers = self._tts_providers(wait)
+        for scene in manifest.scenes:
+            request = self.build_tts_request(manifest, scene)
+            keys.add(request.to_cache_key())
+            keys.update(provider.asset_key(request)[0] for provider in providers)
+
+            for beat in scene.visualBeats:
+                if beat.mediaType == MediaType.IMAGE and beat.productionPrompt:
+                    keys.add(self.build_image_request(manifest, beat).to_cache_key())
+            if scene.soundEffectDescription:
+                keys.add(self.build_sfx_request(scene).to_cache_key())
+
+        if manifest.audioMood and not manifest.globalSettings.backgroundAudioUrl:
+            keys.add(self.build_music_request(manifest).to_cache_key())
+        return keys
+
+    def plan_manifest(self, manifest: RenderManifest) -> CachePlan:
+        """
+        Check how much of a manifest is already cached, without rendering it.
+
+        Engines are created but not warmed up (no models loaded, no
+        workers contacted), and the check counts no cache hits or misses.
+        """
+        engine_config = self.effective_engine_config(manifest.engineConfig)
+        plan = CachePlan(project_id=manifest.projectId, project_title=manifest.projectTitle)
+
+        engine_id, settings = self.engine_settings(engine_config, "tts")
+        try:
+            engine = self._create_engine("tts", engine_id, settings)
+        except Exception as e:
+            logger.error(f"  tts: '{engine_id}' could not be created, not planned: {e}")
+            engine = None
+
+        requests = [self.build_tts_request(manifest, scene) for scene in manifest.scenes]
+        if engine is not None:
+            plan.engines.extend(plan_tts(engine, engine_id, requests))
+        else:
+            plan.engines.append(EnginePlan(kind="tts", engine_id=engine_id, namespace=None,
+                                           requests=len(requests), counted=False))
+
+        plan.engines.extend(untracked(manifest, engine_config))
+        return plan
+
+    def record_manifest_references(self, manifest: RenderManifest):
+        """
+        Record which scene of which manifest revision uses each cached asset.
+
+        Superseded revisions and the posted exports drive eviction order
+        (see asset_index retention states).
+        """
+        posted = [job for job in manifest.exportJobs if job.status == "posted"]
+        refs = {}
+        for idx, scene in enumerate(manifest.scenes):
+            live = any(job.startSceneIndex <= idx <= job.endSceneIndex for job in posted)
+            request = self.build_tts_request(manifest, scene)
+            for provider in self._tts_providers():
+                if provider.assets.index is not None:
+                    refs.setdefault(provider.assets.index, []).append(
+                        (provider.assets.namespace, provider.asset_key(request)[0], scene.sceneNumber, SCENE_ASSET, live)
+                    )
+
+        for index, index_refs in refs.items():
+            index.set_references(manifest.projectId, manifest.generatedAt, index_refs)
+
+    def drop_decoded_audio(self, manifest: RenderManifest):
+        """
+        Delete the decoded WAV copies of a manifest's narration that is stored compressed.
+
+        Never waits for the TTS engine: one still warming up decoded nothing.
+        """
+        dropped = 0
+        for scene in manifest.scenes:
+            request = self.build_tts_request(manifest, scene)
+            for provider in self._tts_providers(wait=False):
+                try:
+                    dropped += provider.assets.drop_decoded(*provider.asset_key(request))
+                except OSError as e:
+                    logger.warning(f"  Could not drop decoded narration of scene {scene.sceneNumber}: {e}")
+        if dropped:
+            logger.info(f"  Dropped {dropped} decoded narration files (kept compressed)")
+
+    def _tts_providers(self, wait: bool = True) -> list:
+        """
+        The TTS providers that store narration (every tier of a tiered engine)
+
+        Without wait, none until the TTS engine has finished warming up.
+        """
+        engine = self.tts_engine if wait else self._loaded_engine("tts")
+        if engine is None:
+            return []
+        return [tier.provider for tier in engine.tiers.values()] if hasattr(engine, "tiers") else [engine]
+
+    def start_metrics(self, port: Optional[int] = None):
+        """Start collecting Prometheus metrics, served on port if given"""
+        self.metrics = DirectorMetrics()
+        asset_store.add_observer(self.metrics)
+        self.metrics.add_gauge("director_generations_in_flight", "Narration requests queued or running",
+                               (), lambda: {(): sum(self._tts_queue_depths().values())})
+        self.metrics.add_gauge("director_tts_queue_depth", "Requests queued or running per TTS tier",
+                               ("tier",), self._tts_queue_depths)
+        if port is not None:
+            self.metrics.serve(port)
+            logger.info(f"Metrics: http://0.0.0.0:{port}/metrics")
+        self.write_metrics()
+
+    def write_metrics(self):
+        """Refresh the metrics textfile (if configured)"""
+        if self.metrics is None or self.metrics_textfile is None:
+            return
+        try:
+            self.metrics.write_textfile(self.metrics_textfile)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.metrics_textfile}: {e}")
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a pipeline phase into the metrics (and profile it with --profile)"""
+        self.pin_queued_manifest()
+        start = time.time()
+        try:
+            with self.profiler.phase(name) if self.profiler else nullcontext():
+                yield
+        finally:
+            if self.metrics:
+                self.metrics.record_phase(name, time.time() - start)
+                self.write_metrics()
+
+    def _tts_queue_depths(self) -> Dict[tuple, float]:
+        """
+        In-flight requests per TTS tier (never waits for warm-up)
+
+        A tiered engine counts what it dispatched to each tier; a single
+        engine with a worker pool (Higgs) counts what its workers are running.
+        """
+        engine = self._loaded_engine("tts")
+        if engine is None:
+            return {}
+        if hasattr(engine, "tiers"):
+            return {(name,): tier.in_flight for name, tier in engine.tiers.items()}
+        if hasattr(engine, "pool"):
+            return {(engine.assets.namespace.split("/")[-1],): sum(w.in_flight for w in engine.pool.snapshot())}
+        return {}
+
+    def request_reload(self):
+        """Ask the watcher to reload the engine config (safe to call from a signal handler)."""
+        self._reload_requested.set()
+
+    def check_config_reload(self):
+        """Reload the engine config if requested or modified; rebuild only the engines that changed."""
+        if not self.config_path:
+            return
+
+        requested = self._reload_requested.is_set()
+        try:
+            modified = self.config_path.stat().st_mtime != self._config_mtime
+        except OSError:
+            modified = False
+        if not (requested or modified):
+            return
+
+        self._reload_requested.clear()
+        if self.load_config():
+            manifest_config = self.current_manifest.engineConfig if self.current_manifest else None
+            self.load_engines(self.effective_engine_config(manifest_config))
+
+    def effective_engine_config(self, manifest_config: Optional[EngineConfiguration]) -> EngineConfiguration:
+        """
+        Layer the local engine config over a manifest's engineConfig.
+
+        The manifest picks the engines; the local config wins for settings
+        that are properties of this machine (worker URLs, threads, paths).
+        Engine IDs from the local config only apply when the manifest has
+        no engineConfig.
+        """
+        config = dict(self._config)
+        local_settings = config.pop("engineSettings", {})
+
+        if manifest_config is None:
+            fields = {k: v for k, v in config.items() if k in EngineConfiguration.__dataclass_fields__}
+            base = EngineConfiguration(**fields)
+        else:
+            base = EngineConfiguration(**vars(manifest_config))
+            if config.get("colabUrl"):
+                base.colabUrl = config["colabUrl"]
+
+        settings = {engine_id: dict(values) for engine_id, values in base.engineSettings.items()}
+        for engine_id, values in local_settings.items():
+            settings[engine_id] = {**settings.get(engine_id, {}), **values}
+        base.engineSettings = settings
+        return base
 
-        # self.tts_engine = HiggsAudioProvider(config)
-        # self.image_engine = SDXLProvider(config)
-        # self.music_engine = MusicGenProvider(config)
-        # self.sfx_engine = AudioLDMProvider(config)
-        # self.video_engine = FFmpegGPUProvider(config)
+    def get_engine(self, kind: str):
+        """
+        Engine of the given kind, waiting for its warm-up if still running.
+
+        Returns:
+            The warmed-up provider, or None if the kind isn't configured,
+            isn't implemented yet, or failed to start
+        """
+        with self._engine_lock:
+            future = self._engine_futures.get(kind)
+        return future.result() if future is not None else None
+
+    def _loaded_engine(self, kind: str):
+        """Engine of the given kind if its warm-up has finished (never waits)"""
+        with self._engine_lock:
+            future = self._engine_futures.get(kind)
+        return future.result() if future is not None and future.done() else None
+
+    @property
+    def tts_engine(self):
+        return self.get_engine("tts")
+
+    @property
+    def image_engine(self):
+        return self.get_engine("image")
+
+    @property
+    def music_engine(self):
+        return self.get_engine("music")
+
+    @property
+    def video_engine(self):
+        return self.get_engine("video")
+
+    def _ensure_engine(self, kind: str, engine_id: str, settings: Dict[str, Any]):
+        """Start (re)building an engine unless the same one is already loaded or loading."""
+        key = json.dumps({"id": engine_id, "settings": settings}, sort_keys=True, default=str)
+        with self._engine_lock:
+            if self._engine_keys.get(kind) == key:
+                return
+            if kind in self._engine_keys:
+                logger.info(f"  {kind}: settings changed, rebuilding '{engine_id}'")
+            superseded = self._engine_futures.get(kind)
+            self._engine_keys[kind] = key
+            self._engine_futures[kind] = self._engine_executor.submit(
+                self._build_engine, kind, engine_id, settings
+            )
 
-        logger.info("Engines loaded (placeholder - will be implemented)")
+        if superseded is not None:
+            # Its executors, worker threads and connections outlive it otherwise
+            superseded.add_done_callback(lambda future: self._close_engine(kind, future.result()))
+
+    def _close_engine(self, kind: str, engine):
+        """Release a replaced engine (once its warm-up, if still running, has finished)."""
+        if engine is None or not hasattr(engine, "close"):
+            return
+        try:
+            engine.close()
+        except Exception as e:
+            logger.warning(f"  {kind}: failed to close replaced engine: {e}")
+
+    def _build_engine(self, kind: str, engine_id: str, settings: Dict[str, Any]):
+        """Create and warm up one engine (runs on the warm-up pool)."""
+        start = time.time()
+        try:
+            engine = self._create_engine(kind, engine_id, settings)
+            if engine is None:
+                logger.info(f"  {kind}: '{engine_id}' not implemented yet, using placeholder")
+                return None
+            engine.warmup()
+        except Exception as e:
+            logger.error(f"  {kind}: '{engine_id}' failed to start, using placeholder: {e}")
+            return None
+
+        logger.info(f"  {kind}: '{engine_id}' ready in {time.time() - start:.1f}s")
+        return engine
+
+    def _create_engine(self, kind: str, engine_id: str, settings: Dict[str, Any]):
+        """Instantiate the provider for an engine ID (None if there is none yet)."""
+        return registry.create(kind, engine_id, settings)
 
     def watch_for_manifest(self, poll_interval: float = 2.0):
         """
@@ -108,6 +602,8 @@ class ProductionDirector:
 
         while True:
             try:
+                self.check_config_reload()
+
                 if self.manifest_path.exists():
                     current_modified = self.manifest_path.stat().st_mtime
 
@@ -140,6 +636,7 @@ class ProductionDirector:
         try:
             logger.info(f"Loading manifest from {self.manifest_path}")
 
+            modified = self.manifest_path.stat().st_mtime
             with open(self.manifest_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
 
@@ -149,10 +646,14 @@ class ProductionDirector:
             logger.info(f"  Export jobs: {len(manifest.exportJobs)}")
 
             self.current_manifest = manifest
+            self._manifest_mtime = modified
             return manifest
 
         except Exception as e:
             logger.error(f"Failed to load manifest: {e}", exc_info=True)
+            if self.metrics:
+                self.metrics.record_manifest("invalid")
+                self.write_metrics()
             self.update_status(
                 project_id="unknown",
                 status="FAILED",
@@ -181,6 +682,18 @@ class ProductionDirector:
         logger.info(f"Starting production for: {manifest.projectTitle}")
         start_time = time.time()
 
+        # Warm-up runs in the background; each phase waits only for its own engine
+        self.load_engines(self.effective_engine_config(manifest.engineConfig))
+        self.pin_manifest_assets(manifest)
+        asset_store.set_project(manifest.projectId)
+        self.run_metrics = RunMetrics()
+        asset_store.add_observer(self.run_metrics)
+        outcome = "failed"
+
+        if self.profile:
+            profile_dir = self.output_dir / "profiles" / f"{manifest.projectId}_{datetime.now():%Y%m%d_%H%M%S}"
+            self.profiler = PhaseProfiler(self.profile, profile_dir)
+
         try:
             # Initialize status
             # Calculate rough time estimate based on scene count
@@ -196,20 +709,42 @@ class ProductionDirector:
                 estimated_time_remaining=estimated_time
             )
 
+            with self.phase("setup"):
+                self.record_manifest_references(manifest)
+
             # Phase 1: Generate TTS audio
-            self.phase_generate_tts(manifest)
+            with self.phase("tts"):
+                self.pin_manifest_assets(manifest, wait=True)  # Adds the keys each TTS tier stores under
+                self.phase_generate_tts(manifest)
 
             # Phase 2: Generate visuals
-            self.phase_generate_visuals(manifest)
+            with self.phase("visuals"):
+                self.phase_generate_visuals(manifest)
 
             # Phase 3: Generate background music
-            self.phase_generate_music(manifest)
+            with self.phase("music"):
+                self.phase_generate_music(manifest)
 
             # Phase 4: Generate sound effects
-            self.phase_generate_sfx(manifest)
+            with self.phase("sfx"):
+                self.phase_generate_sfx(manifest)
 
             # Phase 5: Assemble videos
-            self.phase_assemble_videos(manifest)
+            with self.phase("assembly"):
+                self.phase_assemble_videos(manifest)
+
+            # Progressive mode: previews are out, wait for narration upgrades
+            if self._upgrade_thread is not None:
+                self.update_status(
+                    project_id=manifest.projectId,
+                    status="PROCESSING",
+                    progress=0.99,
+                    phase="Preview ready - upgrading narration",
+                    estimated_time_remaining=0
+                )
+                with self.phase("upgrades"):
+                    self._upgrade_thread.join()
+                self._upgrade_thread = None
 
             # Mark complete
             elapsed = time.time() - start_time
@@ -235,6 +770,7 @@ class ProductionDirector:
                 estimated_time_remaining=0,
                 export_jobs=job_statuses
             )
+            outcome = "completed"
 
         except Exception as e:
             logger.error(f"Production failed: {e}", exc_info=True)
@@ -246,12 +782,31 @@ class ProductionDirector:
                 estimated_time_remaining=0,
                 errors=[str(e)]
             )
+        finally:
+            # A failed render must not leave upgrades running against it (or for the next manifest to join)
+            if self._upgrade_thread is not None:
+                self._upgrade_cancel.set()
+                self._upgrade_thread.join()
+                self._upgrade_thread = None
+            # Done with the narration either way: cached audio goes back to being stored compressed only
+            self.drop_decoded_audio(manifest)
+            asset_store.remove_observer(self.run_metrics)
+            asset_store.set_project(None)
+            if self.evictor:
+                self.evictor.unpin(manifest.projectId)
+            logger.info("Run cache statistics:\n" + self.run_metrics.format())
+            if self.metrics:
+                self.metrics.record_manifest(outcome)
+                self.write_metrics()
+            if self.profiler:
+                logger.info(f"Profile ({self.profile}) written to {self.profiler.write_summary().parent}")
+                self.profiler = None
 
     def estimate_time_remaining(self, progress: float, start_time: float, total_scenes: int, total_beats: int) -> int:
         """Estimate remaining time based on current progress."""
         if progress == 0:
             # Initial estimate
-            return (total_scenes * 30) + (total_beats * 45)
+            return (total_scenes * 30) + (total_beats * POST_TTS_SECONDS_PER_BEAT)
 
         elapsed = time.time() - start_time
         if progress > 0:
@@ -260,12 +815,96 @@ class ProductionDirector:
             return max(0, int(remaining))
         return 0
 
+    def post_tts_reserve(self, manifest: RenderManifest) -> float:
+        """Seconds a deadline plan keeps free for the phases after TTS (POST_TTS_SECONDS_PER_BEAT per beat)."""
+        return POST_TTS_SECONDS_PER_BEAT * sum(len(s.visualBeats) for s in manifest.scenes)
+
+    def build_tts_request(self, manifest: RenderManifest, scene: Scene) -> AudioGenerationRequest:
+        """Build the TTS request for a scene from the manifest's engine settings."""
+        settings = {}
+        if manifest.engineConfig:
+            settings = manifest.engineConfig.engineSettings.get(manifest.engineConfig.activeTTSEngineId, {})
+
+        return AudioGenerationRequest(
+            text=scene.narratorScript,
+            voice_id=settings.get("voice_id", "narrator"),
+            language=settings.get("language", "en"),
+            speed=settings.get("speed", 1.0)
+        )
+
+    def build_image_request(self, manifest: RenderManifest, beat: VisualBeat) -> ImageGenerationRequest:
+        """Build the image request for a visual beat."""
+        return ImageGenerationRequest(
+            prompt=beat.productionPrompt,
+            style=manifest.globalSettings.visualStyle
+        )
+
+    def build_music_request(self, manifest: RenderManifest) -> MusicGenerationRequest:
+        """Build the background music request for a manifest."""
+        return MusicGenerationRequest(
+            prompt=f"Documentary background music, {manifest.audioMood}",
+            duration=sum(scene.durationSeconds for scene in manifest.scenes),
+            mood=manifest.audioMood
+        )
+
+    def build_sfx_request(self, scene: Scene) -> SFXGenerationRequest:
+        """Build the sound effect request for a scene."""
+        return SFXGenerationRequest(
+            prompt=scene.soundEffectDescription,
+            duration=5.0  # SFX are typically short
+        )
+
+    def generate_on_tier(self, tier: str, request: AudioGenerationRequest):
+        """
+        Narrate on one TTS tier.
+
+        Repeated scripts (recaps, intros) drafted by the main phase while the
+        upgrade thread works on the same tier wait in the asset store for one
+        generation instead of racing each other (see AssetStore.lookup).
+        """
+        return self.tts_engine.generate_on(tier, request)
+
     def phase_generate_tts(self, manifest: RenderManifest):
-        """Phase 1: Generate TTS audio for all scenes."""
+        """
+        Phase 1: Generate TTS audio for all scenes.
+
+        With a deadline and a tiered TTS engine, scenes are assigned to tiers
+        up front and the plan is refreshed after every scene as real timings
+        replace the estimates. The plan's budget stops short of the deadline
+        by post_tts_reserve(), leaving time for the image, SFX, music and
+        assembly phases.
+        """
         logger.info("PHASE 1: Generating TTS audio...")
         total_scenes = len(manifest.scenes)
         phase_start = time.time()
 
+        requests = {scene.sceneNumber: self.build_tts_request(manifest, scene) for scene in manifest.scenes}
+
+        if self.progressive and self.tts_engine is not None and hasattr(self.tts_engine, "tiers"):
+            self.phase_generate_tts_progressive(manifest, requests)
+            return
+
+        planner = None
+        if self.deadline and self.tts_engine is not None and hasattr(self.tts_engine, "tiers"):
+            planner = TTSTierPlanner(self.tts_engine, reserve_seconds=self.post_tts_reserve(manifest))
+            logger.info(f"  Deadline: {self.deadline.isoformat()} "
+                        f"(fast tier: {planner.fast_tier}, quality tier: {planner.quality_tier}, "
+                        f"{planner.reserve_seconds:.0f}s kept for later phases)")
+
+        batch_results = {}
+        if self.tts_engine is not None and planner is None:
+            # One batch lets providers combine short scenes into fewer requests
+            self.update_status(
+                project_id=manifest.projectId,
+                status="PROCESSING",
+                progress=0.0,
+                phase=f"Generating narration for {total_scenes} scenes",
+                estimated_time_remaining=self.estimate_time_remaining(
+                    0.0, phase_start, total_scenes, sum(len(s.visualBeats) for s in manifest.scenes))
+            )
+            results = self.tts_engine.generate_batch([requests[s.sceneNumber] for s in manifest.scenes])
+            batch_results = {s.sceneNumber: r for s, r in zip(manifest.scenes, results)}
+
         for idx, scene in enumerate(manifest.scenes):
             logger.info(f"  Generating audio for scene {scene.sceneNumber}/{total_scenes}")
             logger.info(f"    Script: {scene.narratorScript[:80]}...")
@@ -275,28 +914,147 @@ class ProductionDirector:
             total_beats = sum(len(s.visualBeats) for s in manifest.scenes)
             estimated_time = self.estimate_time_remaining(progress, phase_start, total_scenes, total_beats)
 
+            tier = None
+            if planner:
+                # Re-plan the remaining scenes with the latest measured timings
+                pending = [s.sceneNumber for s in manifest.scenes[idx:]]
+                plan = planner.plan(manifest, requests, self.deadline.timestamp(), pending=pending)
+                tier = plan.assignments[scene.sceneNumber]
+                if idx == 0 or not plan.fits:
+                    logger.info(f"    Plan: {len(plan.upgraded)}/{len(pending)} scenes on {planner.quality_tier}, "
+                                f"~{plan.estimated_seconds:.0f}s of {plan.budget_seconds:.0f}s budget")
+                if not plan.fits:
+                    logger.warning("    Deadline cannot be met even on the fast tier")
+
             self.update_status(
                 project_id=manifest.projectId,
                 status="PROCESSING",
                 progress=progress,
-                phase=f"Generating scene {scene.sceneNumber}/{total_scenes} audio",
+                phase=f"Generating scene {scene.sceneNumber}/{total_scenes} audio" + (f" ({tier})" if tier else ""),
                 estimated_time_remaining=estimated_time
             )
 
-            # TODO: Generate TTS audio
-            # result = self.tts_engine.generate(AudioGenerationRequest(
-            #     text=scene.narratorScript,
-            #     voice_persona=manifest.voicePersona,
-            #     duration=scene.durationSeconds
-            # ))
-            # scene.audioUrl = str(result.audio_path)
+            if self.tts_engine is None:
+                # Placeholder: Mock audio generation
+                scene.audioUrl = f"output/audio/scene_{scene.sceneNumber:03d}.wav"
+            elif tier:
+                result = self.generate_on_tier(tier, requests[scene.sceneNumber])
+                scene.audioUrl = str(result.audio_path)
+            else:
+                scene.audioUrl = str(batch_results[scene.sceneNumber].audio_path)
 
-            # Placeholder: Mock audio generation
-            scene.audioUrl = f"output/audio/scene_{scene.sceneNumber:03d}.wav"
             logger.info(f"    ✓ Audio: {scene.audioUrl}")
 
         logger.info("PHASE 1 complete: All TTS audio generated")
 
+    def phase_generate_tts_progressive(self, manifest: RenderManifest, requests: Dict[int, AudioGenerationRequest]):
+        """
+        Phase 1 (progressive): fast-tier drafts now, quality upgrades later.
+
+        Every scene is narrated on the fast tier so the rest of the pipeline
+        (and a preview cut) can proceed within seconds. A background thread
+        then re-narrates scenes on the quality tier, most important first,
+        swapping each scene's audio in place as its upgrade lands.
+        """
+        planner = TTSTierPlanner(self.tts_engine, reserve_seconds=self.post_tts_reserve(manifest))
+        total_scenes = len(manifest.scenes)
+        phase_start = time.time()
+        self._assembled_jobs = set()
+
+        logger.info(f"  Progressive mode: drafting on {planner.fast_tier}, upgrading to {planner.quality_tier}")
+
+        for idx, scene in enumerate(manifest.scenes):
+            progress = (idx / total_scenes) * 0.25
+            total_beats = sum(len(s.visualBeats) for s in manifest.scenes)
+            self.update_status(
+                project_id=manifest.projectId,
+                status="PROCESSING",
+                progress=progress,
+                phase=f"Drafting scene {scene.sceneNumber}/{total_scenes} audio ({planner.fast_tier})",
+                estimated_time_remaining=self.estimate_time_remaining(progress, phase_start, total_scenes, total_beats)
+            )
+
+            request = requests[scene.sceneNumber]
+            if self.tts_engine.tiers[planner.quality_tier].provider.is_cached(request):
+                # Final quality is already on disk - no draft needed
+                result = self.generate_on_tier(planner.quality_tier, request)
+            else:
+                result = self.generate_on_tier(planner.fast_tier, request)
+            scene.audioUrl = str(result.audio_path)
+            logger.info(f"    ✓ Draft audio: {scene.audioUrl}")
+
+        logger.info("PHASE 1 complete: Draft audio ready for all scenes")
+
+        if planner.quality_tier == planner.fast_tier or not self.tts_engine.is_tier_available(planner.quality_tier):
+            logger.info("  Quality tier unavailable, keeping drafts")
+            return
+
+        self._upgrade_cancel.clear()
+        self._upgrade_thread = threading.Thread(
+            target=self._run_upgrades,
+            args=(manifest, requests, planner.quality_tier),
+            name="tts-upgrades",
+            daemon=True
+        )
+        self._upgrade_thread.start()
+
+    def _run_upgrades(self, manifest: RenderManifest, requests: Dict[int, AudioGenerationRequest], tier: str):
+        """Background worker: re-narrate scenes on the quality tier, best scenes first."""
+        priorities = scene_priorities(manifest)
+        order = sorted(manifest.scenes, key=lambda s: -priorities.get(s.sceneNumber, 0.0))
+        upgraded = 0
+
+        for scene in order:
+            if self._upgrade_cancel.is_set():
+                logger.info(f"  Upgrades cancelled, {len(order) - upgraded} scenes keep draft audio")
+                break
+            if self.deadline and datetime.now() >= self.deadline:
+                logger.warning(f"  Deadline reached, {len(order) - upgraded} scenes keep draft audio")
+                break
+
+            try:
+                result = self.generate_on_tier(tier, requests[scene.sceneNumber])
+            except Exception as e:
+                logger.error(f"  Upgrade of scene {scene.sceneNumber} failed, keeping draft: {e}")
+                continue
+
+            upgraded += 1
+            if str(result.audio_path) == scene.audioUrl:
+                continue
+
+            if result.timings is None and SpeechTimings.load(result.audio_path) is None:
+                # Only the draft tier reports timings: keep the draft's, stretched to the
+                # new take, next to the upgraded audio so SFX stay on their trigger phrase
+                draft = SpeechTimings.load(Path(scene.audioUrl)) if scene.audioUrl else None
+                if draft is not None:
+                    draft.scaled(result.duration_seconds).save(result.audio_path)
+
+            with self._upgrade_lock:
+                scene.audioUrl = str(result.audio_path)
+            logger.info(f"  ↑ Scene {scene.sceneNumber} upgraded to {tier} ({upgraded}/{len(order)})")
+            self.on_scene_upgraded(manifest, scene)
+
+    def on_scene_upgraded(self, manifest: RenderManifest, scene: Scene):
+        """Refresh every already-assembled export job that contains the scene."""
+        if scene.soundEffectUrl:
+            # New narration, new word timings
+            scene.sfxStartSeconds = self.resolve_sfx_start(scene)
+
+        index = manifest.scenes.index(scene)
+        for job in manifest.exportJobs:
+            if job.id in self._assembled_jobs and job.startSceneIndex <= index <= job.endSceneIndex:
+                logger.info(f"    Refreshing {job.platform} preview with upgraded scene {scene.sceneNumber}")
+                self.assemble_export_job(manifest, job)
+
+        if self.current_status:
+            self.update_status(
+                project_id=manifest.projectId,
+                status=self.current_status.status,
+                progress=self.current_status.progress,
+                phase=f"Upgraded scene {scene.sceneNumber} narration",
+                estimated_time_remaining=self.current_status.estimatedTimeRemaining
+            )
+
     def phase_generate_visuals(self, manifest: RenderManifest):
         """Phase 2: Generate images/videos for all visual beats."""
         logger.info("PHASE 2: Generating visuals...")
@@ -326,11 +1084,8 @@ class ProductionDirector:
 
                 # TODO: Generate image/video based on mediaType
                 # if beat.mediaType == MediaType.IMAGE:
-                #     result = self.image_engine.generate(ImageGenerationRequest(
-                #         prompt=beat.productionPrompt,
-                #         style=manifest.globalSettings.visualStyle,
-                #         aspect_ratio=manifest.globalSettings.aspectRatio
-                #     ))
+                #     request = self.build_image_request(manifest, beat)
+                #     result = self.image_engine.generate(request)
                 #     beat.assetUrl = str(result.image_path)
 
                 # Placeholder: Mock image generation
@@ -367,12 +1122,7 @@ class ProductionDirector:
         logger.info(f"  Mood: {manifest.audioMood}")
 
         # TODO: Generate music
-        # total_duration = sum(scene.durationSeconds for scene in manifest.scenes)
-        # result = self.music_engine.generate(MusicGenerationRequest(
-        #     prompt=f"Documentary background music, {manifest.audioMood}",
-        #     duration=total_duration,
-        #     mood=manifest.audioMood
-        # ))
+        # result = self.music_engine.generate(self.build_music_request(manifest))
         # manifest.globalSettings.backgroundAudioUrl = str(result.audio_path)
 
         # Placeholder: Mock music generation
@@ -410,19 +1160,37 @@ class ProductionDirector:
             )
 
             # TODO: Generate SFX
-            # result = self.sfx_engine.generate(SFXGenerationRequest(
-            #     prompt=scene.soundEffectDescription,
-            #     duration=5.0,  # SFX are typically short
-            #     volume=scene.sfxVolume or 0.6
-            # ))
+            # request = self.build_sfx_request(scene)
+            # result = self.sfx_engine.generate(request)
             # scene.soundEffectUrl = str(result.audio_path)
 
             # Placeholder: Mock SFX generation
             scene.soundEffectUrl = f"output/sfx/scene_{scene.sceneNumber:03d}_sfx.wav"
-            logger.info(f"    ✓ SFX: {scene.soundEffectUrl}")
+            scene.sfxStartSeconds = self.resolve_sfx_start(scene)
+            logger.info(f"    ✓ SFX: {scene.soundEffectUrl} at {scene.sfxStartSeconds:.2f}s")
 
         logger.info("PHASE 4 complete: All SFX generated")
 
+    def resolve_sfx_start(self, scene: Scene) -> float:
+        """
+        When a scene's sound effect should start, relative to the scene.
+
+        Uses the word timings stored next to the narration audio to find
+        sfxTriggerPhrase, then adds sfxDelay. Without timings (or if the
+        phrase isn't spoken) the effect starts at sfxDelay.
+        """
+        delay = scene.sfxDelay or 0.0
+        if not scene.sfxTriggerPhrase or not scene.audioUrl:
+            return delay
+
+        timings = SpeechTimings.load(Path(scene.audioUrl))
+        span = timings.find_phrase(scene.sfxTriggerPhrase) if timings else None
+        if span is None:
+            logger.warning(f"    Trigger phrase not located in narration: \"{scene.sfxTriggerPhrase}\"")
+            return delay
+
+        return span.start + delay
+
     def phase_assemble_videos(self, manifest: RenderManifest):
         """Phase 5: Assemble final videos for each export job."""
         logger.info("PHASE 5: Assembling videos...")
@@ -447,6 +1215,13 @@ class ProductionDirector:
                 estimated_time_remaining=estimated_time
             )
 
+            self.assemble_export_job(manifest, job)
+
+        logger.info("PHASE 5 complete: All videos assembled")
+
+    def assemble_export_job(self, manifest: RenderManifest, job: ExportArtifact):
+        """Assemble one export job from the scenes' current assets."""
+        with self._upgrade_lock:
             # TODO: Assemble video
             # scenes_slice = manifest.scenes[job.startSceneIndex:job.endSceneIndex + 1]
             # result = self.video_engine.assemble(VideoAssemblyRequest(
@@ -465,8 +1240,7 @@ class ProductionDirector:
             job.downloadUrl = f"output/videos/{filename}"
             job.status = "completed"
             logger.info(f"    ✓ Video: {job.downloadUrl}")
-
-        logger.info("PHASE 5 complete: All videos assembled")
+            self._assembled_jobs.add(job.id)
 
     def update_status(
         self,
@@ -497,7 +1271,8 @@ class ProductionDirector:
             currentPhase=phase,
             estimatedTimeRemaining=estimated_time_remaining,
             exportJobs=export_jobs or [],
-            errors=errors or []
+            errors=errors or [],
+            metrics=self.run_metrics.snapshot() if self.run_metrics else {}
         )
 
         # Write to file for Gemini to read
@@ -519,11 +1294,14 @@ class ProductionDirector:
                     for job in self.current_status.exportJobs
                 ],
                 "errors": self.current_status.errors,
-                "lastUpdated": self.current_status.lastUpdated
+                "lastUpdated": self.current_status.lastUpdated,
+                "metrics": self.current_status.metrics
             }
 
-            with open(self.status_path, 'w', encoding='utf-8') as f:
-                json.dump(status_data, f, indent=2)
+            # Upgrade thread (progressive mode) may report concurrently
+            with self._status_lock:
+                with open(self.status_path, 'w', encoding='utf-8') as f:
+                    json.dump(status_data, f, indent=2)
 
             logger.debug(f"Status updated: {status} - {phase} ({progress:.1%})")
 
@@ -540,19 +1318,72 @@ class ProductionDirector:
             logger.warning(f"No manifest found at {self.manifest_path}")
 
 
-def main():
-    """Main entry point."""
-    import sys
+def parse_deadline(value: str) -> datetime:
+    """
+    Parse a --deadline value.
+
+    Accepts an ISO timestamp ("2025-11-20T18:00") or a duration from now
+    in minutes or hours ("45m", "2h").
+    """
+    if value[-1:] in ("m", "h") and value[:-1].replace(".", "", 1).isdigit():
+        amount = float(value[:-1])
+        delta = timedelta(minutes=amount) if value.endswith("m") else timedelta(hours=amount)
+        return datetime.now() + delta
+    return datetime.fromisoformat(value)
 
-    director = ProductionDirector()
 
-    if len(sys.argv) > 1 and sys.argv[1] == "--once":
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Production Director")
+    parser.add_argument("--once", action="store_true", help="Execute the current manifest once and exit")
+    parser.add_argument("--deadline", type=parse_deadline,
+                        help="Finish renders by this time (ISO timestamp, or e.g. '45m' / '2h' from now)")
+    parser.add_argument("--progressive", action="store_true",
+                        help="Draft all narration on the fast TTS tier, then upgrade scenes in the background")
+    parser.add_argument("--config", type=Path,
+                        help="Local engine settings (JSON, EngineConfiguration fields); "
+                             "reloaded on change or SIGHUP in watch mode")
+    parser.add_argument("--plan", action="store_true",
+                        help="Report how much of the current manifest is already cached, then exit (renders nothing)")
+    parser.add_argument("--json", action="store_true", help="With --plan: print the report as JSON")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve Prometheus metrics on this port (http://host:PORT/metrics)")
+    parser.add_argument("--metrics-textfile", type=Path,
+                        help="Write Prometheus metrics to this .prom file (node_exporter textfile collector)")
+    parser.add_argument("--profile", choices=PROFILE_MODES,
+                        help="Profile each render phase (cProfile and/or tracemalloc); "
+                             "reports go to output/profiles/")
+    args = parser.parse_args()
+
+    director = ProductionDirector(
+        deadline=args.deadline,
+        progressive=args.progressive,
+        config_path=args.config,
+        metrics_port=args.metrics_port,
+        metrics_textfile=args.metrics_textfile,
+        profile=args.profile
+    )
+
+    if args.plan:
+        if not director.manifest_path.exists():
+            parser.error(f"No manifest found at {director.manifest_path}")
+        manifest = parse_manifest(json.loads(director.manifest_path.read_text(encoding="utf-8")))
+        plan = director.plan_manifest(manifest)
+        print(json.dumps(plan.to_dict(), indent=2) if args.json else plan.format())
+    elif args.once:
         # Run once for testing
         logger.info("Running in single-execution mode")
         director.run_once()
     else:
-        # Watch mode
+        # Watch mode: a long-lived daemon, engines stay warm across manifests
         logger.info("Running in watch mode (Ctrl+C to stop)")
+        if args.config:
+            # Warm the configured engines before the first manifest arrives
+            director.load_engines(director.effective_engine_config(None))
+            if hasattr(signal, "SIGHUP"):
+                signal.signal(signal.SIGHUP, lambda signum, frame: director.request_reload())
         director.watch_for_manifest()
 
 
@@ -132,6 +132,7 @@ class Scene:
     sfxTriggerPhrase: Optional[str] = None
     sfxDelay: Optional[float] = None
     sfxVolume: Optional[float] = None
+    sfxStartSeconds: Optional[float] = None  # Resolved from narration timings (populated by Claude)
 
 
 @dataclass
@@ -283,6 +284,8 @@ class RenderStatus:
     exportJobs: List[RenderJobStatus] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
     lastUpdated: str = field(default_factory=lambda: datetime.now().isoformat())
+    # Cache and generation counters of the run so far (see engines/run_metrics.py)
+    metrics: Dict[str, Any] = field(default_factory=dict)
 
 
 # Parsing helper
@@ -334,7 +337,8 @@ def parse_manifest(data: dict) -> RenderManifest:
             soundEffectUrl=scene_data.get("soundEffectUrl"),
             sfxTriggerPhrase=scene_data.get("sfxTriggerPhrase"),
             sfxDelay=scene_data.get("sfxDelay"),
-            sfxVolume=scene_data.get("sfxVolume")
+            sfxVolume=scene_data.get("sfxVolume"),
+            sfxStartSeconds=scene_data.get("sfxStartSeconds")
         )
         scenes.append(scene)
 
@@ -0,0 +1,195 @@
+"""
+Per-phase profiling of a render.
+
+Wraps each phase of ProductionDirector.execute_manifest so a slow render
+can be diagnosed from one flag instead of attaching profilers by hand:
+
+    python main.py --once --profile=cpu    # cProfile
+    python main.py --once --profile=mem    # tracemalloc snapshots
+    python main.py --once --profile=both
+
+Reports go to output/profiles/<projectId>_<timestamp>/:
+- <phase>.prof: raw cProfile stats (pstats, snakeviz)
+- <phase>.cpu.txt: top functions by cumulative and own time
+- <phase>.mem.txt: peak and net traced memory, top allocation sites
+- summary.txt: wall time and memory per phase, then the top functions
+  and allocation sites over the whole run
+
+cProfile only sees the thread running the phase: engine warm-up and
+progressive upgrades on their own threads show up as waits. With "both",
+tracemalloc's bookkeeping inflates the CPU timings.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PROFILE_MODES = ("cpu", "mem", "both")
+
+# Stack depth recorded per allocation (deeper is slower to trace)
+TRACE_FRAMES = 1
+
+
+@dataclass
+class PhaseProfile:
+    """What one phase cost"""
+    name: str
+    wall_seconds: float = 0.0
+    net_bytes: Optional[int] = None      # Traced memory after minus before (mem mode)
+    peak_bytes: Optional[int] = None     # Highest traced memory during the phase (mem mode)
+    allocations: List[Tuple[str, int, int]] = field(default_factory=list)  # (site, size_diff, count_diff)
+
+
+class PhaseProfiler:
+    """
+    Profiles phases one after another and writes their reports
+
+    Example:
+        profiler = PhaseProfiler("both", Path("output/profiles/run"))
+        with profiler.phase("tts"):
+            generate_narration()
+        profiler.write_summary()
+    """
+
+    def __init__(self, mode: str, directory: Path, top: int = 25):
+        """
+        Args:
+            mode: "cpu", "mem" or "both"
+            directory: Where the reports go (created if missing)
+            top: Functions and allocation sites listed per report
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: '{mode}' (expected {', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.directory = Path(directory)
+        self.top = top
+        self.phases: List[PhaseProfile] = []
+        self._stats: Optional[pstats.Stats] = None
+        self._started_tracing = False
+
+    @property
+    def cpu(self) -> bool:
+        return self.mode in ("cpu", "both")
+
+    @property
+    def mem(self) -> bool:
+        return self.mode in ("mem", "both")
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseProfile]:
+        """Profile a block as one phase; its reports are written when it exits (even on error)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record = PhaseProfile(name)
+
+        before = None
+        if self.mem:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACE_FRAMES)
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+
+        profile = cProfile.Profile() if self.cpu else None
+        start = time.perf_counter()
+        if profile:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile:
+                profile.disable()
+            record.wall_seconds = time.perf_counter() - start
+
+            if profile:
+                self._write_cpu(name, profile)
+            if before is not None:
+                self._write_mem(record, before)
+            self.phases.append(record)
+
+    def write_summary(self) -> Path:
+        """Write summary.txt over all phases so far and stop tracing; returns its path"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        out = io.StringIO()
+        out.write(f"Profile ({self.mode}), {len(self.phases)} phases\n\n")
+        out.write(f"{'Phase':<16} {'Wall s':>9}")
+        if self.mem:
+            out.write(f" {'Net KB':>10} {'Peak KB':>10}")
+        out.write("\n")
+        for record in self.phases:
+            out.write(f"{record.name:<16} {record.wall_seconds:>9.3f}")
+            if self.mem:
+                out.write(f" {(record.net_bytes or 0) / 1024:>10.1f} {(record.peak_bytes or 0) / 1024:>10.1f}")
+            out.write("\n")
+        out.write(f"{'Total':<16} {sum(r.wall_seconds for r in self.phases):>9.3f}\n")
+
+        if self._stats is not None:
+            out.write(f"\nTop {self.top} functions by cumulative time (all phases)\n")
+            self._stats.stream = out
+            self._stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+
+        if self.mem:
+            totals: Dict[str, List[int]] = {}
+            for record in self.phases:
+                for site, size, count in record.allocations:
+                    entry = totals.setdefault(site, [0, 0])
+                    entry[0] += size
+                    entry[1] += count
+            out.write(f"\nTop {self.top} allocation sites by net size (all phases)\n")
+            ranked = sorted(totals.items(), key=lambda item: abs(item[1][0]), reverse=True)[:self.top]
+            for site, (size, count) in ranked:
+                out.write(f"{size / 1024:>+12.1f} KB {count:>+9} blocks  {site}\n")
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        path = self.directory / "summary.txt"
+        path.write_text(out.getvalue(), encoding="utf-8")
+        return path
+
+    def _write_cpu(self, name: str, profile: cProfile.Profile) -> None:
+        profile.dump_stats(str(self.directory / f"{name}.prof"))
+
+        out = io.StringIO()
+        stats = pstats.Stats(profile, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        (self.directory / f"{name}.cpu.txt").write_text(out.getvalue(), encoding="utf-8")
+
+        if self._stats is None:
+            self._stats = pstats.Stats(profile)
+        else:
+            self._stats.add(profile)
+
+    def _write_mem(self, record: PhaseProfile, before: tracemalloc.Snapshot) -> None:
+        after = tracemalloc.take_snapshot()
+        _, record.peak_bytes = tracemalloc.get_traced_memory()
+
+        # Leave out the profilers' own allocations (cProfile's, in "both" mode). Dropped
+        # after grouping: Snapshot.filter_traces matches every trace in Python and is slow
+        ignore = {module.__file__ for module in (tracemalloc, cProfile, pstats)} | {__file__}
+        diffs = [diff for diff in after.compare_to(before, "lineno")
+                 if diff.traceback[0].filename not in ignore]
+
+        record.net_bytes = sum(diff.size_diff for diff in diffs)
+        record.allocations = [
+            (f"{diff.traceback[0].filename}:{diff.traceback[0].lineno}", diff.size_diff, diff.count_diff)
+            for diff in diffs if diff.size_diff or diff.count_diff
+        ]
+
+        lines = [
+            f"Phase: {record.name}",
+            f"Peak traced memory: {record.peak_bytes / 1024:.1f} KB",
+            f"Net change: {record.net_bytes / 1024:+.1f} KB",
+            "",
+            f"Top {self.top} allocation sites by net size",
+        ]
+        for site, size, count in record.allocations[:self.top]:
+            lines.append(f"{size / 1024:>+12.1f} KB {count:>+9} blocks  {site}")
+        (self.directory / f"{record.name}.mem.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
@@ -0,0 +1,110 @@
+"""
+Test deadline-driven TTS tier planning
+
+Run: python -m pytest -q test_tts_planner.py
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from engines.tts.providers.base import AudioGenerationRequest
+from tts_planner import PRIORITY_OPENER, TTSTierPlanner, scene_priorities
+
+
+NOW = 1_000_000.0
+
+
+class FakeProvider:
+    """Fixed cost per request; cached requests cost nothing"""
+
+    def __init__(self, seconds: float, cached=()):
+        self.seconds = seconds
+        self.cached = set(cached)
+
+    def is_cached(self, request: AudioGenerationRequest) -> bool:
+        return request.text in self.cached
+
+    def estimate_generation_time(self, text_length: int) -> float:
+        return self.seconds
+
+
+def make_engine(fast_seconds: float = 1.0, quality_seconds: float = 10.0, quality_cached=()):
+    tiers = {
+        "piper": SimpleNamespace(name="piper", expected_quality=0.72, provider=FakeProvider(fast_seconds)),
+        "higgs": SimpleNamespace(name="higgs", expected_quality=0.92,
+                                 provider=FakeProvider(quality_seconds, quality_cached)),
+    }
+    return SimpleNamespace(tiers=tiers, is_tier_available=lambda name: True)
+
+
+def make_manifest(count: int = 3, export_jobs=()):
+    scenes = [SimpleNamespace(sceneNumber=n, durationSeconds=20.0) for n in range(1, count + 1)]
+    return SimpleNamespace(scenes=scenes, exportJobs=list(export_jobs))
+
+
+def make_requests(manifest):
+    return {s.sceneNumber: AudioGenerationRequest(text=f"scene {s.sceneNumber}", voice_id="narrator")
+            for s in manifest.scenes}
+
+
+def test_fast_and_quality_tiers():
+    planner = TTSTierPlanner(make_engine())
+    assert planner.fast_tier == "piper"
+    assert planner.quality_tier == "higgs"
+
+
+def test_upgrades_in_priority_order_while_they_fit():
+    manifest = make_manifest()
+    plan = TTSTierPlanner(make_engine()).plan(manifest, make_requests(manifest), NOW + 25, now=NOW)
+
+    # 3s on the fast tier, +9s per upgrade: the opener and scene 2 fit in 25s
+    assert plan.upgraded == [1, 2]
+    assert plan.assignments == {1: "higgs", 2: "higgs", 3: "piper"}
+    assert plan.estimated_seconds == 21
+    assert plan.fits
+
+
+def test_reserve_shrinks_the_budget():
+    manifest = make_manifest()
+    planner = TTSTierPlanner(make_engine(), reserve_seconds=10)
+    plan = planner.plan(manifest, make_requests(manifest), NOW + 25, now=NOW)
+
+    assert plan.budget_seconds == 15
+    assert plan.upgraded == [1]
+
+
+def test_cached_quality_audio_is_always_used():
+    manifest = make_manifest()
+    engine = make_engine(quality_cached={"scene 3"})
+    plan = TTSTierPlanner(engine).plan(manifest, make_requests(manifest), NOW, now=NOW)
+
+    assert plan.assignments == {1: "piper", 2: "piper", 3: "higgs"}
+    assert plan.upgraded == [3]
+
+
+def test_missed_deadline_stays_on_the_fast_tier():
+    manifest = make_manifest()
+    plan = TTSTierPlanner(make_engine()).plan(manifest, make_requests(manifest), NOW + 1, now=NOW)
+
+    assert set(plan.assignments.values()) == {"piper"}
+    assert not plan.fits
+
+
+def test_replanning_covers_only_pending_scenes():
+    manifest = make_manifest()
+    plan = TTSTierPlanner(make_engine()).plan(manifest, make_requests(manifest), NOW + 100,
+                                              pending=[2, 3], now=NOW)
+    assert set(plan.assignments) == {2, 3}
+
+
+def test_export_job_openers_and_lead_in_rank_first():
+    job = SimpleNamespace(startSceneIndex=2, endSceneIndex=3)
+    priorities = scene_priorities(make_manifest(count=5, export_jobs=[job]), lead_seconds=30)
+
+    assert priorities[1] == PRIORITY_OPENER
+    assert priorities[3] == PRIORITY_OPENER  # First scene of the export job
+    ranked = sorted(priorities, key=lambda n: -priorities[n])
+    assert ranked.index(4) < ranked.index(2)  # Lead-in beats an earlier body scene
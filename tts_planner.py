@@ -0,0 +1,176 @@
+"""
+Deadline-driven TTS tier planning.
+
+Decides, before execution, which scenes are narrated by the quality tier
+(Higgs) and which by the fast tier (Piper) so that the TTS phase finishes
+by a deadline. Every scene starts on the fast tier; scenes are then
+upgraded in priority order while the estimated total still fits.
+
+Priorities (highest first):
+- Openers: the first scene of the manifest and of every export job
+- Lead-in: scenes that start within the first seconds of an export job
+- Everything else, earlier scenes first
+
+Estimates come from each tier's learned real-time factor, so calling
+plan() again after a few scenes have rendered re-plans with real timings.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+import time
+
+from manifest_types import RenderManifest
+from engines.tts.providers.base import AudioGenerationRequest
+
+
+# Priority classes
+PRIORITY_OPENER = 3.0
+PRIORITY_LEAD_IN = 2.0
+PRIORITY_BODY = 1.0
+
+
+@dataclass
+class TierPlan:
+    """Tier assignment for the scenes that still need audio"""
+    assignments: Dict[int, str]            # sceneNumber -> tier name
+    estimated_seconds: float               # Estimated TTS time for the plan
+    budget_seconds: float                  # Time left before the deadline
+    upgraded: List[int] = field(default_factory=list)  # Scenes on the quality tier
+
+    @property
+    def fits(self) -> bool:
+        return self.estimated_seconds <= self.budget_seconds
+
+
+def scene_priorities(manifest: RenderManifest, lead_seconds: float = 30.0) -> Dict[int, float]:
+    """
+    Score how much each scene's narration quality matters.
+
+    Args:
+        manifest: Manifest being rendered
+        lead_seconds: Scenes starting within this many seconds of an export
+            job's start count as lead-in scenes
+
+    Returns:
+        sceneNumber -> priority (higher = upgrade first)
+    """
+    starts = []
+    offset = 0.0
+    for scene in manifest.scenes:
+        starts.append(offset)
+        offset += scene.durationSeconds
+
+    priorities = {}
+    for idx, scene in enumerate(manifest.scenes):
+        # Tie-break within a class by position so earlier scenes win
+        priorities[scene.sceneNumber] = PRIORITY_BODY - idx / (len(manifest.scenes) + 1)
+
+    if manifest.scenes:
+        priorities[manifest.scenes[0].sceneNumber] = PRIORITY_OPENER
+
+    for job in manifest.exportJobs:
+        if not 0 <= job.startSceneIndex < len(manifest.scenes):
+            continue
+        job_start = starts[job.startSceneIndex]
+        last = min(job.endSceneIndex, len(manifest.scenes) - 1)
+        for idx in range(job.startSceneIndex, last + 1):
+            number = manifest.scenes[idx].sceneNumber
+            if idx == job.startSceneIndex:
+                priorities[number] = PRIORITY_OPENER
+            elif starts[idx] - job_start < lead_seconds:
+                priorities[number] = max(priorities[number], PRIORITY_LEAD_IN - idx / (len(manifest.scenes) + 1))
+
+    return priorities
+
+
+class TTSTierPlanner:
+    """
+    Plans fast/quality tier assignments against a deadline.
+
+    Works with any provider exposing HybridProvider's `tiers` mapping.
+    The fast tier is the lowest-quality tier, the quality tier the highest.
+    """
+
+    def __init__(self, engine, lead_seconds: float = 30.0, reserve_seconds: float = 0.0):
+        """
+        Args:
+            engine: HybridProvider (or compatible) with at least one tier
+            lead_seconds: Lead-in window for export job openings
+            reserve_seconds: Time to keep free for the phases after TTS
+        """
+        self.engine = engine
+        self.lead_seconds = lead_seconds
+        self.reserve_seconds = reserve_seconds
+
+        by_quality = sorted(engine.tiers.values(), key=lambda t: t.expected_quality)
+        self.fast_tier = by_quality[0].name
+        self.quality_tier = by_quality[-1].name
+
+    def plan(
+        self,
+        manifest: RenderManifest,
+        requests: Dict[int, AudioGenerationRequest],
+        deadline: float,
+        pending: Optional[Iterable[int]] = None,
+        now: Optional[float] = None
+    ) -> TierPlan:
+        """
+        Assign a tier to every pending scene.
+
+        Args:
+            manifest: Manifest being rendered
+            requests: sceneNumber -> TTS request for that scene
+            deadline: Epoch seconds by which the render must finish
+            pending: Scene numbers still to generate (default: all)
+            now: Current time (default: time.time())
+
+        Returns:
+            TierPlan for the pending scenes
+        """
+        now = time.time() if now is None else now
+        pending = list(requests) if pending is None else list(pending)
+        budget = max(0.0, deadline - now - self.reserve_seconds)
+
+        fast = self.engine.tiers[self.fast_tier]
+        quality = self.engine.tiers[self.quality_tier]
+        quality_up = self.quality_tier != self.fast_tier and self.engine.is_tier_available(self.quality_tier)
+
+        assignments = {}
+        upgrade_costs = {}
+        estimated = 0.0
+
+        for number in pending:
+            request = requests[number]
+            if quality_up and quality.provider.is_cached(request):
+                # Best quality is free - always take it
+                assignments[number] = self.quality_tier
+                continue
+
+            fast_cost = self._cost(fast.provider, request)
+            assignments[number] = self.fast_tier
+            estimated += fast_cost
+            if quality_up:
+                upgrade_costs[number] = self._cost(quality.provider, request) - fast_cost
+
+        upgraded = [n for n in pending if assignments[n] == self.quality_tier]
+        priorities = scene_priorities(manifest, self.lead_seconds)
+
+        for number in sorted(upgrade_costs, key=lambda n: -priorities.get(n, 0.0)):
+            extra = upgrade_costs[number]
+            if estimated + extra <= budget:
+                assignments[number] = self.quality_tier
+                estimated += extra
+                upgraded.append(number)
+
+        return TierPlan(
+            assignments=assignments,
+            estimated_seconds=estimated,
+            budget_seconds=budget,
+            upgraded=upgraded
+        )
+
+    @staticmethod
+    def _cost(provider, request: AudioGenerationRequest) -> float:
+        if provider.is_cached(request):
+            return 0.0
+        return provider.estimate_generation_time(len(request.text))